@@ -0,0 +1,128 @@
+import numpy as np
+
+from ConflictGraph import ConflictGraph
+
+NAME, SALARY, MASS, POPULARITY, VIP, PROBLEMS_WITH = range(6)
+COLUMN_TITLES = ['Name', 'Salary ($)', 'Mass (Kg)', 'Popularity Index', 'VIP', 'Problems with']
+
+
+class CelebrityStore:
+    # columnar celebrity data: one NumPy array per numeric attribute, grown by doubling, and the
+    # conflict graph indexed by the same rows. The *_column() views are what models are built from.
+    def __init__(self, capacity=64):
+        self.size = 0
+        self.names = []
+        self.problems_with = []
+        self.salaries = np.zeros(capacity)
+        self.masses = np.zeros(capacity)
+        self.popularities = np.zeros(capacity)
+        self.vips = np.zeros(capacity, dtype=bool)
+        self.conflicts = ConflictGraph()
+        # clique cover of the conflict graph, computed on first use and dropped whenever rows are added
+        self.cover = None
+
+    def __len__(self):
+        return self.size
+
+    def reserve(self, capacity):
+        if capacity <= len(self.salaries):
+            return
+        capacity = max(capacity, 2 * len(self.salaries))
+        for attribute in ('salaries', 'masses', 'popularities', 'vips'):
+            old = getattr(self, attribute)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, attribute, new)
+
+    def add(self, name, salary, mass, popularity, is_vip, problems_with=None):
+        self.reserve(self.size + 1)
+        i = self.size
+        self.salaries[i] = salary
+        self.masses[i] = mass
+        self.popularities[i] = popularity
+        self.vips[i] = is_vip
+        self.names.append(name)
+        self.problems_with.append(list(problems_with or []))
+        self.conflicts.add(name, problems_with)
+        self.cover = None
+        self.size += 1
+        return i
+
+    def extend(self, names, salaries, masses, popularities, vips, problems_with=None, conflict_pairs=None):
+        # bulk append, one array copy per column; conflicts are given either by name (problems_with)
+        # or as (i, j) pairs of rows counted from the first new celebrity
+        count = len(names)
+        first = self.size
+        self.reserve(self.size + count)
+        rows = slice(first, first + count)
+        self.salaries[rows] = salaries
+        self.masses[rows] = masses
+        self.popularities[rows] = popularities
+        self.vips[rows] = vips
+        for name in names:
+            self.names.append(name)
+            self.problems_with.append([])
+            self.conflicts.add(name)
+        self.size += count
+        self.cover = None
+        # resolved once every new name is known, so a row may name a celebrity further down
+        for i, problems in enumerate(problems_with or [], first):
+            self.problems_with[i] = list(problems or [])
+            for problem in self.problems_with[i]:
+                for j in self.conflicts.indices(problem):
+                    self.conflicts.add_conflict(i, j)
+        if conflict_pairs is not None:
+            pairs = np.asarray(conflict_pairs, dtype=np.int64).reshape(-1, 2)
+            # nobody is in conflict with themselves, and a repeated pair names its celebrity only once
+            for i, j in pairs[pairs[:, 0] != pairs[:, 1]].tolist():
+                i, j = sorted((first + i, first + j))
+                if j not in self.conflicts.neighbors(i):
+                    self.conflicts.add_conflict(i, j)
+                    self.problems_with[j].append(self.names[i])
+
+    def clique_cover(self):
+        # ConflictGraph.clique_cover() of the current rows, shared by every solve until the store grows;
+        # callers only read the cliques
+        if self.cover is None:
+            self.cover = self.conflicts.clique_cover()
+        return self.cover
+
+    def salary_column(self):
+        return self.salaries[:self.size]
+
+    def mass_column(self):
+        return self.masses[:self.size]
+
+    def popularity_column(self):
+        return self.popularities[:self.size]
+
+    def vip_column(self):
+        return self.vips[:self.size]
+
+    def value(self, row, column):
+        if column == NAME:
+            return self.names[row]
+        if column == SALARY:
+            return float(self.salaries[row])
+        if column == MASS:
+            return float(self.masses[row])
+        if column == POPULARITY:
+            return float(self.popularities[row])
+        if column == VIP:
+            return bool(self.vips[row])
+        return ', '.join(self.problems_with[row])
+
+    def summary(self, selected):
+        # totals of a guest list given as an array of row indices
+        selected = np.asarray(selected, dtype=int)
+        people = len(selected)
+        popularity = float(self.popularities[selected].sum())
+        return {
+            'people': people,
+            'average_popularity': popularity / people if people > 0 else 0.0,
+            'mass': float(self.masses[selected].sum()),
+            'salary': float(self.salaries[selected].sum()),
+            'vips': [self.names[i] for i in selected if self.vips[i]],
+            'non_vips': [self.names[i] for i in selected if not self.vips[i]],
+            'names': [self.names[i] for i in selected],
+        }
@@ -0,0 +1,62 @@
+class ConflictGraph:
+    # celebrities that can't be invited together, indexed like the rows of the celebrity list.
+    # Kept up to date as celebrities are added, so building a model never searches the list by name.
+    def __init__(self):
+        self.names = []
+        # name -> indices of every celebrity with that name
+        self.index = {}
+        # adjacency[i] is the set of indices in conflict with celebrity i
+        self.adjacency = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def indices(self, name):
+        return self.index.get(name, [])
+
+    def add(self, name, problems_with=None):
+        # add a celebrity at the next index, in conflict with every celebrity named in problems_with
+        i = len(self.names)
+        self.names.append(name)
+        self.index.setdefault(name, []).append(i)
+        self.adjacency.append(set())
+        for problem in problems_with or []:
+            for j in self.indices(problem):
+                self.add_conflict(i, j)
+        return i
+
+    def add_conflict(self, i, j):
+        if i != j:
+            self.adjacency[i].add(j)
+            self.adjacency[j].add(i)
+
+    def neighbors(self, i):
+        return self.adjacency[i]
+
+    def pairs(self):
+        return [(i, j) for i, neighbors in enumerate(self.adjacency) for j in sorted(neighbors) if i < j]
+
+    def number_of_conflicts(self):
+        return sum(len(neighbors) for neighbors in self.adjacency) // 2
+
+    def clique_cover(self):
+        # greedy edge clique cover: every conflicting pair is in at least one of the returned cliques,
+        # so sum(x[clique]) <= 1 for each clique is the same set of guest lists as the pairwise rows,
+        # with far fewer rows and a much tighter LP relaxation on dense conflicts
+        uncovered = [set(neighbors) for neighbors in self.adjacency]
+        degree = [len(neighbors) for neighbors in self.adjacency]
+        cliques = []
+        for u in sorted(range(len(self)), key=lambda i: (-degree[i], i)):
+            while uncovered[u]:
+                v = max(uncovered[u], key=lambda j: (degree[j], -j))
+                clique = [u, v]
+                candidates = self.adjacency[u] & self.adjacency[v]
+                while candidates:
+                    # grow towards pairs that are not covered yet, then towards high degree
+                    w = max(candidates, key=lambda j: (sum(k in uncovered[j] for k in clique), degree[j], -j))
+                    clique.append(w)
+                    candidates &= self.adjacency[w]
+                for k in clique:
+                    uncovered[k].difference_update(clique)
+                cliques.append(sorted(clique))
+        return cliques
@@ -0,0 +1,384 @@
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+import SolverBackend
+from SelectionProblem import clique_rows, guest_names
+from SolverBackend import SolveResult, name_index
+from Telemetry import emit
+
+# the search stops with LIMIT_REACHED (and reports its gap) after this many nodes or seconds
+NODE_LIMIT = 2_000_000
+TIME_LIMIT = 60.0
+# the celebrity page hands lists of up to this many celebrities to the engine and solves longer ones as a
+# MIP: above it the engine falls behind HiGHS on dense conflicts, and it is behind Gurobi from about 20
+MAX_PEOPLE = 60
+TOLERANCE = 1e-6
+# settings overriding the three above, as a JSON object, e.g. '{"time_limit": 10, "max_people": 100}'
+SETTINGS_ENVIRONMENT_VARIABLE = "SOLVER_KNAPSACK_SETTINGS"
+
+logger = logging.getLogger("telemetry")
+
+
+def knapsack_settings():
+    # node_limit, time_limit and max_people, from SOLVER_KNAPSACK_SETTINGS where it sets them
+    defaults = {"node_limit": NODE_LIMIT, "time_limit": TIME_LIMIT, "max_people": MAX_PEOPLE}
+    text = os.environ.get(SETTINGS_ENVIRONMENT_VARIABLE)
+    if not text:
+        return defaults
+    try:
+        overrides = json.loads(text)
+        if not isinstance(overrides, dict):
+            raise ValueError("expected a JSON object")
+        unknown = set(overrides) - set(defaults)
+        if unknown:
+            raise ValueError(f"unknown settings {', '.join(sorted(unknown))}")
+        return {name: type(value)(overrides.get(name, value)) for name, value in defaults.items()}
+    except (TypeError, ValueError) as error:
+        logger.warning("ignoring %s: %s", SETTINGS_ENVIRONMENT_VARIABLE, error)
+        return defaults
+
+
+def _bits(indices):
+    mask = 0
+    for i in indices:
+        mask |= 1 << int(i)
+    return mask
+
+
+class LagrangianBound:
+    # upper bound on   max c x   over the items still free, s.t. W x <= remaining, the covers and the
+    # cliques: the resource and clique rows move into the objective with their dual prices in the root
+    # LP, and what is left (at least the needed count from each cover) is solved exactly by sorting. At
+    # the root that is the LP bound over all the rows at once; deeper down any prices >= 0 stay valid.
+    # The covers are one subset of the items (the VIPs) and, optionally, a cover of every item.
+    def __init__(self, c, W, capacities, covers, cliques):
+        n = len(c)
+        self.subset_cover = np.zeros(n, dtype=bool)
+        self.subset_index = self.everyone_index = None
+        self.needs = [need for _, need in covers]
+        for k, (members, _) in enumerate(covers):
+            if len(members) == n:
+                self.everyone_index = k
+            elif self.subset_index is None:
+                self.subset_index = k
+                self.subset_cover[members] = True
+            else:
+                raise ValueError("expected at most one cover of a subset of the items")
+        self.prices, clique_prices = self.dual_prices(c, W, capacities, covers, cliques)
+        self.reduced = c - self.prices @ W
+        # the cliques that get a price, as (price, members bitset); a clique is full once one of its
+        # members is chosen, its price then no longer counts
+        self.priced_cliques = []
+        for clique, price in zip(cliques, clique_prices):
+            if price > 0:
+                self.reduced[list(clique)] -= price
+                self.priced_cliques.append((price, _bits(clique)))
+
+    @staticmethod
+    def dual_prices(c, W, capacities, covers, cliques):
+        n, m = len(c), len(capacities)
+        rows = [sp.csr_matrix(W)]
+        rows += [sp.csr_matrix((-np.ones(len(members)), (np.zeros(len(members), dtype=int), members)), shape=(1, n))
+                 for members, _ in covers]
+        if len(cliques):
+            rows.append(clique_rows(cliques, n)[0])
+        b = np.concatenate([capacities, [-need for _, need in covers], np.ones(len(cliques))])
+        result = linprog(-c, A_ub=sp.vstack(rows, format="csr"), b_ub=b, bounds=(0, 1), method="highs")
+        if result.status != 0:
+            return np.zeros(m), np.zeros(len(cliques))
+        prices = np.maximum(-result.ineqlin.marginals, 0.0)
+        return prices[:m], prices[m + len(covers):]
+
+    def value(self, free, chosen, counts, remaining):
+        # None when no choice of the free items meets the covers
+        r = self.reduced[free]
+        in_subset = self.subset_cover[free]
+        subset = -np.sort(-r[in_subset])
+        others = -np.sort(-r[~in_subset])
+        subset_need = 0 if self.subset_index is None else self.needs[self.subset_index] - counts[self.subset_index]
+        everyone_need = 0 if self.everyone_index is None else \
+            self.needs[self.everyone_index] - counts[self.everyone_index]
+        subset_sums = np.concatenate([[0.0], np.cumsum(subset)])
+        other_sums = np.concatenate([[0.0], np.cumsum(others)])
+        # a members of the subset cover (at least its need, and every positive one), then the best
+        # others: every positive one, and as many more as the other cover still needs
+        a = np.arange(max(subset_need, int((subset > 0).sum()), 0), len(subset) + 1)
+        b = np.maximum(int((others > 0).sum()), everyone_need - a)
+        valid = b <= len(others)
+        if not valid.any():
+            return None
+        value = float((subset_sums[a[valid]] + other_sums[b[valid]]).max())
+        open_cliques = sum(price for price, mask in self.priced_cliques if not chosen & mask)
+        return value + float(self.prices @ np.asarray(remaining)) + open_cliques
+
+
+class KnapsackSearch:
+    # branch and bound for   max c x   s.t.  W x <= capacities (W >= 0),  sum(x[cover]) >= need,
+    # x_i + x_j <= 1 for every conflict, x binary.  Conflict sets are Python int bitsets, cliques the
+    # same conflicts as lists of mutually exclusive items (for the bound). Nodes are bounded by a
+    # LagrangianBound, rounded down for an objective with integer coefficients. tight_rows are resource
+    # rows that hardly any list fits in (the salary once the cheapest list is known): a node is also
+    # dropped when a LagrangianBound on the least its completion uses of such a row exceeds what is left.
+    def __init__(self, c, W, capacities, covers, conflicts, cliques=(), tight_rows=(), node_limit=NODE_LIMIT,
+                 deadline=None, cancel_event=None):
+        self.c = np.asarray(c, dtype=float)
+        self.W = np.asarray(W, dtype=float)
+        self.capacities = np.asarray(capacities, dtype=float)
+        self.n = len(self.c)
+        self.covers = [(np.asarray(members, dtype=int), int(need)) for members, need in covers]
+        self.cover_masks = [_bits(members) for members, _ in self.covers]
+        self.conflicts = conflicts
+        self.node_limit = node_limit
+        self.deadline = deadline
+        self.cancel_event = cancel_event
+        self.nodes = 0
+        self.best_value = -np.inf
+        self.best_set = None
+        self.root_bound = np.inf
+        self.stopped = False
+        self.integral = bool(np.all(self.c == np.round(self.c)))
+
+        self.relaxation = LagrangianBound(self.c, self.W, self.capacities, self.covers, cliques)
+        self.floors = [(r, LagrangianBound(-self.W[r], self.W, self.capacities, self.covers, cliques))
+                       for r in tight_rows]
+        # branch on items in order of value net of the priced rows they use, most attractive first;
+        # the first dive is then the greedy list of the LP relaxation
+        self.order = sorted(range(self.n), key=lambda i: (-self.relaxation.reduced[i], i))
+        self.rank = np.empty(self.n, dtype=int)
+        self.rank[self.order] = np.arange(self.n)
+        self.bytes = (self.n + 7) // 8
+        # cover members by increasing weight in each resource row, to check the members still needed
+        # can fit at all
+        self.cover_weight_orders = [[sorted(members.tolist(), key=lambda i, w=w: w[i]) for w in self.W]
+                                    for members, _ in self.covers]
+
+    def free_items(self, position, blocked):
+        taken = np.unpackbits(np.frombuffer(blocked.to_bytes(self.bytes, "little"), dtype=np.uint8),
+                              bitorder="little")[:self.n]
+        return (self.rank >= position) & (taken == 0)
+
+    def covers_fit(self, position, blocked, counts, remaining):
+        # the members a cover still needs, lightest first, must fit in what is left of every row
+        for k, (_, need) in enumerate(self.covers):
+            deficit = need - counts[k]
+            if deficit <= 0:
+                continue
+            for w, weight_order, cap in zip(self.W, self.cover_weight_orders[k], remaining):
+                total, taken = 0.0, 0
+                for i in weight_order:
+                    if taken == deficit:
+                        break
+                    if self.rank[i] >= position and not (blocked >> i) & 1:
+                        total += w[i]
+                        taken += 1
+                if taken < deficit or total > cap + TOLERANCE:
+                    return False
+        return True
+
+    def bound(self, position, chosen, blocked, counts, remaining):
+        # best value the free items can still add, None when the node can't be completed
+        if not self.covers_fit(position, blocked, counts, remaining):
+            return None
+        free = self.free_items(position, blocked)
+        for r, floor in self.floors:
+            least = floor.value(free, chosen, counts, remaining)
+            if least is None or -least > remaining[r] + TOLERANCE:
+                return None
+        return self.relaxation.value(free, chosen, counts, remaining)
+
+    def run(self):
+        m = len(self.capacities)
+        # a node: (branching position, chosen bitset, blocked bitset, remaining capacities, value, cover counts)
+        stack = [(0, 0, 0, tuple(self.capacities), 0.0, (0,) * len(self.covers))]
+        root = True
+        while stack:
+            position, chosen, blocked, remaining, value, counts = stack.pop()
+            self.nodes += 1
+            if self.nodes % 256 == 0:
+                if self.nodes >= self.node_limit or (self.deadline is not None and time.perf_counter() > self.deadline) \
+                        or (self.cancel_event is not None and self.cancel_event.is_set()):
+                    self.stopped = True
+                    return
+            # skip items that are already blocked by a conflict
+            while position < self.n and (blocked >> self.order[position]) & 1:
+                position += 1
+            gain = self.bound(position, chosen, blocked, counts, remaining)
+            if gain is None:
+                continue
+            bound = value + gain
+            if self.integral:
+                bound = np.floor(bound + TOLERANCE)
+            if root:
+                self.root_bound = bound
+                root = False
+            if bound <= self.best_value + TOLERANCE:
+                continue
+            if position == self.n:
+                if all(count >= need for count, (_, need) in zip(counts, self.covers)) and value > self.best_value:
+                    self.best_value = value
+                    self.best_set = chosen
+                continue
+            i = self.order[position]
+            # exclude branch first on the stack so the include branch is explored first
+            stack.append((position + 1, chosen, blocked | (1 << i), remaining, value, counts))
+            weights = self.W[:, i]
+            if all(weights[r] <= remaining[r] + TOLERANCE for r in range(m)):
+                new_remaining = tuple(remaining[r] - weights[r] for r in range(m))
+                new_counts = tuple(count + ((mask >> i) & 1) for count, mask in zip(counts, self.cover_masks))
+                stack.append((position + 1, chosen | (1 << i), blocked | self.conflicts[i] | (1 << i), new_remaining,
+                              value + self.c[i], new_counts))
+
+    def start_from(self, solution):
+        # a known feasible solution becomes the incumbent, so only strictly better lists are searched for
+        self.best_value = float(self.c @ solution)
+        self.best_set = _bits(np.flatnonzero(solution > 0.5))
+
+    def solution(self):
+        if self.best_set is None:
+            return None
+        return np.array([(self.best_set >> i) & 1 for i in range(self.n)], dtype=float)
+
+
+class ConflictKnapsackSolver:
+    # combinatorial engine for the guest selection model, an alternative to the MIP built by
+    # SelectionProblem.build_selection_solver. Objectives follow the same priorities as the MIP:
+    # head count first, then total salary (lower is better), then total popularity.
+    def __init__(self, salaries, masses, popularities, vips, ship_weight, budget, min_vip_count, cliques,
+                 node_limit=None, time_limit=None):
+        self.created_at = time.perf_counter()
+        self.salaries = np.asarray(salaries, dtype=float)
+        self.masses = np.asarray(masses, dtype=float)
+        self.popularities = np.asarray(popularities, dtype=float)
+        self.vips = np.asarray(vips, dtype=bool)
+        self.n = len(self.salaries)
+        self.capacities = np.array([ship_weight, budget], dtype=float)
+        # the model asks for at least one VIP on top of the minimum count
+        self.min_vip_count = max(1, int(min_vip_count))
+        self.cliques = [list(clique) for clique in cliques]
+        self.conflicts = self.conflict_sets(cliques)
+        # limits left out come from knapsack_settings()
+        settings = knapsack_settings() if node_limit is None or time_limit is None else {}
+        self.node_limit = settings["node_limit"] if node_limit is None else node_limit
+        self.time_limit = settings["time_limit"] if time_limit is None else time_limit
+        self.names = guest_names(self.n)
+        self.name_index = None
+        self.status = SolverBackend.NOT_SOLVED
+        self.values = None
+        self.best_bound = None
+        self.gap = None
+        self.nodes = 0
+        self.build_time = time.perf_counter() - self.created_at
+        # no presolve pass, kept for the callers that time one
+        self.presolve_time = 0.0
+        self.solve_time = 0.0
+
+    def conflict_sets(self, cliques):
+        # cliques of mutually exclusive celebrities as one conflict bitset per celebrity
+        conflicts = [0] * self.n
+        for clique in cliques:
+            mask = _bits(clique)
+            for i in clique:
+                conflicts[i] |= mask & ~(1 << int(i))
+        return conflicts
+
+    def search(self, c, capacities, covers, deadline, cancel_event, start_from=None, head_count=None, tight_rows=()):
+        W = np.vstack([self.masses, self.salaries])
+        if head_count is not None:
+            # no list has more than head_count guests, as a resource row it tightens the bounds
+            W = np.vstack([W, np.ones(self.n)])
+            capacities = np.append(capacities, head_count)
+        search = KnapsackSearch(c, W, capacities, covers, self.conflicts, self.cliques, tight_rows,
+                                self.node_limit - self.nodes, deadline, cancel_event)
+        if start_from is not None:
+            search.start_from(start_from)
+        search.run()
+        self.nodes += search.nodes
+        return search
+
+    def dispose(self):
+        # plain Python state, nothing to free early
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
+        return False
+
+    def solve(self, cancel_event=None):
+        start = time.perf_counter()
+        deadline = start + self.time_limit
+        vip_cover = (np.flatnonzero(self.vips), self.min_vip_count)
+        everyone = np.arange(self.n)
+
+        # 1. as many guests as possible
+        search = self.search(np.ones(self.n), self.capacities, [vip_cover], deadline, cancel_event)
+        if search.best_set is not None and not search.stopped:
+            head_count = int(round(search.best_value))
+            covers = [vip_cover, (everyone, head_count)]
+            # 2. the cheapest list with that many guests, starting from the list found in stage 1
+            search = self.search(-self.salaries, self.capacities, covers, deadline, cancel_event, search.solution(),
+                                 head_count)
+            if not search.stopped:
+                capacities = self.capacities.copy()
+                capacities[1] = min(capacities[1], -search.best_value + TOLERANCE)
+                # 3. the most popular list among those
+                search = self.search(self.popularities, capacities, covers, deadline, cancel_event,
+                                     search.solution(), head_count, tight_rows=[1])
+
+        # the gap and bound refer to the last objective that was searched
+        self.values = search.solution()
+        if search.stopped:
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            self.status = SolverBackend.INTERRUPTED if cancelled else SolverBackend.LIMIT_REACHED
+        elif self.values is None:
+            self.status = SolverBackend.INFEASIBLE
+        else:
+            self.status = SolverBackend.OPTIMAL
+        if self.values is not None:
+            self.best_bound = max(search.root_bound, search.best_value) if search.stopped else search.best_value
+            self.gap = abs(self.best_bound - search.best_value) / max(abs(search.best_value), 1e-10)
+        self.solve_time = time.perf_counter() - start
+        emit("optimize", backend="knapsack", status=self.status, variables=self.n, nodes=self.nodes, mip_gap=self.gap,
+             seconds=self.solve_time)
+
+    def get_solution_status(self):
+        return self.status
+
+    def get_status(self):
+        return self.status
+
+    def has_solution(self):
+        return self.values is not None
+
+    def get_values(self):
+        return self.values
+
+    def index_of(self, name):
+        if self.name_index is None:
+            self.name_index = name_index(self.names)
+        return self.name_index[name]
+
+    def get_variable(self, name):
+        return self.values[self.index_of(name)]
+
+    def get_variables(self):
+        return dict(zip(self.names, self.values.tolist()))
+
+    def get_objective_value(self):
+        # total popularity, the objective reported by the MIP as well
+        if self.values is None:
+            raise AttributeError("no solution available")
+        return float(self.popularities @ self.values)
+
+    def get_result(self):
+        objective_value = self.get_objective_value() if self.values is not None else None
+        return SolveResult(self.status, objective_value, self.values, self.names, "knapsack",
+                           self.build_time, self.solve_time, mip_gap=self.gap, best_bound=self.best_bound)
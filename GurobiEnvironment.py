@@ -0,0 +1,184 @@
+import itertools
+import json
+import logging
+import os
+import threading
+import weakref
+
+import gurobipy as gp
+
+from Telemetry import emit
+
+# Gurobi parameters every pooled environment gets, as a JSON object, e.g. '{"Threads": 4, "MemLimit": 2}'
+# (MemLimit, in GB, caps the native memory of each environment)
+PARAMETERS_ENVIRONMENT_VARIABLE = "SOLVER_GUROBI_PARAMETERS"
+# started environments kept for reuse once their model is disposed; more are started when needed
+IDLE_ENVIRONMENTS = 4
+# parameters applied first, so setting the others prints nothing when they turn the log off
+QUIET_PARAMETERS = ("OutputFlag", "LogToConsole")
+
+logger = logging.getLogger("telemetry")
+
+
+def parameter_order(item):
+    return item[0] not in QUIET_PARAMETERS
+
+
+class Lease:
+    # one live model and the environment it was created on
+    def __init__(self, environment):
+        self.environment = environment
+        # native memory of the environment (bytes) after the model's last optimize
+        self.native_bytes = 0.0
+        self.finalizer = None
+
+
+class EnvironmentPool:
+    # Started gp.Env objects, each lent to one live model at a time (an environment is not shared
+    # between threads). A model is returned with release(model), which disposes it right away; a model
+    # that is never released is disposed by the garbage collector and its environment returned then.
+    # At most size idle environments are kept, the others are disposed.
+    def __init__(self, parameters=None, size=IDLE_ENVIRONMENTS):
+        self.parameters = dict(parameters or {})
+        self.size = size
+        self.idle = []
+        self.leases = {}
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+        self.started = 0
+
+    def configure(self, parameters=None, size=None):
+        # parameters apply to every model created from now on; size trims the idle environments
+        released = []
+        with self.lock:
+            self.parameters.update(parameters or {})
+            if size is not None:
+                self.size = size
+                released, self.idle = self.idle[self.size:], self.idle[:self.size]
+        for environment in released:
+            environment.dispose()
+
+    def start_environment(self):
+        environment = gp.Env(empty=True)
+        for name, value in sorted(self.parameters.items(), key=parameter_order):
+            environment.setParam(name, value)
+        environment.start()
+        with self.lock:
+            self.started += 1
+        return environment
+
+    def warm(self):
+        # starts one environment ahead of the first model, so no solve waits for the license check
+        with self.lock:
+            if self.idle or self.started:
+                return
+        environment = self.start_environment()
+        with self.lock:
+            self.idle.append(environment)
+
+    def acquire(self):
+        with self.lock:
+            environment = self.idle.pop() if self.idle else None
+            parameters = sorted(self.parameters.items(), key=parameter_order)
+        if environment is None:
+            return self.start_environment()
+        # an idle environment may predate the last configure
+        for name, value in parameters:
+            environment.setParam(name, value)
+        return environment
+
+    def model(self, name=""):
+        environment = self.acquire()
+        return self.lend(lambda: gp.Model(name, env=environment), environment)
+
+    def read(self, path):
+        # a model read from a file, on a pooled environment
+        environment = self.acquire()
+        return self.lend(lambda: gp.read(path, env=environment), environment)
+
+    def lend(self, create, environment):
+        try:
+            model = create()
+        except Exception:
+            environment.dispose()
+            raise
+        key = next(self.counter)
+        lease = Lease(environment)
+        with self.lock:
+            self.leases[key] = lease
+        lease.finalizer = weakref.finalize(model, self.give_back, key)
+        model._lease = key
+        return model
+
+    def release(self, model):
+        # frees the native model now and returns its environment; releasing twice does nothing
+        key = getattr(model, "_lease", None)
+        model.dispose()
+        with self.lock:
+            lease = self.leases.get(key)
+        if lease is not None:
+            lease.finalizer()
+            emit("model_release", **self.memory_usage())
+
+    def give_back(self, key):
+        with self.lock:
+            lease = self.leases.pop(key, None)
+            if lease is None:
+                return
+            if len(self.idle) < self.size:
+                self.idle.append(lease.environment)
+                return
+        lease.environment.dispose()
+
+    def account(self, model, mem_used):
+        # records the environment's memory (MemUsed, GB) read on the model's own thread after an optimize
+        with self.lock:
+            lease = self.leases.get(getattr(model, "_lease", None))
+            if lease is not None and mem_used is not None:
+                lease.native_bytes = mem_used * 1e9
+
+    def memory_usage(self):
+        # live models, environments and the native memory of the live models at their last optimize
+        with self.lock:
+            return {"live_models": len(self.leases), "idle_environments": len(self.idle),
+                    "environments_started": self.started,
+                    "native_bytes": sum(lease.native_bytes for lease in self.leases.values())}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def environment_pool():
+    # the process-wide pool, created on first use with the parameters of SOLVER_GUROBI_PARAMETERS
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            parameters = {}
+            text = os.environ.get(PARAMETERS_ENVIRONMENT_VARIABLE)
+            if text:
+                try:
+                    parameters = json.loads(text)
+                    if not isinstance(parameters, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as error:
+                    logger.warning("ignoring %s: %s", PARAMETERS_ENVIRONMENT_VARIABLE, error)
+                    parameters = {}
+            _pool = EnvironmentPool(parameters)
+    return _pool
+
+
+def configure_environments(parameters=None, size=None):
+    environment_pool().configure(parameters, size)
+
+
+def new_model(name=""):
+    return environment_pool().model(name)
+
+
+def release_model(model):
+    environment_pool().release(model)
+
+
+def memory_usage():
+    return environment_pool().memory_usage()
@@ -1,17 +1,140 @@
+import time
+import numpy as np
+import scipy.sparse as sp
 import gurobipy as gp
 from gurobipy import GRB
+from GurobiEnvironment import environment_pool, new_model, release_model
+from Presolve import presolve_rows
+from Sensitivity import Sensitivity
+from Telemetry import emit, phase
+from SolutionCache import CachedSolution, CachedSolver, instance_key
+import SolverBackend
+from SolverBackend import SolveResult, FINAL_STATUSES, as_vector, as_csr, name_index
+
+
+# Gurobi status codes mapped onto the normalized SolverBackend statuses
+GUROBI_STATUSES = {
+    GRB.LOADED: SolverBackend.NOT_SOLVED,
+    GRB.OPTIMAL: SolverBackend.OPTIMAL,
+    GRB.INFEASIBLE: SolverBackend.INFEASIBLE,
+    GRB.INF_OR_UNBD: SolverBackend.INF_OR_UNBD,
+    GRB.UNBOUNDED: SolverBackend.UNBOUNDED,
+    GRB.INTERRUPTED: SolverBackend.INTERRUPTED,
+    GRB.TIME_LIMIT: SolverBackend.LIMIT_REACHED,
+    GRB.NODE_LIMIT: SolverBackend.LIMIT_REACHED,
+    GRB.ITERATION_LIMIT: SolverBackend.LIMIT_REACHED,
+    GRB.SOLUTION_LIMIT: SolverBackend.LIMIT_REACHED,
+    GRB.WORK_LIMIT: SolverBackend.LIMIT_REACHED,
+}
+
+
+def _infinite(values):
+    # GRB.INFINITY as a float infinity, so ranges compare and serialize cleanly
+    values = np.asarray(values, dtype=float)
+    return np.where(np.abs(values) >= GRB.INFINITY, np.copysign(np.inf, values), values)
+
+
+def gurobi_sensitivity(model, variables, constraints):
+    # bulk read of the sensitivity attributes of a solved LP, one getAttr call per attribute;
+    # variables is a list of Var or, faster, one MVar
+    def attribute(name, objects):
+        if isinstance(objects, gp.MVar):
+            return np.asarray(objects.getAttr(name))
+        return np.array(model.getAttr(name, objects)) if objects else np.zeros(0)
+
+    return Sensitivity(model.objVal, attribute("X", variables), attribute("Obj", variables),
+                       attribute("RHS", constraints), attribute("Pi", constraints), attribute("Slack", constraints),
+                       _infinite(attribute("SARHSLow", constraints)), _infinite(attribute("SARHSUp", constraints)),
+                       attribute("RC", variables), _infinite(attribute("SAObjLow", variables)),
+                       _infinite(attribute("SAObjUp", variables)),
+                       attribute("VarName", variables).tolist(),
+                       model.getAttr("ConstrName", constraints) if constraints else [])
+
+
+# model attributes reported after every optimize, by telemetry field name
+STATISTICS_ATTRIBUTES = {
+    "runtime": "Runtime",
+    "iterations": "IterCount",
+    "nodes": "NodeCount",
+    "mip_gap": "MIPGap",
+    "variables": "NumVars",
+    "constraints": "NumConstrs",
+    "nonzeros": "NumNZs",
+    "mem_used": "MemUsed",
+    "max_mem_used": "MaxMemUsed",
+}
+
+
+def gurobi_statistics(model):
+    # size, effort and memory of the last optimize; attributes the model doesn't report (an LP has no
+    # node count, an older Gurobi no memory figures) are left out
+    statistics = {}
+    for field, attribute in STATISTICS_ATTRIBUTES.items():
+        try:
+            statistics[field] = model.getAttr(attribute)
+        except (AttributeError, gp.GurobiError):
+            pass
+    return statistics
+
+
+def optimize(model, cancel_event=None, on_solution=None):
+    # timed and reported optimize, stopping early once cancel_event is set; on_solution(model) is called
+    # inside the MIPSOL callback for every new solution
+    with phase("optimize", backend="gurobi") as fields:
+        if cancel_event is None and on_solution is None:
+            model.optimize()
+        else:
+            def callback(model, where):
+                if cancel_event is not None and cancel_event.is_set():
+                    model.terminate()
+                elif on_solution is not None and where == GRB.Callback.MIPSOL:
+                    on_solution(model)
+
+            model.optimize(callback)
+        fields["status"] = gurobi_status(model.status)
+        fields.update(gurobi_statistics(model))
+    environment_pool().account(model, fields.get("mem_used"))
+
+
+def start_environment():
+    # starts the first pooled environment (license check and banner), later models reuse it
+    environment_pool().warm()
+
+
+def gurobi_status(code):
+    return GUROBI_STATUSES.get(code, SolverBackend.ERROR)
 
 
 class GurobiSolverBuilder:
     def __init__(self):
         self.decision_variables = []
-        self.constraints_RHS = []
-        self.constraints_LHS = []
+        # constraints are kept row-major (one row per constraint, one column per variable)
+        self.constraints_A = None
+        self.constraints_RHS = np.zeros(0)
+        self.constraints_pending = False
+        self.constraints_name = "constraints"
+        # extra A x <= RHS blocks stacked under the main constraint matrix
+        self.extra_constraints = []
+        # bounds and types of every variable, needed by the presolve pass
+        self.variable_lbs = []
+        self.variable_ubs = []
+        self.variable_vtypes = []
+        self.variable_names = []
+        # a solution cache is only consulted when every constraint is known as matrix data
+        self.cache = None
+        self.cacheable = True
+        self.presolve = True
+        self.presolve_info = None
+        # seconds spent in presolve_rows, part of build_time
+        self.presolve_time = 0.0
+        self.matrix_constraints = []
         self.objectives = []
-        self.model = gp.Model()
+        self.created_at = time.perf_counter()
+        # on an environment of the pool, handed back when the built solver is disposed
+        self.model = new_model()
 
     def set_objective(self, coeffs, senses):
-        self.objectives.append((coeffs, senses))
+        self.objectives.append((as_vector(coeffs, len(self.decision_variables)), senses))
         return self
 
     def set_objectives(self, objectives):
@@ -20,82 +143,401 @@ class GurobiSolverBuilder:
 
     def set_objective_multiple(self):
         for count ,(coeffs, senses) in enumerate(self.objectives):
+            # LinExpr(coeffs, vars) is assembled in C, no per-term Python work
+            expr = gp.LinExpr(as_vector(coeffs, len(self.decision_variables)).tolist(), self.decision_variables)
             if count == 0:
-                self.model.setObjective(gp.quicksum(
-                coeffs[i] * self.decision_variables[i] for i in range(len(self.decision_variables))), sense=senses)
+                self.model.setObjective(expr, sense=senses)
             else:
-                self.model.setObjectiveN(gp.quicksum(
-                coeffs[i] * self.decision_variables[i] for i in range(len(self.decision_variables))), index=count,priority=count)
+                self.model.setObjectiveN(expr, index=count,priority=count)
 
     def set_constraints_LHS(self, LHS):
-        self.constraints_LHS = LHS
+        # LHS[i][j] is the coefficient of variable i in constraint j (one row per variable)
+        self.constraints_A = as_csr(LHS).T.tocsr()
+        self.constraints_pending = True
+        return self
+
+    def set_constraints_matrix(self, A, RHS=None):
+        # A[j][i] is the coefficient of variable i in constraint j (one row per constraint)
+        self.constraints_A = as_csr(A)
+        self.constraints_pending = True
+        if RHS is not None:
+            self.set_constraints_RHS(RHS)
         return self
 
     def set_constraints_RHS(self, RHS):
-        self.constraints_RHS = RHS
+        self.constraints_RHS = as_vector(RHS, 0)
         return self
 
     def add_constraint(self, expr, sense, rhs, name=""):
-        self.model.addConstr(expr, sense, rhs, name=name)
+        # free-form expressions can't be hashed, so they turn the solution cache off for this model
+        self.cacheable = False
+        self.model.addLConstr(expr, sense, rhs, name=name)
+        return self
+
+    def add_constraint_rows(self, A, RHS):
+        # extra A x <= RHS rows on top of the main constraint matrix (negate both sides for >=)
+        self.extra_constraints.append((as_csr(A), as_vector(RHS, 0)))
+        self.constraints_pending = True
         return self
 
     def add_constraints(self, name="constraints"):
-        self.model.addConstrs((gp.quicksum(self.constraints_LHS[i][j]*self.decision_variables[i] for i in range(
-            len(self.decision_variables))) <= self.constraints_RHS[j] for j in range(len(self.constraints_RHS))), name=name)
+        # A x <= RHS is only added to the model in build(), once it has been presolved
+        self.constraints_name = name
+        return self
+
+    def set_presolve(self, presolve):
+        self.presolve = presolve
+        return self
+
+    def set_cache(self, cache):
+        self.cache = cache
+        return self
+
+    def constraints_matrix(self):
+        # the main matrix and every extra block as one A x <= RHS system
+        blocks = [(self.constraints_A, self.constraints_RHS)] if self.constraints_A is not None else []
+        blocks += self.extra_constraints
+        if not blocks:
+            return sp.csr_matrix((0, len(self.decision_variables))), np.zeros(0)
+        for A, b in blocks:
+            if A.shape[0] != len(b):
+                raise ValueError(f"constraint matrix has {A.shape[0]} rows but {len(b)} right-hand sides")
+        if len(blocks) == 1:
+            return blocks[0]
+        return sp.vstack([A for A, _ in blocks], format='csr'), np.concatenate([b for _, b in blocks])
+
+    def cache_key(self):
+        A, b = self.constraints_matrix()
+        return instance_key(A, b, [(as_vector(coeffs, len(self.decision_variables)), senses) for coeffs, senses in self.objectives],
+                            np.concatenate(self.variable_lbs), np.concatenate(self.variable_ubs),
+                            np.concatenate(self.variable_vtypes), self.variable_names)
+
+    def add_pending_constraints(self):
+        # adds A x <= RHS in a single addMConstr call, zero coefficients are never touched
+        start = time.perf_counter()
+        A, b = self.constraints_matrix()
+        rows = A.shape[0]
+        if A.shape[0] != len(b):
+            raise ValueError(f"constraint matrix has {A.shape[0]} rows but {len(b)} right-hand sides")
+        if A.shape[1] != len(self.decision_variables):
+            raise ValueError(f"constraint matrix has {A.shape[1]} columns but {len(self.decision_variables)} variables")
+        if self.presolve and A.shape[0] > 0:
+            lbs = np.concatenate(self.variable_lbs)
+            ubs = np.concatenate(self.variable_ubs)
+            integer = np.concatenate(self.variable_vtypes) != GRB.CONTINUOUS
+            presolve_start = time.perf_counter()
+            self.presolve_info = presolve_rows(A, b, lbs, ubs, integer)
+            self.presolve_time = time.perf_counter() - presolve_start
+            x = self.variables_mvar()
+            # singleton rows have become bounds, only push the bounds that actually moved
+            changed = np.flatnonzero(self.presolve_info.lbs != lbs)
+            if len(changed):
+                x[changed].lb = self.presolve_info.lbs[changed]
+            changed = np.flatnonzero(self.presolve_info.ubs != ubs)
+            if len(changed):
+                x[changed].ub = self.presolve_info.ubs[changed]
+            A = self.presolve_info.reduced_A
+            b = self.presolve_info.reduced_b
+        if A.shape[0] > 0:
+            self.matrix_constraints = self.model.addMConstr(
+                A, self.variables_mvar(), GRB.LESS_EQUAL, b, name=self.constraints_name).tolist()
+        self.constraints_pending = False
+        emit("constraints", backend="gurobi", rows=rows, added=len(self.matrix_constraints),
+             presolve_seconds=self.presolve_time, seconds=time.perf_counter() - start)
         return self
 
+    def variables_mvar(self):
+        return gp.MVar.fromlist(self.decision_variables)
+
     def add_variable(self, name, lb=0, ub=GRB.INFINITY, vtype=GRB.CONTINUOUS):
         self.decision_variables.append(self.model.addVar(
             name=name, lb=lb, ub=ub, vtype=vtype))
+        self.variable_lbs.append(np.array([lb], dtype=float))
+        self.variable_ubs.append(np.array([ub], dtype=float))
+        self.variable_vtypes.append(np.array([vtype]))
+        self.variable_names.append(name)
         return self
 
     def add_variables(self, number_of_variables, names=None, lbs=None, ubs=None, vtypes=None):
         if names is None:
             names = [("x " + str(i)) for i in range(number_of_variables)]
-        if lbs is None:
-            lbs = [0 for i in range(number_of_variables)]
-        if ubs is None:
-            ubs = [GRB.INFINITY for i in range(number_of_variables)]
-        if vtypes is None:
-            vtypes = [GRB.CONTINUOUS for i in range(number_of_variables)]
-        for i in range(number_of_variables):
-            self = self.add_variable(names[i], lbs[i], ubs[i], vtypes[i])
+        lbs = as_vector(lbs, number_of_variables, 0.0)
+        ubs = as_vector(ubs, number_of_variables, GRB.INFINITY)
+        vtypes = as_vector(vtypes, number_of_variables, GRB.CONTINUOUS, dtype='U1')
+        # one addMVar call for the whole block instead of one addVar per variable
+        variables = self.model.addMVar(number_of_variables, lb=lbs, ub=ubs, vtype=vtypes, name=list(names))
+        self.decision_variables.extend(variables.tolist())
+        self.variable_lbs.append(lbs)
+        self.variable_ubs.append(ubs)
+        self.variable_vtypes.append(vtypes)
+        self.variable_names.extend(names)
         return self
 
     def build(self):
-        self = self.add_constraints()
-        self.set_objective_multiple()
-        return GurobiSolver(self.model, self.decision_variables)
+        cache_key = None
+        if self.cache is not None and self.cacheable and self.decision_variables:
+            cache_key = self.cache_key()
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                # same instance solved before: skip constraints, presolve and optimize altogether
+                release_model(self.model)
+                emit("build", backend="gurobi", variables=len(self.decision_variables), cached=True,
+                     seconds=time.perf_counter() - self.created_at)
+                return CachedSolver(cached, time.perf_counter() - self.created_at)
+        try:
+            if self.constraints_pending:
+                self.add_pending_constraints()
+            self.set_objective_multiple()
+        except Exception:
+            release_model(self.model)
+            raise
+        solver = GurobiSolver(self.model, self.decision_variables, self.matrix_constraints, self.presolve_info)
+        solver.build_time = time.perf_counter() - self.created_at
+        solver.presolve_time = self.presolve_time
+        if cache_key is not None:
+            solver.set_cache(self.cache, cache_key)
+        emit("build", backend="gurobi", variables=len(self.decision_variables),
+             constraints=len(self.matrix_constraints), objectives=len(self.objectives), cached=False,
+             seconds=solver.build_time)
+        return solver
 
 
 class GurobiSolver:
-    def __init__(self, model, decision_variables):
+    def __init__(self, model, decision_variables, matrix_constraints=None, presolve_info=None):
         self.model = model
         self.decision_variables = decision_variables 
+        # rows added from the constraint matrix, and the map from them back to the rows the caller passed in
+        self.matrix_constraints = matrix_constraints or []
+        self.presolve_info = presolve_info
+        # every decision variable as one MVar, their names and the name -> position map, built on first use
+        self.variable_block = None
+        self.variable_names = None
+        self.name_index = None
+        self.cache = None
+        self.cache_key = None
+        # called with a PoolSolution for every solution found, see set_solution_pool
+        self.solution_report = None
+        self.build_time = 0.0
+        self.presolve_time = 0.0
+        self.solve_time = 0.0
+
+    def set_cache(self, cache, cache_key):
+        # final results of solve() are stored in cache under cache_key
+        self.cache = cache
+        self.cache_key = cache_key
+        return self
+
+    def dispose(self):
+        # frees the native model and returns its environment to the pool; read the results first.
+        # Used as a context manager, the solver is disposed when the block ends.
+        if self.model is not None:
+            release_model(self.model)
+            self.model = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
+        return False
+
+    def solve(self, cancel_event=None):
+        # cancel_event is a threading.Event another thread can set to stop the solve early
+        start = time.perf_counter()
+        with phase("update", backend="gurobi"):
+            self.model.update()
+        on_solution = None
+        if self.solution_report is not None:
+            def on_solution(model):
+                objective_value = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+                gap = SolverBackend.relative_gap(objective_value, model.cbGet(GRB.Callback.MIPSOL_OBJBND))
+                self.solution_report(SolverBackend.PoolSolution(objective_value,
+                                                                model.cbGetSolution(self.variable_mvar()), gap))
+        optimize(self.model, cancel_event, on_solution)
+        self.solve_time = time.perf_counter() - start
+        self.store_in_cache()
 
-    def solve(self):
-        self.model.optimize()
+    def store_in_cache(self):
+        # interrupted or time-limited solves are not final and never cached
+        if self.cache is None or self.get_status() not in FINAL_STATUSES:
+            return
+        if self.has_solution():
+            values = self.get_values()
+            objective_value = self.model.objVal
+        else:
+            values, objective_value = None, None
+        # the report goes in too: the live production LP shares these keys and answers what-if
+        # questions from the report of a cache hit
+        sensitivity = self.get_sensitivity() if self.has_sensitivity() else None
+        self.cache.put(self.cache_key, CachedSolution(self.get_status(), objective_value, values, self.get_names(),
+                                                      sensitivity=sensitivity))
 
     def get_solution_status(self):
         return self.model.status
 
+    def get_status(self):
+        return gurobi_status(self.model.status)
+
+    def get_result(self):
+        with phase("extract", backend="gurobi", variables=len(self.decision_variables)):
+            return self.extract_result()
+
+    def extract_result(self):
+        values, objective_value, mip_gap, best_bound = None, None, None, None
+        if self.has_solution():
+            values = self.get_values()
+            objective_value = self.model.objVal
+            if self.model.IsMIP:
+                try:
+                    mip_gap, best_bound = self.model.MIPGap, self.model.ObjBound
+                except (AttributeError, gp.GurobiError):
+                    # not reported for every multi-objective model
+                    pass
+        result = SolveResult(self.get_status(), objective_value, values, self.get_names(), "gurobi",
+                             self.build_time, self.solve_time, self.model.status, mip_gap, best_bound)
+        if self.has_sensitivity():
+            result.sensitivity = self.get_sensitivity()
+        return result
+
+    def has_sensitivity(self):
+        # only an optimal single-objective LP has a sensitivity report
+        return self.get_status() == SolverBackend.OPTIMAL and not self.model.IsMIP and self.model.NumObj <= 1
+
+    def has_solution(self):
+        return self.model.SolCount > 0
+
+    def get_array(self, attribute):
+        # one attribute of every decision variable as a NumPy array in variable order, read in one call
+        if not self.decision_variables:
+            return np.zeros(0)
+        return np.asarray(self.variable_mvar().getAttr(attribute))
+
+    def variable_mvar(self):
+        if self.variable_block is None:
+            self.variable_block = gp.MVar.fromlist(self.decision_variables)
+        return self.variable_block
+
+    def get_arrays(self, attributes=None):
+        # {attribute: array}: by default the solution values, the bounds and, for LPs, the reduced costs
+        if attributes is None:
+            attributes = ("X", "LB", "UB") if self.model.IsMIP else ("X", "LB", "UB", "RC")
+        return {attribute: self.get_array(attribute) for attribute in attributes}
+
+    def get_values(self):
+        return self.get_array("X")
+
+    def race(self, configurations=None, threads=None, time_limit=None, cancel_event=None):
+        # solves the model under several parameter sets at once in separate processes (see SolverRace) and
+        # returns a RaceResult: the first proven optimum, or the best solution at time_limit, and the winner
+        from SolverRace import race_model
+        with phase("update", backend="gurobi"):
+            self.model.update()
+        race = race_model(self.model, [variable.index for variable in self.decision_variables], self.get_names(),
+                          configurations, threads, time_limit, cancel_event)
+        race.result.build_time = self.build_time
+        self.solve_time = race.result.solve_time
+        return race
+
+    def set_solution_pool(self, size, search_mode=2, gap=None, report=None):
+        # keep up to size solutions (PoolSolutions); search_mode 2 searches systematically for the size best
+        # ones (PoolSearchMode), gap drops solutions further than that from the optimum (PoolGap).
+        # report(PoolSolution) is called on the solving thread for every solution the search finds.
+        self.model.Params.PoolSolutions = size
+        self.model.Params.PoolSearchMode = search_mode
+        if gap is not None:
+            self.model.Params.PoolGap = gap
+        self.solution_report = report
+
+    def get_pool(self):
+        # the pool solutions, best first, each with its gap to the best one; for multi-objective
+        # models the objective value is the first objective's, like get_objective_value
+        pool = []
+        for number in range(self.model.SolCount):
+            self.model.Params.SolutionNumber = number
+            pool.append(SolverBackend.PoolSolution(self.model.PoolObjVal, self.get_array("Xn")))
+        # back to the best solution, which Xn and PoolObjVal read by default
+        self.model.Params.SolutionNumber = 0
+        for solution in pool:
+            solution.gap = SolverBackend.relative_gap(solution.objective_value, pool[0].objective_value)
+        return pool
+
+    def set_start(self, values):
+        # MIP start for the next solve, in variable order
+        if self.decision_variables:
+            self.variable_mvar().Start = np.asarray(values, dtype=float)
+
+    def get_names(self):
+        if self.variable_names is None:
+            self.variable_names = self.get_array("VarName").tolist() if self.decision_variables else []
+        return self.variable_names
+
+    def index_of(self, name):
+        if self.name_index is None:
+            self.name_index = name_index(self.get_names())
+        return self.name_index[name]
+
     def get_variable(self, name):
-        return self.model.getVarByName(name).X
+        return self.decision_variables[self.index_of(name)].X
 
     def get_variables(self):
-        vars = {}
-        for var in self.model.getVars():
-            print(var.varName, '=', var.X)
-            vars[var.varName] = var.X
-        return vars
+        return dict(zip(self.get_names(), self.get_values().tolist()))
 
     def get_objective_value(self):
         return self.model.objVal
+
+    def get_constraint_slacks(self):
+        # slacks of the original A x <= RHS rows, including the ones presolve removed
+        if self.presolve_info is None:
+            return np.array(self.model.getAttr("Slack", self.matrix_constraints))
+        return self.presolve_info.original_slacks(self.get_values())
+
+    def get_constraint_duals(self):
+        # shadow prices of the original A x <= RHS rows (LP models only)
+        duals = np.array(self.model.getAttr("Pi", self.matrix_constraints))
+        if self.presolve_info is None:
+            return duals
+        return self.presolve_info.original_duals(duals, self.get_array("RC"), self.get_values())
     
+    def get_sensitivity(self):
+        # shadow prices, reduced costs and validity ranges of a solved single-objective LP, reported
+        # against the original A x <= RHS rows; rows presolve removed get their dual, and a range only
+        # when they are slack
+        if self.model.IsMIP or self.model.NumObj > 1:
+            raise AttributeError("sensitivity ranges are only available for single-objective LP models")
+        variables = self.variable_mvar() if self.decision_variables else []
+        sensitivity = gurobi_sensitivity(self.model, variables, self.matrix_constraints)
+        if self.presolve_info is None:
+            return sensitivity
+        rows = len(self.presolve_info.b)
+        kept = self.presolve_info.kept_rows
+
+        def original(reduced):
+            values = np.full(rows, np.nan)
+            values[kept] = reduced
+            return values
+
+        sensitivity.b = self.presolve_info.b
+        sensitivity.pi = self.get_constraint_duals()
+        sensitivity.slack = self.get_constraint_slacks()
+        sensitivity.rhs_low = original(sensitivity.rhs_low)
+        sensitivity.rhs_up = original(sensitivity.rhs_up)
+        # a removed row that isn't binding keeps the plan optimal down to its activity and without an upper limit
+        slack_rows = np.flatnonzero(np.isnan(sensitivity.rhs_low) & (sensitivity.slack > 1e-9) & (sensitivity.pi == 0))
+        sensitivity.rhs_low[slack_rows] = sensitivity.b[slack_rows] - sensitivity.slack[slack_rows]
+        sensitivity.rhs_up[slack_rows] = np.inf
+        row_names = [""] * rows
+        for row, name in zip(kept.tolist(), sensitivity.row_names):
+            row_names[row] = name
+        sensitivity.row_names = row_names
+        return sensitivity
+
     def add_constraint(self, expr, sense, rhs, name=""):
-        self.model.addConstr(expr, sense, rhs, name=name)
+        # the model no longer matches its cache key
+        self.cache = None
+        self.model.addLConstr(expr, sense, rhs, name=name)
         return self
 
+
 # Example usage
 # builder = GurobiSolverBuilder()
 # builder.add_variables(2, names=['x1', 'x2'])
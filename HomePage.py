@@ -1,8 +1,11 @@
 from PyQt5.QtWidgets import QWidget, QPushButton, QVBoxLayout, QLabel
 from PyQt5.QtGui import QMovie
 from PyQt5 import QtCore
-from PLNE_Problem import CelebrityWidget
-from PL_Problem import ToyFactoryGUI
+from SolveWorker import preload_solver
+
+# the pages import NumPy, SciPy and the solver stack: they are loaded on first use, or by the
+# background preload once the home page is on screen
+PAGE_MODULES = ("PL_Problem", "PLNE_Problem")
 
 
 class HomePage(QWidget):
@@ -17,10 +20,10 @@ class HomePage(QWidget):
         label.setAlignment(QtCore.Qt.AlignCenter)
         label.setStyleSheet("font-size: 30px; font-family: 'Arial'; margin-bottom: 20px; margin-top: 40px; font-weight: bold; color: #A67943  ;")
         layout.addWidget(label)
+        # the animation is created at the first show and only runs while the page is visible
         gif_label = QLabel()
-        movie = QMovie("welcome.gif")
-        gif_label.setMovie(movie)
-        movie.start()
+        self.gif_label = gif_label
+        self.movie = None
         gif_label.setAlignment(QtCore.Qt.AlignCenter)
         gif_label.setStyleSheet("margin-top: 0px;")
         
@@ -46,13 +49,31 @@ class HomePage(QWidget):
         self.page1 = None  # Initialize page1 as None
         self.page2 = None  # Initialize page1 as None
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.movie is None:
+            self.movie = QMovie("welcome.gif", parent=self)
+            self.gif_label.setMovie(self.movie)
+            self.movie.start()
+            # after the first paint, load the pages and start the solver in the background
+            QtCore.QTimer.singleShot(0, lambda: preload_solver(PAGE_MODULES))
+        else:
+            self.movie.setPaused(False)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        if self.movie is not None:
+            self.movie.setPaused(True)
+
     def open_page1(self):
+        from PL_Problem import ToyFactoryGUI
         self.hide()  # Hide the home page
         if not self.page1:  # Check if page1 is already created
             self.page1 = ToyFactoryGUI()
         self.page1.show()
 
     def open_page2(self):
+        from PLNE_Problem import CelebrityWidget
         self.hide()  # Hide the home page
         if not self.page2:  # Check if page1 is already created
             self.page2 = CelebrityWidget()
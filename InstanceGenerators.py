@@ -0,0 +1,74 @@
+import numpy as np
+import scipy.sparse as sp
+
+from InstanceIO import CelebrityColumns
+
+# Seeded random instances of both models, for benchmarks: the same arguments always give the same
+# instance, on any machine.
+
+
+def production_instance(items, resources=3, density=1.0, seed=0):
+    # production LP with `items` items and `resources` resources, every item using each resource with
+    # probability density (and at least one resource). Returns (A, capacities, benefits, demand) for
+    # ProductionProblem.build_resource_lp; capacities cover about a third of the total demand.
+    rng = np.random.default_rng(seed)
+    A = sp.random(resources, items, density=density, format="csr", random_state=rng,
+                  data_rvs=lambda size: rng.uniform(1.0, 10.0, size))
+    # the resource of item j that is always used
+    A = A + sp.csr_matrix((rng.uniform(1.0, 10.0, items), (rng.integers(resources, size=items), np.arange(items))),
+                          shape=(resources, items))
+    demand = rng.uniform(1.0, 20.0, items)
+    benefits = rng.uniform(1.0, 50.0, items)
+    capacities = A @ demand / 3
+    return A.tocsr(), capacities, benefits, demand
+
+
+def conflict_pairs(people, density, rng):
+    # about density * people * (people - 1) / 2 distinct (i, j) pairs with i < j
+    count = int(round(density * people * (people - 1) / 2))
+    if people < 2 or count == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    pairs = rng.integers(people, size=(count, 2))
+    pairs = np.sort(pairs[pairs[:, 0] != pairs[:, 1]], axis=1)
+    return np.unique(pairs, axis=0).astype(np.int64)
+
+
+def celebrity_instance(people, vip_ratio=0.1, conflict_density=0.001, seed=0):
+    # guest selection instance: returns (CelebrityColumns, ship_weight, budget, min_vip_count), the ship
+    # and the budget taking about a tenth of everyone. Conflicts are conflict_pairs (no names), as read
+    # from a binary file.
+    rng = np.random.default_rng(seed)
+    salaries = rng.uniform(10.0, 100.0, people).round(2)
+    masses = rng.uniform(40.0, 120.0, people).round(1)
+    popularities = rng.integers(1, 11, people).astype(float)
+    vips = rng.random(people) < vip_ratio
+    if people and not vips.any():
+        vips[rng.integers(people)] = True
+    columns = CelebrityColumns([f"Celebrity {i + 1}" for i in range(people)], salaries, masses, popularities, vips,
+                               conflict_pairs=conflict_pairs(people, conflict_density, rng))
+    return columns, float(masses.sum() / 10), float(salaries.sum() / 10), 1
+
+
+def planning_instance(items, periods, resources_used=1.0, seed=0):
+    # multi-period production instance (ProductionPlanning.PlanningInstance): daily demand with a
+    # yearly season and a weekly pattern per item, a capacity calendar with no manual or machine hours
+    # on weekends and a few maintenance days without machine hours, holding costs of 2% of the price
+    from ProductionPlanning import PlanningInstance
+    from ProductionProblem import DEMAND, PRICE
+    A, _, _, mean_demand = production_instance(items, density=resources_used, seed=seed)
+    rng = np.random.default_rng(seed + 1)
+    rows = np.zeros((items, 5))
+    rows[:, :3] = A.T.toarray()
+    rows[:, DEMAND] = mean_demand
+    salary, raw_material_cost = 2.0, 1.0
+    # every item sells at 1.2 to 3 times what it costs to make
+    rows[:, PRICE] = (rows[:, 0] * salary + rows[:, 2] * raw_material_cost) * rng.uniform(1.2, 3.0, items)
+    t = np.arange(periods)[:, None]
+    season = 1.0 + 0.5 * np.sin(2 * np.pi * t / 365 + rng.uniform(0, 2 * np.pi, items))
+    week = np.where(t % 7 >= 5, 1.5, 1.0)
+    demand = (mean_demand * season * week * rng.lognormal(0.0, 0.2, (periods, items))).round(1)
+    # working days cover about 90% of the mean demand, weekends are made up ahead
+    capacities = np.tile(A @ mean_demand * 0.9 * 7 / 5, (periods, 1))
+    capacities[(t % 7 >= 5).ravel(), :2] = 0.0
+    capacities[rng.random(periods) < 0.02, 1] = 0.0
+    return PlanningInstance(rows, demand, capacities, salary, raw_material_cost, rows[:, PRICE] * 0.02)
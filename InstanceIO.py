@@ -0,0 +1,322 @@
+import csv
+import json
+from itertools import islice
+
+import numpy as np
+
+from ProductionProblem import RESOURCE_NAMES
+
+# Two file formats for both problem types:
+#  - CSV with a header row, read and written CHUNK_ROWS rows at a time
+#  - a columnar binary file: MAGIC, the header length (uint64), a JSON header giving each column's
+#    dtype, shape and offset, then the raw column data, each column aligned to ALIGNMENT bytes.
+#    Columns are read back with np.memmap, so loading costs neither time nor memory per row.
+CHUNK_ROWS = 65536
+MAGIC = b"ORCOLUMN"
+ALIGNMENT = 64
+
+PRODUCTION_COLUMNS = RESOURCE_NAMES + ["price", "demand"]
+CELEBRITY_COLUMNS = ["name", "salary", "mass", "popularity", "vip", "problems_with"]
+# file dialog filter for both formats
+FILE_FILTER = "CSV files (*.csv);;Columnar binary files (*.bin)"
+# separates names in the problems_with column of celebrity CSV files
+PROBLEMS_SEPARATOR = ";"
+
+
+def is_binary(path):
+    return not str(path).lower().endswith(".csv")
+
+
+# -- columnar binary files --------------------------------------------------------------------------
+
+def write_columns(path, kind, columns):
+    # columns maps names to arrays (memory-mapped arrays are fine, they are copied chunk by chunk)
+    header = {"kind": kind, "columns": {}}
+    offset = 0
+    arrays = {}
+    for name, array in columns.items():
+        array = np.asarray(array)
+        arrays[name] = array
+        header["columns"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    header_bytes = json.dumps(header).encode()
+    # data starts aligned too
+    header_bytes += b" " * (-(len(MAGIC) + 8 + len(header_bytes)) % ALIGNMENT)
+    data_start = len(MAGIC) + 8 + len(header_bytes)
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(np.uint64(len(header_bytes)).tobytes())
+        file.write(header_bytes)
+        for name, array in arrays.items():
+            file.seek(data_start + header["columns"][name]["offset"])
+            flat = array.reshape(-1)
+            for start in range(0, len(flat), CHUNK_ROWS):
+                file.write(np.ascontiguousarray(flat[start:start + CHUNK_ROWS]).tobytes())
+        file.truncate(data_start + offset)
+
+
+def read_columns(path, kind=None):
+    # returns (kind, {name: read-only memory-mapped array})
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a columnar instance file")
+        header_length = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+        header = json.loads(file.read(header_length))
+    if kind is not None and header["kind"] != kind:
+        raise ValueError(f"{path} holds a {header['kind']!r} file, expected {kind!r}")
+    data_start = len(MAGIC) + 8 + header_length
+    columns = {}
+    for name, column in header["columns"].items():
+        shape = tuple(column["shape"])
+        if 0 in shape:
+            columns[name] = np.zeros(shape, dtype=column["dtype"])
+        else:
+            columns[name] = np.memmap(path, dtype=column["dtype"], mode="r", shape=shape,
+                                      offset=data_start + column["offset"])
+    return header["kind"], columns
+
+
+# -- production items -------------------------------------------------------------------------------
+
+def iter_production_csv(path, chunk_rows=CHUNK_ROWS):
+    # yields (rows, 5) arrays of [hours, machine hours, raw materials, price, demand]
+    with open(path, newline="") as file:
+        header = next(csv.reader([file.readline()]), [])
+        if [column.strip() for column in header] != PRODUCTION_COLUMNS:
+            raise ValueError(f"{path}: expected the columns {','.join(PRODUCTION_COLUMNS)}")
+        first_line = 2
+        while True:
+            lines = list(islice(file, chunk_rows))
+            if not lines:
+                return
+            try:
+                chunk = np.loadtxt(lines, delimiter=",", ndmin=2)
+            except ValueError:
+                chunk = None
+            if chunk is None or chunk.shape[1] != len(PRODUCTION_COLUMNS) or not np.all(chunk >= 0):
+                line, message = _bad_production_line(lines, first_line)
+                raise ValueError(f"{path}:{line}: {message}")
+            first_line += len(lines)
+            yield chunk
+
+
+def _bad_production_line(lines, first_line):
+    # (line number, reason) of the first row of a chunk np.loadtxt refused or that holds a negative or
+    # missing value; only called once a chunk is known to be bad, so the fast path stays vectorized
+    for line, text in enumerate(lines, first_line):
+        if not text.strip():
+            continue
+        fields = text.split(",")
+        if len(fields) != len(PRODUCTION_COLUMNS):
+            return line, f"expected {len(PRODUCTION_COLUMNS)} values, found {len(fields)}"
+        for column, field in zip(PRODUCTION_COLUMNS, fields):
+            try:
+                value = float(field)
+            except ValueError:
+                return line, f"{column} is not a number: {field.strip()!r}"
+            if not value >= 0:
+                return line, f"{column} is negative or missing"
+    return first_line, "unreadable rows"
+
+
+def read_production_csv(path, chunk_rows=CHUNK_ROWS):
+    chunks = list(iter_production_csv(path, chunk_rows))
+    return np.concatenate(chunks) if chunks else np.zeros((0, len(PRODUCTION_COLUMNS)))
+
+
+def write_production_csv(path, items, chunk_rows=CHUNK_ROWS):
+    items = np.asarray(items, dtype=float).reshape(-1, len(PRODUCTION_COLUMNS))
+    with open(path, "w", newline="") as file:
+        file.write(",".join(PRODUCTION_COLUMNS) + "\n")
+        for start in range(0, len(items), chunk_rows):
+            np.savetxt(file, items[start:start + chunk_rows], delimiter=",", fmt="%.17g")
+
+
+def read_production_binary(path):
+    # (items, 5) view of the file's (5, items) columns, ready for ProductionProblem.production_arrays
+    _, columns = read_columns(path, "production")
+    return columns["items_by_column"].T
+
+
+def write_production_binary(path, items):
+    items = np.asarray(items, dtype=float).reshape(-1, len(PRODUCTION_COLUMNS))
+    write_columns(path, "production", {"items_by_column": items.T})
+
+
+def read_production(path):
+    return read_production_binary(path) if is_binary(path) else read_production_csv(path)
+
+
+def write_production(path, items):
+    if is_binary(path):
+        write_production_binary(path, items)
+    else:
+        write_production_csv(path, items)
+
+
+def write_production_solution(path, names, values, chunk_rows=CHUNK_ROWS):
+    # chosen quantity of every item
+    values = np.asarray(values, dtype=float)
+    if is_binary(path):
+        write_columns(path, "production_solution", {"quantity": values})
+        return
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["item", "quantity"])
+        for start in range(0, len(values), chunk_rows):
+            writer.writerows(zip(names[start:start + chunk_rows], values[start:start + chunk_rows].tolist()))
+
+
+# -- multi-period production ------------------------------------------------------------------------
+
+def read_planning(path):
+    # ProductionPlanning.PlanningInstance with demand and capacities left memory-mapped, binary files only
+    from ProductionPlanning import PlanningInstance
+    _, columns = read_columns(path, "planning")
+    salary, raw_material_cost = np.asarray(columns["costs"], dtype=float)
+    return PlanningInstance(columns["items_by_column"].T, columns["demand"], columns["capacities"], salary,
+                            raw_material_cost, columns["holding_costs"], columns["initial_stock"])
+
+
+def write_planning(path, instance):
+    write_columns(path, "planning", {"items_by_column": instance.items.T, "demand": instance.demand,
+                                     "capacities": instance.capacities,
+                                     "holding_costs": instance.holding_costs,
+                                     "initial_stock": instance.initial_stock,
+                                     "costs": np.array([instance.salary, instance.raw_material_cost], dtype=float)})
+
+
+# -- celebrities ------------------------------------------------------------------------------------
+
+class CelebrityColumns:
+    # one chunk (or a whole file) of celebrities; conflicts are (i, j) row pairs, problems_with the
+    # names listed in the CSV column (None when the rows came from a binary file)
+    def __init__(self, names, salaries, masses, popularities, vips, problems_with=None, conflict_pairs=None):
+        self.names = names
+        self.salaries = salaries
+        self.masses = masses
+        self.popularities = popularities
+        self.vips = vips
+        self.problems_with = problems_with
+        self.conflict_pairs = conflict_pairs if conflict_pairs is not None else np.zeros((0, 2), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.names)
+
+
+def _parse_vip(text):
+    return text.strip().lower() in ("true", "1", "yes", "vip")
+
+
+def iter_celebrity_csv(path, chunk_rows=CHUNK_ROWS):
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        header = [column.strip() for column in next(reader, [])]
+        if header[:5] != CELEBRITY_COLUMNS[:5]:
+            raise ValueError(f"{path}: expected the columns {','.join(CELEBRITY_COLUMNS)}")
+        rows = []
+        for row in reader:
+            if not any(field.strip() for field in row):
+                # blank lines, a trailing one included
+                continue
+            if len(row) < 5:
+                raise ValueError(f"{path}:{reader.line_num}: expected at least 5 columns")
+            rows.append(row)
+            if len(rows) == chunk_rows:
+                yield _celebrity_chunk(path, rows)
+                rows = []
+        if rows:
+            yield _celebrity_chunk(path, rows)
+
+
+def _celebrity_chunk(path, rows):
+    try:
+        numbers = np.array([row[1:4] for row in rows], dtype=float)
+    except ValueError as error:
+        raise ValueError(f"{path}: {error}") from None
+    return CelebrityColumns(
+        [row[0] for row in rows], numbers[:, 0], numbers[:, 1], numbers[:, 2],
+        np.array([_parse_vip(row[4]) for row in rows], dtype=bool),
+        [[name for name in row[5].split(PROBLEMS_SEPARATOR) if name] if len(row) > 5 else []
+         for row in rows])
+
+
+def read_celebrity_csv(path, chunk_rows=CHUNK_ROWS):
+    chunks = list(iter_celebrity_csv(path, chunk_rows))
+    if not chunks:
+        return CelebrityColumns([], np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0, dtype=bool), [])
+    return CelebrityColumns(
+        [name for chunk in chunks for name in chunk.names],
+        np.concatenate([chunk.salaries for chunk in chunks]),
+        np.concatenate([chunk.masses for chunk in chunks]),
+        np.concatenate([chunk.popularities for chunk in chunks]),
+        np.concatenate([chunk.vips for chunk in chunks]),
+        [problems for chunk in chunks for problems in chunk.problems_with])
+
+
+def write_celebrity_csv(path, store, chunk_rows=CHUNK_ROWS):
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(CELEBRITY_COLUMNS)
+        for start in range(0, len(store), chunk_rows):
+            rows = range(start, min(start + chunk_rows, len(store)))
+            writer.writerows(
+                (store.names[i], store.salaries[i], store.masses[i], store.popularities[i], bool(store.vips[i]),
+                 PROBLEMS_SEPARATOR.join(store.problems_with[i])) for i in rows)
+
+
+def read_celebrity_binary(path):
+    _, columns = read_columns(path, "celebrities")
+    # names are one UTF-8 blob split by offsets
+    name_bytes = bytes(columns["name_bytes"])
+    offsets = np.asarray(columns["name_offsets"]).tolist()
+    names = [name_bytes[offsets[i]:offsets[i + 1]].decode() for i in range(len(offsets) - 1)]
+    return CelebrityColumns(names, columns["salary"], columns["mass"], columns["popularity"],
+                            columns["vip"].astype(bool), conflict_pairs=columns["conflict_pairs"])
+
+
+def write_celebrity_binary(path, store):
+    write_celebrity_columns(path, CelebrityColumns(store.names, store.salary_column(), store.mass_column(),
+                                                   store.popularity_column(), store.vip_column(),
+                                                   conflict_pairs=store.conflicts.pairs()))
+
+
+def write_celebrity_columns(path, columns):
+    # CelebrityColumns as a columnar binary file, for snapshots taken without a store
+    encoded = [name.encode() for name in columns.names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in encoded], out=offsets[1:])
+    pairs = np.array(columns.conflict_pairs, dtype=np.int64).reshape(-1, 2)
+    write_columns(path, "celebrities", {
+        "salary": np.asarray(columns.salaries, dtype=float),
+        "mass": np.asarray(columns.masses, dtype=float),
+        "popularity": np.asarray(columns.popularities, dtype=float),
+        "vip": np.asarray(columns.vips).astype(np.uint8),
+        "name_offsets": offsets,
+        "name_bytes": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "conflict_pairs": pairs,
+    })
+
+
+def read_celebrities(path):
+    return read_celebrity_binary(path) if is_binary(path) else read_celebrity_csv(path)
+
+
+def write_celebrities(path, store):
+    if is_binary(path):
+        write_celebrity_binary(path, store)
+    else:
+        write_celebrity_csv(path, store)
+
+
+def write_guest_list(path, names, values, chunk_rows=CHUNK_ROWS):
+    # the chosen guests: their names (CSV) or their row indices (binary)
+    selected = np.flatnonzero(np.asarray(values) > 0.5)
+    if is_binary(path):
+        write_columns(path, "guest_list", {"selected": selected.astype(np.int64)})
+        return
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["name"])
+        for start in range(0, len(selected), chunk_rows):
+            writer.writerows([names[i]] for i in selected[start:start + chunk_rows])
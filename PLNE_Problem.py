@@ -1,11 +1,23 @@
 import sys
-from PyQt5.QtCore import Qt
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QModelIndex
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout, \
-    QListWidget, QListWidgetItem, QCheckBox, QMessageBox, QDialog, QDialogButtonBox
-
-from GurobiSolver import GurobiSolverBuilder
-from gurobipy import GRB
-import gurobipy as gp
+    QListWidget, QCheckBox, QMessageBox, QDialog, QDialogButtonBox, QTableView, QHeaderView, QFileDialog, QSpinBox, \
+    QComboBox, QListView, QAbstractItemView
+
+from CelebrityStore import CelebrityStore, COLUMN_TITLES
+from ConflictKnapsack import ConflictKnapsackSolver, knapsack_settings
+from InstanceIO import FILE_FILTER, CelebrityColumns, read_celebrities, write_celebrities, write_guest_list
+from ParetoChart import ParetoChart
+from ProblemCorpus import corpus_from_environment
+from ParetoFrontier import MEASURE_LABELS, MEASURES, SelectionInstance, pareto_frontier
+from SelectionProblem import ALTERNATIVES, ALTERNATIVES_GAP, alternative_lists, build_selection_solver
+from SolutionCache import solution_cache
+from SolveClient import describe_event, service_address, solve_on_service
+from SolveService import selection_problem
+from SolverBackend import LIMIT_REACHED, OPTIMAL, relative_gap
+from SolveWorker import SolveRunner
+from Telemetry import phase
 
 # GUI styles
 style_sheet="""
@@ -53,11 +65,66 @@ style_sheet="""
         background-color:black
     }"""
 
+class CelebrityTableModel(QAbstractTableModel):
+    # read-only table over a CelebrityStore; rows are read from the arrays only when the view paints them
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMN_TITLES)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return str(self.store.value(index.row(), index.column()))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return COLUMN_TITLES[section]
+        return str(section + 1)
+
+    def addCelebrity(self, name, salary, mass, popularity, is_vip, problems_with):
+        row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.add(name, salary, mass, popularity, is_vip, problems_with)
+        self.endInsertRows()
+
+    def addCelebrities(self, names, salaries, masses, popularities, vips, problems_with=None, conflict_pairs=None):
+        # one insert notification for the whole batch
+        if not len(names):
+            return
+        first = len(self.store)
+        self.beginInsertRows(QModelIndex(), first, first + len(names) - 1)
+        self.store.extend(names, salaries, masses, popularities, vips, problems_with, conflict_pairs)
+        self.endInsertRows()
+
+
+class CelebrityNameModel(QAbstractListModel):
+    # read-only list over the names of a CelebrityStore, for the "Problems with" picker; like the table,
+    # a name is read only when the view paints its row
+    def __init__(self, names, parent=None):
+        super().__init__(parent)
+        self.names = names
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return self.names[index.row()]
+
+
 class CelebrityWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.initUI()
-        self.problem_relationships = {}  # Dictionary to store problem relationships
 
     def initUI(self):
         self.setWindowTitle('Who will be your celebrity guests?')
@@ -86,21 +153,98 @@ class CelebrityWidget(QWidget):
         self.add_celebrity_button = QPushButton('Add Celebrity')
         self.add_celebrity_button.clicked.connect(self.addCelebrity)
 
+        # bulk import and export, as CSV or columnar binary files
+        self.import_button = QPushButton('Import celebrities')
+        self.import_button.clicked.connect(self.importCelebrities)
+        self.export_button = QPushButton('Export celebrities')
+        self.export_button.clicked.connect(self.exportCelebrities)
+        self.export_guests_button = QPushButton('Export guest list')
+        self.export_guests_button.clicked.connect(self.exportGuestList)
+        self.export_guests_button.setEnabled(False)
+        self.last_solution = None
+
         self.find_celebrity_list_button = QPushButton(
             'Find the optimal guest list')
         self.find_celebrity_list_button.clicked.connect(self.findCelebrityList)
 
+        # branch and bound on the conflict bitsets instead of the MIP solver, for lists short enough
+        # that it is the faster of the two
+        self.knapsack_engine_checkbox = QCheckBox('Use the combinatorial engine')
+        self.knapsack_engine_checkbox.setToolTip(
+            f"Used for up to {knapsack_settings()['max_people']} celebrities, longer lists are solved as a MIP")
+
+        # button to stop a running solve
+        self.cancel_solve_button = QPushButton('Cancel')
+        self.cancel_solve_button.setEnabled(False)
+
+        # solves run on a background thread so the window stays responsive
+        self.solve_runner = SolveRunner(self)
+        self.solve_runner.finished.connect(self.onSolveFinished)
+        self.solve_runner.failed.connect(self.onSolveFailed)
+        self.solve_runner.cancelled.connect(self.onSolveCancelled)
+        # queued / started events of solves submitted to the solve service
+        self.solve_status_label = QLabel()
+        self.solve_status_label.setVisible(False)
+        self.solve_runner.progress.connect(self.showSolveStatus)
+        self.solve_runner.running_changed.connect(lambda running: running or self.showSolveStatus(''))
+        self.cancel_solve_button.clicked.connect(self.solve_runner.cancel)
+
+        # salary against popularity (or head count) frontier, streamed into the chart point by point;
+        # clicking a point shows its guest list
+        self.pareto_button = QPushButton('Explore salary trade-offs')
+        self.pareto_button.clicked.connect(self.exploreFrontier)
+        self.pareto_measure_input = QComboBox()
+        for measure in MEASURES:
+            self.pareto_measure_input.addItem(MEASURE_LABELS[measure], measure)
+        self.pareto_steps_input = QSpinBox()
+        self.pareto_steps_input.setRange(2, 200)
+        self.pareto_steps_input.setValue(20)
+        self.pareto_steps_input.setPrefix('Points: ')
+        self.pareto_chart = ParetoChart()
+        self.pareto_chart.setVisible(False)
+        self.pareto_chart.pointClicked.connect(self.showFrontierPoint)
+        self.pareto_runner = SolveRunner(self)
+        self.pareto_runner.progress.connect(self.pareto_chart.add_point)
+        self.pareto_runner.failed.connect(self.onSolveFailed)
+        self.pareto_runner.running_changed.connect(self.updateCancelButton)
+        self.solve_runner.running_changed.connect(self.updateCancelButton)
+        self.cancel_solve_button.clicked.connect(self.pareto_runner.cancel)
+
+        # the K best lists from the solver's solution pool, listed as the search finds them
+        self.alternatives_button = QPushButton('Find alternative lists')
+        self.alternatives_button.clicked.connect(self.findAlternativeLists)
+        self.alternatives_count_input = QSpinBox()
+        self.alternatives_count_input.setRange(1, 100)
+        self.alternatives_count_input.setValue(ALTERNATIVES)
+        self.alternatives_count_input.setPrefix('Lists: ')
+        self.alternatives_list = QListWidget()
+        self.alternatives_list.setVisible(False)
+        self.alternatives_list.currentRowChanged.connect(self.showAlternative)
+        self.alternatives = []
+        self.alternatives_runner = SolveRunner(self)
+        self.alternatives_runner.progress.connect(self.addAlternative)
+        self.alternatives_runner.finished.connect(self.onAlternativesFinished)
+        self.alternatives_runner.failed.connect(self.onSolveFailed)
+        self.alternatives_runner.running_changed.connect(self.updateCancelButton)
+        self.cancel_solve_button.clicked.connect(self.alternatives_runner.cancel)
+
         # Summary label widgets
         self.summary_label = QLabel('Optimal guest list and statistics:')
         self.summary_text = QListWidget()
         self.summary_label.setVisible(False)
         self.summary_text.setVisible(False)
 
-        # Celebrity list widget
+        # Celebrity table, backed by the columnar store
         self.celebrity_list_label = QLabel('List of all celebrities')
-        self.celebrity_list = QListWidget()
-        self.celebrity_list.setSelectionMode(
-            QListWidget.MultiSelection)  # Enable multiple selection
+        self.celebrity_store = CelebrityStore()
+        self.celebrity_model = CelebrityTableModel(self.celebrity_store, self)
+        self.celebrity_table = QTableView()
+        self.celebrity_table.setModel(self.celebrity_model)
+        self.celebrity_table.setSelectionMode(QTableView.MultiSelection)  # Enable multiple selection
+        self.celebrity_table.setSelectionBehavior(QTableView.SelectRows)
+        # fixed row heights, so the view never measures rows it doesn't show
+        self.celebrity_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.celebrity_table.horizontalHeader().setStretchLastSection(True)
 
         # Layout for ship weight input
         input_layout = QHBoxLayout()
@@ -115,6 +259,22 @@ class CelebrityWidget(QWidget):
         button_layout = QHBoxLayout()
         button_layout.addWidget(self.add_celebrity_button)
         button_layout.addWidget(self.find_celebrity_list_button)
+        button_layout.addWidget(self.cancel_solve_button)
+        button_layout.addWidget(self.knapsack_engine_checkbox)
+
+        # Layout for the salary trade-off explorer
+        pareto_layout = QHBoxLayout()
+        pareto_layout.addWidget(self.pareto_button)
+        pareto_layout.addWidget(self.pareto_measure_input)
+        pareto_layout.addWidget(self.pareto_steps_input)
+        pareto_layout.addWidget(self.alternatives_button)
+        pareto_layout.addWidget(self.alternatives_count_input)
+
+        # Layout for importing and exporting
+        file_layout = QHBoxLayout()
+        file_layout.addWidget(self.import_button)
+        file_layout.addWidget(self.export_button)
+        file_layout.addWidget(self.export_guests_button)
 
         # Main layout
         main_layout = QVBoxLayout()
@@ -122,18 +282,21 @@ class CelebrityWidget(QWidget):
         main_layout.addLayout(input_layout)
         main_layout.addLayout(vip_layout) 
         main_layout.addLayout(button_layout)
+        main_layout.addWidget(self.solve_status_label)
+        main_layout.addLayout(pareto_layout)
+        main_layout.addLayout(file_layout)
+        main_layout.addWidget(self.pareto_chart)
+        main_layout.addWidget(self.alternatives_list)
         main_layout.addWidget(self.summary_label)
         main_layout.addWidget(self.summary_text)
         main_layout.addWidget(self.celebrity_list_label)
-        main_layout.addWidget(self.celebrity_list)
+        main_layout.addWidget(self.celebrity_table)
 
         self.setLayout(main_layout)
 
     def addCelebrity(self):
         celebrity_dialog = CelebrityDialog(self)
-        existing_celebrities = [self.celebrity_list.item(i).text().split(
-            ' - ')[0] for i in range(self.celebrity_list.count())]
-        celebrity_dialog.updateProblemsWithList(existing_celebrities)
+        celebrity_dialog.updateProblemsWithList(self.celebrity_store.names)
 
         if celebrity_dialog.exec_() == QDialog.Accepted:
             name = celebrity_dialog.name_edit.text()
@@ -141,43 +304,63 @@ class CelebrityWidget(QWidget):
             mass = float(celebrity_dialog.mass_edit.text())
             popularity = float(celebrity_dialog.value_added_edit.text())
             is_vip = celebrity_dialog.vip_checkbox.isChecked()
-            problems_with_items = celebrity_dialog.problems_with_list.selectedItems()
-            problems_with = [
-                item.text() for item in problems_with_items] if problems_with_items else None
+            problems_with = celebrity_dialog.selectedProblems() or None
             self.addCelebrityToList(
                 name, salary, mass, popularity, is_vip, problems_with)
 
     def addCelebrityToList(self, name, salary, mass, popularity, is_vip, problems_with):
-        item_text = f'{name} - Salary: {salary} - Mass: {mass} - Popularity Index: {popularity} - VIP: {is_vip}'
-        if problems_with:
-            problems_with_str = ' - Problems with: ' + ', '.join(problems_with)
-            item_text += problems_with_str
-            # Update problem relationships dictionary
-            self.problem_relationships[name] = problems_with
-        item = QListWidgetItem(item_text)
-        item.setData(1000, (name, salary, mass,
-                     popularity, is_vip, problems_with))
-        self.celebrity_list.addItem(item)
+        # the store also updates the conflict graph, the new celebrity takes the next row
+        self.celebrity_model.addCelebrity(name, salary, mass, popularity, is_vip, problems_with)
 
-    def findCelebrityList(self):
-        total_celebrities = self.celebrity_list.count()
+    def importCelebrities(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Import celebrities', '', FILE_FILTER)
+        if not path:
+            return
+        try:
+            columns = read_celebrities(path)
+            self.celebrity_model.addCelebrities(columns.names, columns.salaries, columns.masses, columns.popularities,
+                                                columns.vips, columns.problems_with, columns.conflict_pairs)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, 'Import failed', str(error))
+
+    def exportCelebrities(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export celebrities', '', FILE_FILTER)
+        if not path:
+            return
+        try:
+            write_celebrities(path, self.celebrity_store)
+        except OSError as error:
+            QMessageBox.warning(self, 'Export failed', str(error))
+
+    def exportGuestList(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export guest list', '', FILE_FILTER)
+        if not path:
+            return
+        try:
+            write_guest_list(path, self.celebrity_store.names, self.last_solution)
+        except OSError as error:
+            QMessageBox.warning(self, 'Export failed', str(error))
+
+    def readInputs(self):
+        # (ship weight, budget, minimum VIP count) from the input fields, or None after a warning
+        total_celebrities = len(self.celebrity_store)
         
         if total_celebrities == 0:
             QMessageBox.warning(self, 'Warning', 'Please add at least one celebrity.')
-            return
+            return None
         
         # Validate ship weight
         ship_weight_text = self.weight_edit.text()
         if not ship_weight_text or not ship_weight_text.replace('.', '', 1).isdigit() or float(ship_weight_text) <= 0:
             QMessageBox.warning(self, 'Invalid Value', 'Ship weight must be a positive value.')
-            return
+            return None
         ship_weight = float(ship_weight_text)
         
         # Validate budget
         budget_text = self.budget_edit.text()
         if not budget_text or not budget_text.replace('.', '', 1).isdigit() or float(budget_text) <= 0:
             QMessageBox.warning(self, 'Invalid Value', 'Maximum budget must be a positive value.')
-            return
+            return None
         budget = float(budget_text)
         
         # Retrieve minimum number of VIP celebrities from the input field
@@ -185,152 +368,218 @@ class CelebrityWidget(QWidget):
             min_vip_count = int(self.min_vip_edit.text())
             if min_vip_count < 0:
                 QMessageBox.warning(self, 'Invalid Value', 'Minimum VIP count must be a non-negative integer.')
-                return
+                return None
         except ValueError:
             QMessageBox.warning(self, 'Invalid Value', 'Please enter a valid integer for minimum VIP count.')
+            return None
+        return ship_weight, budget, min_vip_count
+
+    def findCelebrityList(self):
+        inputs = self.readInputs()
+        if inputs is None:
             return
-        
-        # Build Gurobi model
-        builder = GurobiSolverBuilder()
-        solver_builder = builder.add_variables(total_celebrities, names=[f'x_{i}' for i in range(total_celebrities)], vtypes=[GRB.BINARY]*total_celebrities)
-        
-        constraints_LHS = []
-        constraints_RHS = [ship_weight, budget, -1]
-        popularities = []
-        negative_salaries = []
-        exists_in_boat = []
-        
-        for i in range(total_celebrities):
-            item_text = self.celebrity_list.item(i).text()
-            salary = float(item_text.split(' - ')[1].split(': ')[1])
-            mass = float(item_text.split(' - ')[2].split(': ')[1])
-            popularity = float(item_text.split(' - ')[3].split(': ')[1])
-            vip_status = item_text.split(' - ')[4].split(': ')[1] == 'True'
-            
-            constraints_LHS.append([mass, salary, -int(vip_status)])
-            negative_salaries.append(-salary)
-            popularities.append(popularity)
-            exists_in_boat.append(1)
-        
-        objectives = [
-            (popularities, GRB.MAXIMIZE),
-            (negative_salaries, GRB.MAXIMIZE),
-            (exists_in_boat, GRB.MAXIMIZE)
-        ]
-        
-        # Build the solver instance
-        solver = solver_builder.set_objectives(objectives).set_constraints_LHS(constraints_LHS).set_constraints_RHS(constraints_RHS).build()
-        
-        # Add constraint to ensure at least min_vip_count VIP celebrities are selected
-        vip_indices = [i for i in range(total_celebrities) if self.celebrity_list.item(i).text().endswith('VIP: True')]
-        if solver:
-            vip_count_expr = gp.quicksum(solver.decision_variables[idx] for idx in vip_indices)
-            solver.add_constraint(vip_count_expr, GRB.GREATER_EQUAL, min_vip_count)
-            
-            # Mutual exclusion constraint based on problem relationships
-            for celeb, problems in self.problem_relationships.items():
-                celeb_index = next((i for i in range(total_celebrities) if self.celebrity_list.item(i).text().startswith(celeb)), None)
-                if celeb_index is not None:
-                    related_indices = [i for i in range(total_celebrities) if any(self.celebrity_list.item(i).text().startswith(p) for p in problems)]
-                    if related_indices:
-                        # If celeb is selected, none of the related_indices should be selected
-                        expr = gp.LinExpr()
-                        
-                        # Add the celebrity variable (xi) with its coefficient as the number of related problems
-                        expr.add(solver.decision_variables[celeb_index], len(related_indices))  
-                        
-                        # Add related variables (xj) with a coefficient of 1 each
-                        for idx in related_indices:
-                            expr.add(solver.decision_variables[idx], 1)
-                        
-                        # Add the constraint that ensures the total count is less than or equal to the number of related problems
-                        solver.add_constraint(expr, GRB.LESS_EQUAL, len(related_indices))
-            
-            # Solve the optimization problem
-            solver.solve()
-            solution_status = solver.get_solution_status()
-        
-            # Process the solution if optimal
-            if solution_status == GRB.OPTIMAL:
-                solution_values = solver.get_variables()
-                self.displayOptimalGuestList(solution_values)
+        ship_weight, budget, min_vip_count = inputs
+
+        # copies, the store keeps growing on the GUI thread while the solver thread reads these
+        salaries = self.celebrity_store.salary_column().copy()
+        masses = self.celebrity_store.mass_column().copy()
+        popularities = self.celebrity_store.popularity_column().copy()
+        vips = self.celebrity_store.vip_column().copy()
+
+        # Mutual exclusions as cliques of the conflict graph, covering every conflicting pair (kept by the
+        # store until celebrities are added, so repeated solves don't recompute them)
+        cliques = self.celebrity_store.clique_cover()
+        use_knapsack_engine = (self.knapsack_engine_checkbox.isChecked()
+                               and len(self.celebrity_store) <= knapsack_settings()['max_people'])
+        # opt-in recording of every solved model (SOLVER_CORPUS), replayed by replay_corpus.py; the
+        # combinatorial engine builds no model and is not recorded
+        corpus = None if use_knapsack_engine else corpus_from_environment()
+        # with SOLVER_SERVICE set, the shared solve service solves the model instead of this process
+        address = None if use_knapsack_engine else service_address()
+        snapshot = None
+        if corpus is not None:
+            snapshot = CelebrityColumns(list(self.celebrity_store.names), salaries, masses, popularities, vips,
+                                        conflict_pairs=self.celebrity_store.conflicts.pairs())
+
+        def solve_job(cancel_event, report):
+            result = solve_instance(cancel_event, report)
+            if corpus is not None:
+                corpus.record_selection(snapshot, ship_weight, budget, min_vip_count, result)
+            return result
+
+        def solve_instance(cancel_event, report):
+            # runs on the solver thread: build the model (or fetch the answer if this exact instance
+            # was solved before), solve it and extract the solution
+            if address is not None:
+                problem = selection_problem(salaries, masses, popularities, vips, ship_weight, budget, min_vip_count,
+                                            cliques)
+                return solve_on_service(problem, cancel_event, lambda event: report(describe_event(event)),
+                                        address=address)
+            if use_knapsack_engine:
+                solver = ConflictKnapsackSolver(salaries, masses, popularities, vips, ship_weight, budget,
+                                                min_vip_count, cliques)
             else:
-                QMessageBox.warning(self, 'Warning', 'No optimal solution found.')
+                solver = build_selection_solver(salaries, masses, popularities, vips, ship_weight, budget,
+                                                min_vip_count, cliques, cache=solution_cache)
+            if not solver:
+                raise RuntimeError('Failed to build the solver instance.')
+            # Solve the optimization problem; the model is freed once its result is read
+            with solver:
+                solver.solve(cancel_event)
+                return solver.get_result()
+
+        # a click while a solve is running replaces that solve
+        self.solve_runner.start(solve_job, stream=True)
+
+    def exploreFrontier(self):
+        inputs = self.readInputs()
+        if inputs is None:
+            return
+        ship_weight, budget, min_vip_count = inputs
+        # copied columns, like a single solve
+        instance = SelectionInstance(self.celebrity_store.salary_column().copy(),
+                                     self.celebrity_store.mass_column().copy(),
+                                     self.celebrity_store.popularity_column().copy(),
+                                     self.celebrity_store.vip_column().copy(), ship_weight, min_vip_count,
+                                     self.celebrity_store.clique_cover())
+        measure = self.pareto_measure_input.currentData()
+        steps = self.pareto_steps_input.value()
+
+        def frontier_job(cancel_event, report):
+            return pareto_frontier(instance, budget, measure, steps, cancel_event=cancel_event, report=report)
+
+        self.pareto_chart.clear(measure)
+        self.pareto_chart.setVisible(True)
+        self.pareto_runner.start(frontier_job, stream=True)
+
+    def showFrontierPoint(self, index):
+        point = self.pareto_chart.points[index]
+        self.displayOptimalGuestList(point.solution(len(self.celebrity_store)))
+        self.summary_text.insertItem(0, f"Frontier point: best list within a salary budget of ${point.epsilon:,.2f}")
+
+    def findAlternativeLists(self):
+        inputs = self.readInputs()
+        if inputs is None:
+            return
+        ship_weight, budget, min_vip_count = inputs
+        salaries = self.celebrity_store.salary_column().copy()
+        masses = self.celebrity_store.mass_column().copy()
+        popularities = self.celebrity_store.popularity_column().copy()
+        vips = self.celebrity_store.vip_column().copy()
+        cliques = self.celebrity_store.clique_cover()
+        count = self.alternatives_count_input.value()
+
+        def alternatives_job(cancel_event, report):
+            return alternative_lists(salaries, masses, popularities, vips, ship_weight, budget, min_vip_count, cliques,
+                                     count, ALTERNATIVES_GAP, cancel_event=cancel_event, report=report)
+
+        self.alternatives = []
+        self.alternatives_list.clear()
+        self.alternatives_list.setVisible(True)
+        self.alternatives_runner.start(alternatives_job, stream=True)
+
+    def addAlternative(self, solution):
+        # lists found so far, best first; gaps are relative to the best one found so far
+        self.alternatives.append(solution)
+        self.alternatives.sort(key=lambda alternative: -alternative.objective_value)
+        del self.alternatives[self.alternatives_count_input.value():]
+        best = self.alternatives[0].objective_value
+        for alternative in self.alternatives:
+            alternative.gap = relative_gap(alternative.objective_value, best)
+        self.showAlternatives(searching=True)
+
+    def onAlternativesFinished(self, answer):
+        result, pool = answer
+        if result.status != OPTIMAL:
+            self.alternatives_list.clear()
+            QMessageBox.warning(self, 'Warning', 'No optimal solution found.')
+            return
+        self.alternatives = pool
+        self.showAlternatives(searching=False)
+
+    def showAlternatives(self, searching):
+        self.alternatives_list.blockSignals(True)
+        self.alternatives_list.clear()
+        for rank, alternative in enumerate(self.alternatives, 1):
+            summary = self.celebrity_store.summary(np.flatnonzero(np.asarray(alternative.values) > 0.5))
+            gap = '' if alternative.gap is None else f", {alternative.gap:.1%} above the cheapest"
+            found = ' (found so far)' if searching else ''
+            self.alternatives_list.addItem(f"#{rank}{found}: {summary['people']} people, "
+                                           f"salary ${summary['salary']:,.2f}, "
+                                           f"average popularity {summary['average_popularity']:.1f}%{gap}")
+        self.alternatives_list.blockSignals(False)
+
+    def showAlternative(self, row):
+        if 0 <= row < len(self.alternatives):
+            self.displayOptimalGuestList(self.alternatives[row].values)
+            self.summary_text.insertItem(0, f"Alternative list #{row + 1}")
+
+    def updateCancelButton(self):
+        self.cancel_solve_button.setEnabled(self.solve_runner.is_running() or self.pareto_runner.is_running()
+                                            or self.alternatives_runner.is_running())
+
+    def showSolveStatus(self, text):
+        self.solve_status_label.setText(text)
+        self.solve_status_label.setVisible(bool(text))
+
+    def onSolveFinished(self, result):
+        with phase("display", page="selection", celebrities=len(self.celebrity_store)):
+            self.showSolveResult(result)
+
+    def showSolveResult(self, result):
+        # Process the solution if optimal
+        if result.status == OPTIMAL:
+            self.displayOptimalGuestList(result.values)
+        elif result.status == LIMIT_REACHED and result.has_solution():
+            # stopped by a node or time limit: show the best list found and how far from optimal it may be
+            self.displayOptimalGuestList(result.values)
+            if result.mip_gap is not None:
+                self.summary_text.insertItem(0, f"Best list found before the search limit (gap: {result.mip_gap:.1%})")
         else:
-            QMessageBox.warning(self, 'Error', 'Failed to build Gurobi solver instance.')
+            QMessageBox.warning(self, 'Warning', 'No optimal solution found.')
+
+    def onSolveFailed(self, message):
+        QMessageBox.warning(self, 'Error', message)
+
+    def onSolveCancelled(self):
+        QMessageBox.information(self, 'Cancelled', 'The solve was cancelled.')
+
+    def closeEvent(self, event):
+        self.solve_runner.wait()
+        self.pareto_runner.wait()
+        self.alternatives_runner.wait()
+        super().closeEvent(event)
 
     def displayOptimalGuestList(self, solution_values):
+        self.last_solution = np.asarray(solution_values)
+        self.export_guests_button.setEnabled(True)
         self.summary_text.clear()
         self.summary_label.setVisible(True)
         self.summary_text.setVisible(True)
 
-        selected_celebrities = []
-        total_people = 0
-        total_popularity = 0.0
-        total_mass = 0.0
-        total_salary = 0.0
-        vip_celebrities = []
-        non_vip_celebrities = []
-
-        # Iterate over the decision variables and gather statistics for selected celebrities
-        for i in range(self.celebrity_list.count()):
-            item = self.celebrity_list.item(i)
-            if not item:
-                continue
-            
-            celebrity_name = item.text().split(' - ')[0]
-            if f'x_{i}' in solution_values and solution_values[f'x_{i}'] > 0.5:
-                selected_celebrities.append(celebrity_name)
-
-                # Retrieve celebrity attributes
-                salary_str = item.text().split(' - ')[1].split(': ')[1]
-                mass_str = item.text().split(' - ')[2].split(': ')[1]
-                popularity_str = item.text().split(' - ')[3].split(': ')[1]
-                vip_status = item.text().split(' - ')[4].split(': ')[1]
-
-                try:
-                    salary_value = float(salary_str)
-                    mass_value = float(mass_str)
-                    popularity_value = float(popularity_str)
-                    is_vip = vip_status == 'True'
-
-                    # Calculate totals
-                    total_people += 1
-                    total_salary += salary_value
-                    total_mass += mass_value
-                    total_popularity += popularity_value
-
-                    # Categorize celebrities
-                    if is_vip:
-                        vip_celebrities.append(celebrity_name)
-                    else:
-                        non_vip_celebrities.append(celebrity_name)
-
-                except ValueError as e:
-                    print(f"Error processing celebrity item: {item.text()}. Error: {e}")
-
-        if selected_celebrities:
+        # statistics of the selected celebrities, read straight from the store columns
+        summary = self.celebrity_store.summary(np.flatnonzero(np.asarray(solution_values) > 0.5))
+
+        if summary['names']:
             # Display total statistics based on selected celebrities
-            self.summary_text.addItem(f"Total Number of People: {total_people}")
-            self.summary_text.addItem(f"Average Popularity Index: {total_popularity / total_people if total_people > 0 else 0.0}%")
-            self.summary_text.addItem(f"Total Mass: {total_mass} Kg")
-            self.summary_text.addItem(f"Total Salary: ${total_salary}")
+            self.summary_text.addItem(f"Total Number of People: {summary['people']}")
+            self.summary_text.addItem(f"Average Popularity Index: {summary['average_popularity']}%")
+            self.summary_text.addItem(f"Total Mass: {summary['mass']} Kg")
+            self.summary_text.addItem(f"Total Salary: ${summary['salary']}")
             self.summary_text.addItem(f"-------------------------------------------------------------------------------")
-            if vip_celebrities:
+            if summary['vips']:
                 self.summary_text.addItem("VIP Celebrities:")
-                for vip in vip_celebrities:
-                    self.summary_text.addItem(vip)
+                self.summary_text.addItems(summary['vips'])
                 self.summary_text.addItem(f"-------------------------------------------------------------------------------")
-            if non_vip_celebrities:
+            if summary['non_vips']:
                 self.summary_text.addItem("Non-VIP Celebrities:")
-                for non_vip in non_vip_celebrities:
-                    self.summary_text.addItem(non_vip)
+                self.summary_text.addItems(summary['non_vips'])
                 self.summary_text.addItem(f"-------------------------------------------------------------------------------")
             self.summary_text.addItem("Selected Celebrities:")
-            for celebrity in selected_celebrities:
-                self.summary_text.addItem(celebrity)
+            self.summary_text.addItems(summary['names'])
         else:
             self.summary_text.addItem("No celebrities selected.")
+
     def open_homepage(self):
         # Import inside the function to avoid circular import
         from HomePage import HomePage
@@ -355,9 +604,11 @@ class CelebrityDialog(QDialog):
         self.value_added_edit = QLineEdit()
         self.vip_checkbox = QCheckBox('VIP')
         self.problems_with_label = QLabel('Problems with:')
-        self.problems_with_list = QListWidget()
+        self.problems_with_list = QListView()
         self.problems_with_list.setSelectionMode(
-            QListWidget.MultiSelection)  # Enable multiple selection
+            QAbstractItemView.MultiSelection)  # Enable multiple selection
+        # every row is one line of text, so the view never measures the names it doesn't show
+        self.problems_with_list.setUniformItemSizes(True)
 
         layout.addWidget(QLabel('Celebrity Name:'))
         layout.addWidget(self.name_edit)
@@ -381,8 +632,15 @@ class CelebrityDialog(QDialog):
         self.setLayout(layout)
 
     def updateProblemsWithList(self, existing_celebrities):
-        self.problems_with_list.clear()
-        self.problems_with_list.addItems(existing_celebrities)
+        # the view reads the names in place, opening the dialog copies none of them
+        self.problems_with_list.setModel(CelebrityNameModel(existing_celebrities, self))
+
+    def selectedProblems(self):
+        model = self.problems_with_list.model()
+        if model is None:
+            return []
+        rows = sorted(index.row() for index in self.problems_with_list.selectionModel().selectedRows())
+        return [model.names[row] for row in rows]
 
     def accept(self):
         if self.name_edit.text() == '':
@@ -1,8 +1,20 @@
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QLineEdit, QVBoxLayout, QHBoxLayout, QGridLayout, QMessageBox
-from gurobipy import GRB
-from GurobiSolver import GurobiSolverBuilder
-from PyQt5.QtWidgets import QPlainTextEdit, QSizePolicy
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QRegExp
+from PyQt5.QtGui import QRegExpValidator
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QLineEdit, QVBoxLayout, QHBoxLayout, QMessageBox
+from InstanceIO import FILE_FILTER, read_production, write_production, write_production_solution
+from ProblemCorpus import corpus_from_environment
+from ProductionProblem import build_production_solver
+from ProductionSweep import SWEEP_PARAMETERS, SWEEP_METHODS, point_inputs, sweep_production, sweep_values, what_if
+from SolveClient import describe_event, service_address, solve_on_service
+from SolveService import production_problem
+from SolverBackend import DEFAULT_BACKEND
+from SolveWorker import SolveRunner
+from SolutionCache import solution_cache
+from Telemetry import emit, phase
+from PyQt5.QtWidgets import QSizePolicy, QTableView, QHeaderView, QStyledItemDelegate, QSpinBox, QFileDialog, \
+    QComboBox
 
 # GUI styles
 style_sheet = """
@@ -31,6 +43,271 @@ class DeleteButton(QPushButton):
     def __init__(self, title, parent=None):
         super().__init__(title, parent)
 
+# item table columns, in the order of ProductionProblem's item rows
+ITEM_COLUMNS = ['Hours of manual work', 'Hours of machine work',
+                'Matière Première', 'Selling price', 'Maximum sold']
+
+
+def parse_number(text):
+    # a non-negative decimal number, as accepted everywhere on the page; None if invalid
+    text = text.strip()
+    if text == '' or not text.replace('.', '', 1).isdigit():
+        return None
+    return float(text)
+
+
+class ItemTableModel(QAbstractTableModel):
+    # production items as one (items x 5) float array. A cell is parsed once, when it is edited, and
+    # the number is kept; empty or invalid cells are NaN and keep their text for display.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values = np.full((0, len(ITEM_COLUMNS)), np.nan)
+        # text of invalid cells, by (item id, column)
+        self.invalid_texts = {}
+        # stable id per item row, so the live model can tell edited, added and removed items apart
+        self.item_ids = []
+        self.next_item_id = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.values)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(ITEM_COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.EditRole) or not index.isValid():
+            return None
+        value = self.values[index.row(), index.column()]
+        if np.isnan(value):
+            return self.invalid_texts.get((self.item_ids[index.row()], index.column()), '')
+        return f'{value:g}'
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return ITEM_COLUMNS[section]
+        return str(section + 1)
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        key = (self.item_ids[index.row()], index.column())
+        number = parse_number(str(value))
+        if number is None:
+            self.invalid_texts[key] = str(value)
+            number = np.nan
+        else:
+            self.invalid_texts.pop(key, None)
+        self.values[index.row(), index.column()] = number
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def add_items(self, values=None, count=1):
+        # append items, empty unless an (N, 5) array of values is given
+        values = np.full((count, len(ITEM_COLUMNS)), np.nan) if values is None else np.asarray(values, dtype=float)
+        if not len(values):
+            return
+        first = len(self.values)
+        self.beginInsertRows(QModelIndex(), first, first + len(values) - 1)
+        self.values = np.vstack([self.values, values.reshape(-1, len(ITEM_COLUMNS))])
+        self.item_ids.extend(range(self.next_item_id, self.next_item_id + len(values)))
+        self.next_item_id += len(values)
+        self.endInsertRows()
+
+    def remove_items(self, rows):
+        for row in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self.values = np.delete(self.values, row, axis=0)
+            item_id = self.item_ids.pop(row)
+            for column in range(len(ITEM_COLUMNS)):
+                self.invalid_texts.pop((item_id, column), None)
+            self.endRemoveRows()
+
+    def first_invalid(self):
+        # (row, column) of the first empty or invalid cell, None when every cell holds a number
+        invalid = np.argwhere(np.isnan(self.values))
+        return tuple(invalid[0]) if len(invalid) else None
+
+    def items(self):
+        return self.values.copy()
+
+
+class NumberDelegate(QStyledItemDelegate):
+    # cell editor that only accepts non-negative decimal numbers
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setValidator(QRegExpValidator(QRegExp(r'\d*\.?\d*'), editor))
+        editor.setPlaceholderText(ITEM_COLUMNS[index.column()])
+        return editor
+
+
+# solution table columns; the last three are only shown when the solve gave a sensitivity report
+SOLUTION_COLUMNS = ['Item', 'Quantity', 'Reduced cost', 'Profit valid from', 'Profit valid to']
+
+
+class SolutionTableModel(QAbstractTableModel):
+    # read-only view of a solution: the top_k items in the current sort order (largest quantity first)
+    def __init__(self, top_k=100, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.values = np.zeros(0)
+        self.sensitivity = None
+        self.top_k = top_k
+        self.sort_column = 1
+        self.sort_order = Qt.DescendingOrder
+        self.rows = np.zeros(0, dtype=int)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return 2 if self.sensitivity is None else len(SOLUTION_COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        return self.names[row] if index.column() == 0 else f'{self.column_values(index.column())[row]:g}'
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return SOLUTION_COLUMNS[section]
+        return str(section + 1)
+
+    def column_values(self, column):
+        if column == 1:
+            return self.values
+        return [self.sensitivity.rc, self.sensitivity.obj_low, self.sensitivity.obj_up][column - 2]
+
+    def set_solution(self, names, values, sensitivity=None):
+        self.beginResetModel()
+        self.names = list(names)
+        self.values = np.asarray(values, dtype=float)
+        self.sensitivity = sensitivity
+        if sensitivity is None and self.sort_column > 1:
+            self.sort_column = 1
+        self.rows = self.sorted_rows()
+        self.endResetModel()
+
+    def set_top_k(self, top_k):
+        self.beginResetModel()
+        self.top_k = top_k
+        self.rows = self.sorted_rows()
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.beginResetModel()
+        self.sort_column, self.sort_order = column, order
+        self.rows = self.sorted_rows()
+        self.endResetModel()
+
+    def sorted_rows(self):
+        # items sort by position, quantities by value; only the first top_k rows are shown
+        keys = np.arange(len(self.values)) if self.sort_column == 0 else self.column_values(self.sort_column)
+        rows = np.argsort(keys, kind='stable')
+        if self.sort_order == Qt.DescendingOrder:
+            rows = rows[::-1]
+        return rows[:self.top_k]
+
+
+# sweep parameters as shown on the page, in the order of ProductionSweep.SWEEP_PARAMETERS
+SWEEP_LABELS = ['Salary of one worker per hour', 'Cost of one unit of raw materials',
+                'Hours of manual work per day', 'Hours of machine work per day', 'Raw materials per day']
+
+
+class SweepTableModel(QAbstractTableModel):
+    # one row per sweep point: the parameter value, the profit, the status and the plan of every item
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.result = None
+
+    def set_result(self, result):
+        self.beginResetModel()
+        self.result = result
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.result is None else len(self.result.values)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.result is None else 3 + len(self.result.names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if column == 0:
+            return f'{self.result.values[row]:g}'
+        if column == 2:
+            return self.result.statuses[row]
+        value = self.result.objective_values[row] if column == 1 else self.result.plans[row, column - 3]
+        return '' if np.isnan(value) else f'{value:g}'
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Vertical:
+            return str(section + 1)
+        if section < 3:
+            return [SWEEP_LABELS[SWEEP_PARAMETERS.index(self.result.parameter)], 'Profit', 'Status'][section]
+        return self.result.names[section - 3]
+
+
+# resources as shown on the page, in the order of ProductionProblem.RESOURCE_NAMES
+RESOURCE_LABELS = SWEEP_LABELS[2:]
+RESOURCE_COLUMNS = ['Resource', 'Capacity', 'Used', 'Shadow price', 'Valid from', 'Valid to']
+
+
+class ResourceTableModel(QAbstractTableModel):
+    # one row per resource of the last LP solve: its use, shadow price and the capacity range where
+    # that price holds
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sensitivity = None
+
+    def set_sensitivity(self, sensitivity):
+        self.beginResetModel()
+        self.sensitivity = sensitivity
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() or self.sensitivity is None else len(self.sensitivity.b)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(RESOURCE_COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if column == 0:
+            return RESOURCE_LABELS[row] if row < len(RESOURCE_LABELS) else self.sensitivity.row_names[row]
+        sensitivity = self.sensitivity
+        value = [sensitivity.b, sensitivity.b - sensitivity.slack, sensitivity.pi,
+                 sensitivity.rhs_low, sensitivity.rhs_up][column - 1][row]
+        return '' if np.isnan(value) else f'{value:g}'
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        return RESOURCE_COLUMNS[section] if orientation == Qt.Horizontal else str(section + 1)
+
+
+# what-if inputs, one per page field; workers and hours per worker both move the manual hours capacity
+WHAT_IF_PARAMETERS = ["workers", "hours_per_worker", "machine_hours", "raw_materials", "salary", "raw_material_cost"]
+WHAT_IF_LABELS = ['Number of workers available per day', 'Maximum hours of work (per worker) per day',
+                  'Hours of machine work per day', 'Raw materials per day', 'Salary of one worker per hour',
+                  'Cost of one unit of raw materials']
+
+
 # GUI definition
 class ToyFactoryGUI(QWidget):
     def __init__(self):
@@ -84,65 +361,213 @@ class ToyFactoryGUI(QWidget):
         self.layout.addWidget(self.wood_price_label)
         self.layout.addWidget(self.wood_price_input)
 
-        # button to add toy
+        # buttons to add and remove items
         self.add_toy_btn = QPushButton('Add item')
         self.add_toy_btn.clicked.connect(self.add_toy)
-        self.layout.addWidget(self.add_toy_btn)
+        self.remove_toy_btn = DeleteButton('Remove selected items')
+        self.remove_toy_btn.clicked.connect(self.remove_selected_toys)
+        toy_buttons_layout = QHBoxLayout()
+        toy_buttons_layout.addWidget(self.add_toy_btn)
+        toy_buttons_layout.addWidget(self.remove_toy_btn)
+        self.layout.addLayout(toy_buttons_layout)
+
+        # bulk import and export, as CSV or columnar binary files
+        self.import_btn = QPushButton('Import items')
+        self.import_btn.clicked.connect(self.import_toys)
+        self.export_btn = QPushButton('Export items')
+        self.export_btn.clicked.connect(self.export_toys)
+        self.export_solution_btn = QPushButton('Export solution')
+        self.export_solution_btn.clicked.connect(self.export_solution)
+        self.export_solution_btn.setEnabled(False)
+        file_buttons_layout = QHBoxLayout()
+        file_buttons_layout.addWidget(self.import_btn)
+        file_buttons_layout.addWidget(self.export_btn)
+        file_buttons_layout.addWidget(self.export_solution_btn)
+        self.layout.addLayout(file_buttons_layout)
 
-        # create a grid layout for toy inputs
-        self.input_grid_layout = QGridLayout()
-        self.toy_inputs = []
+        # item table, only the visible rows are ever drawn
+        self.item_model = ItemTableModel(self)
+        self.item_table = QTableView()
+        self.item_table.setModel(self.item_model)
+        self.item_table.setItemDelegate(NumberDelegate(self.item_table))
+        self.item_table.setSelectionBehavior(QTableView.SelectRows)
+        self.item_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.item_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.add_toy()
-        self.layout.addLayout(self.input_grid_layout)
+        self.layout.addWidget(self.item_table)
 
         self.solve_btn = SolveButton('Solve')
         self.solve_btn.clicked.connect(self.solve)
         self.layout.addWidget(self.solve_btn)
+
+        # button to stop a running solve
+        self.cancel_btn = DeleteButton('Cancel')
+        self.cancel_btn.setEnabled(False)
+        self.layout.addWidget(self.cancel_btn)
         self.setLayout(self.layout)
 
-        #  display the solution
-        self.solution_display = QPlainTextEdit()
-        self.solution_display.setSizePolicy(
-            QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.solution_display.setReadOnly(True)  # Make the text read-only
+        # solves run on a background thread so the window stays responsive
+        self.solve_runner = SolveRunner(self)
+        self.solve_runner.finished.connect(self.display_solution)
+        self.solve_runner.failed.connect(self.display_solve_error)
+        self.solve_runner.cancelled.connect(self.display_solve_cancelled)
+        # live LP kept between solves, created on the solver thread at the first solve
+        self.production_model = None
+        self.solve_runner.running_changed.connect(self.update_cancel_button)
+        self.cancel_btn.clicked.connect(self.solve_runner.cancel)
+
+        #  display the solution: a status line and the top items of the solution
+        self.solution_display = QLabel()
         self.solution_display.setHidden(True)  # Initially hidden
+        font = self.solution_display.font()
+        font.setPointSize(12)
+        self.solution_display.setFont(font)
         self.layout.addWidget(self.solution_display)
+        # queued / started events of solves submitted to the solve service
+        self.solve_runner.progress.connect(self.solution_display.setText)
+
+        self.solution_model = SolutionTableModel(parent=self)
+        self.top_k_input = QSpinBox()
+        self.top_k_input.setRange(1, 1000000)
+        self.top_k_input.setValue(self.solution_model.top_k)
+        self.top_k_input.valueChanged.connect(self.solution_model.set_top_k)
+        self.top_k_layout = QHBoxLayout()
+        self.top_k_layout.addWidget(QLabel('Items shown'))
+        self.top_k_layout.addWidget(self.top_k_input)
+        self.layout.addLayout(self.top_k_layout)
+
+        self.solution_table = QTableView()
+        self.solution_table.setModel(self.solution_model)
+        self.solution_table.setSortingEnabled(True)
+        self.solution_table.horizontalHeader().setSortIndicator(1, Qt.DescendingOrder)
+        self.solution_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.solution_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.solution_table.setSizePolicy(
+            QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.solution_table.setHidden(True)  # Initially hidden
+        self.layout.addWidget(self.solution_table)
+
+        # shadow price and valid range of every resource, from the sensitivity report of the last solve
+        self.resource_model = ResourceTableModel(self)
+        self.resource_table = QTableView()
+        self.resource_table.setModel(self.resource_model)
+        self.resource_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.resource_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.resource_table.setHidden(True)  # Initially hidden
+        self.layout.addWidget(self.resource_table)
+        # report of the last solve and the inputs it was computed for
+        self.sensitivity = None
+        self.solved_inputs = None
+        self.pending_inputs = None
+
+        # what-if: profit with one input changed, answered from the report while the change stays
+        # in its valid range and re-solved otherwise
+        self.what_if_parameter_input = QComboBox()
+        self.what_if_parameter_input.addItems(WHAT_IF_LABELS)
+        self.what_if_value_input = QLineEdit()
+        self.what_if_value_input.setPlaceholderText('New value')
+        self.what_if_btn = SolveButton('What if')
+        self.what_if_btn.clicked.connect(self.what_if)
+        what_if_layout = QHBoxLayout()
+        what_if_layout.addWidget(QLabel('What if'))
+        what_if_layout.addWidget(self.what_if_parameter_input)
+        what_if_layout.addWidget(self.what_if_value_input)
+        what_if_layout.addWidget(self.what_if_btn)
+        self.layout.addLayout(what_if_layout)
+        self.what_if_display = QLabel()
+        self.what_if_display.setHidden(True)  # Initially hidden
+        self.layout.addWidget(self.what_if_display)
+
+        # re-solves for what-if questions build their own model, leaving the page's live model alone
+        self.what_if_runner = SolveRunner(self)
+        self.what_if_runner.finished.connect(self.display_what_if)
+        # a failed or cancelled re-solve only answers the what-if row, the page's solution stays
+        self.what_if_runner.failed.connect(self.display_what_if_error)
+        self.what_if_runner.cancelled.connect(lambda: self.what_if_display.setText("What-if cancelled"))
+        self.what_if_runner.running_changed.connect(self.update_cancel_button)
+        self.cancel_btn.clicked.connect(self.what_if_runner.cancel)
+
+        # parameter sweep: profit and plan for a range of values of one input
+        self.sweep_parameter_input = QComboBox()
+        self.sweep_parameter_input.addItems(SWEEP_LABELS)
+        self.sweep_from_input = QLineEdit()
+        self.sweep_from_input.setPlaceholderText('From')
+        self.sweep_to_input = QLineEdit()
+        self.sweep_to_input.setPlaceholderText('To')
+        self.sweep_steps_input = QSpinBox()
+        self.sweep_steps_input.setRange(2, 10000)
+        self.sweep_steps_input.setValue(20)
+        # the scenario and sequential methods need Gurobi
+        self.sweep_method_input = QComboBox()
+        self.sweep_method_input.addItems(SWEEP_METHODS if DEFAULT_BACKEND == "gurobi" else ["independent"])
+        self.sweep_btn = SolveButton('Sweep')
+        self.sweep_btn.clicked.connect(self.sweep)
+        sweep_layout = QHBoxLayout()
+        sweep_layout.addWidget(QLabel('Sweep'))
+        sweep_layout.addWidget(self.sweep_parameter_input)
+        sweep_layout.addWidget(self.sweep_from_input)
+        sweep_layout.addWidget(self.sweep_to_input)
+        sweep_layout.addWidget(QLabel('Steps'))
+        sweep_layout.addWidget(self.sweep_steps_input)
+        sweep_layout.addWidget(self.sweep_method_input)
+        sweep_layout.addWidget(self.sweep_btn)
+        self.layout.addLayout(sweep_layout)
+
+        self.sweep_model = SweepTableModel(self)
+        self.sweep_table = QTableView()
+        self.sweep_table.setModel(self.sweep_model)
+        self.sweep_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.sweep_table.setHidden(True)  # Initially hidden
+        self.layout.addWidget(self.sweep_table)
+
+        # sweeps have their own runner, so a sweep and a solve can run side by side
+        self.sweep_runner = SolveRunner(self)
+        self.sweep_runner.finished.connect(self.display_sweep)
+        self.sweep_runner.failed.connect(self.display_solve_error)
+        self.sweep_runner.cancelled.connect(self.display_solve_cancelled)
+        self.sweep_runner.running_changed.connect(self.update_cancel_button)
+        self.cancel_btn.clicked.connect(self.sweep_runner.cancel)
+
+    def update_cancel_button(self):
+        self.cancel_btn.setEnabled(self.solve_runner.is_running() or self.sweep_runner.is_running()
+                                   or self.what_if_runner.is_running())
 
     def add_toy(self):
-        # Create a new tuple for the inputs of the current toy
-        toy_inputs = (QLineEdit(), QLineEdit(),
-                      QLineEdit(), QLineEdit(), QLineEdit())
-        labels = ['Hours of manual work', 'Hours of machine work',
-                  'Matière Première', 'Selling price', 'Maximum sold']
-
-        # Add the QLineEdit objects to the grid layout
-        row = len(self.toy_inputs) + 1  # Add 1 to account for the labels row
-        for col, toy_input in enumerate(toy_inputs):
-            toy_input.setPlaceholderText(labels[col])
-            self.input_grid_layout.addWidget(toy_input, row, col)
-
-        # Add a remove button for each toy except the first
-        if row != 1:
-            remove_btn = DeleteButton('Remove')
-            remove_btn.clicked.connect(lambda: self.remove_toy(row))
-            self.input_grid_layout.addWidget(remove_btn, row, 5)
-            self.toy_inputs.append(toy_inputs)
-        else:
-            self.toy_inputs.append(toy_inputs)
-
-    def remove_toy(self, row):
-        for i in range(6):
-            # get input at coordinates (row,i)
-            item = self.input_grid_layout.itemAtPosition(row, i)
-            if item:
-                # retrieve widget(cell) corresponding to item
-                widget = item.widget()
-                if widget:
-                    # safely delete cell
-                    widget.deleteLater()
-        self.toy_inputs.pop(row - 1)
+        self.item_model.add_items()
 
-    def solve(self):
+    def remove_selected_toys(self):
+        rows = [index.row() for index in self.item_table.selectionModel().selectedRows()]
+        self.item_model.remove_items(rows)
+
+    def import_toys(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Import items', '', FILE_FILTER)
+        if not path:
+            return
+        try:
+            self.item_model.add_items(read_production(path))
+        except (OSError, ValueError) as error:
+            QMessageBox.critical(self, 'Error', 'Error: ' + str(error))
+
+    def export_toys(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export items', '', FILE_FILTER)
+        if not path:
+            return
+        try:
+            write_production(path, self.item_model.items())
+        except OSError as error:
+            QMessageBox.critical(self, 'Error', 'Error: ' + str(error))
+
+    def export_solution(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export solution', '', FILE_FILTER)
+        if not path:
+            return
+        try:
+            write_production_solution(path, self.solution_model.names, self.solution_model.values)
+        except OSError as error:
+            QMessageBox.critical(self, 'Error', 'Error: ' + str(error))
+
+    def read_inputs(self):
+        # the page's inputs as (items, item ids, salary, raw material cost, capacities), None if one is invalid
         # Check for negative inputs and empty fields in the main input fields
         input_labels = {
         self.max_hours_per_worker_input: "Maximum hours per worker",
@@ -157,10 +582,9 @@ class ToyFactoryGUI(QWidget):
             if input_field.text() == '' or not input_field.text().replace('.', '', 1).isdigit():
                 error_message = f"Error: Please enter a valid number for {label}"
                 QMessageBox.critical(self, 'Error', error_message)
-                return
+                return None
        
         # data extraction from GUI
-        nb_toys = len(self.toy_inputs)
         max_hours_per_worker = float(self.max_hours_per_worker_input.text())
         max_machine_hours = float(self.max_hours_machine_input.text())
         max_wood = float(self.max_wood_input.text())
@@ -170,81 +594,192 @@ class ToyFactoryGUI(QWidget):
         max_hours_manual_work = max_hours_per_worker * max_nb_workers
         availability_resources = [
             max_hours_manual_work, max_machine_hours, max_wood]
-        benefits = []
-        consumption_resources = []
-        demand_constraints = []
-        # Extract data for each toy
-        for toy_input in self.toy_inputs:
-            
-            for field_index in range(5):  
-                # Check if the text is empty
-                if toy_input[field_index].text() == '':
-                    QMessageBox.critical(
-                        self, 'Error', 'Error: Please enter ' + toy_input[field_index].placeholderText())
-                    return  
-                
-                # Check if the text contains a valid number
-                if not toy_input[field_index].text().replace('.', '', 1).isdigit():
-                    QMessageBox.critical(
-                        self, 'Error', 'Error: Please enter a valid number for ' + toy_input[field_index].placeholderText())
-                    return  
-            
-            hours = float(toy_input[0].text())
-            machine_hours = float(toy_input[1].text())
-            wood = float(toy_input[2].text())
-            price = float(toy_input[3].text())
-            demand = float(toy_input[4].text())
-            # Calculate benefit for the toy
-            toy_benefit = price - wood * wood_price - hours * salary_hour
-            # Collect consumption resources for the toy
-            toy_consumption_resources = [hours, machine_hours, wood]
-            benefits.append(toy_benefit)
-            consumption_resources.append(toy_consumption_resources)
-            # Collect demand constraints for the toy
-            demand_constraints.append(demand)
-
-        # add 1s and 0s to consumption resources (left hand of constraint expression)
-        for i in range(nb_toys):
-            extra_columns = []
-            for j in range(nb_toys):
-                extra_columns.append(1 if i == j else 0)
-            consumption_resources[i].extend(extra_columns)
-        # add demand constraint of each toy to availabity_resources (right hand expression)
-        for i in range(nb_toys):
-            availability_resources.append(demand_constraints[i])
-        print("consumption resources:", consumption_resources)
-        print("demand constraints:", demand_constraints)
-        print("benefits", benefits)
-        print("availabilty resources", availability_resources)
+        # every cell was parsed when it was edited, only the cached numbers are checked here
+        invalid = self.item_model.first_invalid()
+        if invalid is not None:
+            row, column = invalid
+            self.item_table.setCurrentIndex(self.item_model.index(row, column))
+            QMessageBox.critical(
+                self, 'Error', f'Error: Please enter a valid number for {ITEM_COLUMNS[column]} (item {row + 1})')
+            return None
+        return self.item_model.items(), list(self.item_model.item_ids), salary_hour, wood_price, availability_resources
+
+    def solve(self):
+        inputs = self.read_inputs()
+        if inputs is None:
+            return
+        items, item_ids, salary_hour, wood_price, availability_resources = inputs
+        self.pending_inputs = (items, salary_hour, wood_price, availability_resources)
+        emit("solve_requested", page="production", items=len(items), salary=salary_hour, raw_material_cost=wood_price,
+             capacities=list(availability_resources))
 
         # unhide solution display
         self.solution_display.setHidden(False)
+        self.solution_display.setText("Solving...")
+
+        backend = DEFAULT_BACKEND
+        # opt-in recording of every solved instance (SOLVER_CORPUS), replayed by replay_corpus.py
+        corpus = corpus_from_environment()
+        # with SOLVER_SERVICE set, the shared solve service solves the instance instead of this process
+        address = service_address()
+
+        def solve_job(cancel_event, report):
+            result = solve_instance(cancel_event, report)
+            if corpus is not None:
+                corpus.record_production(items, salary_hour, wood_price, availability_resources, result)
+            return result
+
+        def solve_instance(cancel_event, report):
+            if address is not None:
+                return solve_on_service(production_problem(items, salary_hour, wood_price, availability_resources),
+                                        cancel_event, lambda event: report(describe_event(event)), address=address)
+            if backend != "gurobi":
+                # other backends have no live model: build and solve this instance from scratch
+                solver = build_production_solver(items, salary_hour, wood_price, availability_resources,
+                                                 backend=backend, cache=solution_cache)
+                with solver:
+                    solver.solve(cancel_event)
+                    return solver.get_result()
+            # runs on the solver thread: apply only what changed to the live model, then re-solve
+            # starting from the previous basis
+            if self.production_model is None:
+                # imported here so the page also works on machines without gurobipy
+                from ProductionModel import ProductionModel
+                self.production_model = ProductionModel().set_cache(solution_cache)
+            with phase("sync", backend="gurobi", items=len(item_ids)):
+                self.production_model.sync(item_ids, items, salary_hour, wood_price, availability_resources)
+            return self.production_model.solve(cancel_event)
+
+        # a click while a solve is running replaces that solve
+        self.solve_runner.start(solve_job, stream=True)
+
+    def sweep(self):
+        inputs = self.read_inputs()
+        if inputs is None:
+            return
+        items, _, salary_hour, wood_price, availability_resources = inputs
+        start = parse_number(self.sweep_from_input.text())
+        stop = parse_number(self.sweep_to_input.text())
+        if start is None or stop is None:
+            QMessageBox.critical(self, 'Error', 'Error: Please enter a valid range for the sweep')
+            return
+        parameter = SWEEP_PARAMETERS[self.sweep_parameter_input.currentIndex()]
+        values = sweep_values(start, stop, self.sweep_steps_input.value())
+        method = self.sweep_method_input.currentText()
+        self.solution_display.setHidden(False)
+        self.solution_display.setText("Sweeping...")
+
+        def sweep_job(cancel_event):
+            return sweep_production(items, salary_hour, wood_price, availability_resources, parameter, values,
+                                    method=method, cancel_event=cancel_event)
+
+        self.sweep_runner.start(sweep_job)
+
+    def display_sweep(self, result):
+        solved = sum(status == "optimal" for status in result.statuses)
+        self.solution_display.setText(
+            f"Sweep of {len(result.values)} values ({result.method}): {solved} solved in {result.solve_time:.2f}s")
+        self.sweep_model.set_result(result)
+        self.sweep_table.setHidden(False)
+
+    def display_solution(self, result):
+        with phase("display", page="production", items=len(result.names)):
+            self.show_solution(result)
+
+    def show_solution(self, result):
+        objective_value = result.objective_value
+        if objective_value is not None and objective_value != 0:
+            self.solution_display.setText(f"Optimal Objective Value: {objective_value}")
+            self.solution_model.set_solution(result.names, result.values, result.sensitivity)
+            self.solution_table.setHidden(False)
+            self.export_solution_btn.setEnabled(True)
+            self.sensitivity = result.sensitivity
+            self.solved_inputs = self.pending_inputs
+            self.resource_model.set_sensitivity(result.sensitivity)
+            self.resource_table.setHidden(result.sensitivity is None)
+        else:
+            self.show_no_solution("No solution found")
+
+    def show_no_solution(self, message):
+        self.solution_display.setText(message)
+        self.solution_model.set_solution([], [])
+        self.solution_table.setHidden(True)
+        self.export_solution_btn.setEnabled(False)
+        self.sensitivity = None
+        self.resource_model.set_sensitivity(None)
+        self.resource_table.setHidden(True)
+
+    def what_if(self):
+        inputs = self.read_inputs()
+        if inputs is None:
+            return
+        items, _, salary_hour, wood_price, availability_resources = inputs
+        value = parse_number(self.what_if_value_input.text())
+        if value is None:
+            QMessageBox.critical(self, 'Error', 'Error: Please enter a valid number for the what-if value')
+            return
+        choice = self.what_if_parameter_input.currentIndex()
+        parameter = WHAT_IF_PARAMETERS[choice]
+        if parameter == "workers":
+            parameter, value = "manual_hours", value * float(self.max_hours_per_worker_input.text())
+        elif parameter == "hours_per_worker":
+            parameter, value = "manual_hours", value * float(self.max_workers_input.text())
+        question = f"{WHAT_IF_LABELS[choice]} = {self.what_if_value_input.text()}"
+        self.what_if_display.setHidden(False)
+
+        if self.sensitivity is not None and self.solved_inputs is not None and self.inputs_unchanged(inputs):
+            profit = what_if(self.sensitivity, items, salary_hour, wood_price, availability_resources,
+                             parameter, value)
+            if profit is not None:
+                self.what_if_display.setText(f"{question}: profit {profit:g} (within the valid range, no re-solve)")
+                return
+        self.what_if_display.setText(f"{question}: solving...")
+        point_salary, point_cost, point_capacities = point_inputs(parameter, value, salary_hour, wood_price,
+                                                                  availability_resources)
+        backend = DEFAULT_BACKEND
+
+        def what_if_job(cancel_event):
+            solver = build_production_solver(items, point_salary, point_cost, point_capacities,
+                                             backend=backend, cache=solution_cache)
+            with solver:
+                solver.solve(cancel_event)
+                return question, solver.get_result()
 
-        builder = GurobiSolverBuilder()
-        solver = (builder
-                  .add_variables(nb_toys, names=[f"Item_{i+1}" for i in range(nb_toys)])
-                  .set_constraints_LHS(consumption_resources)
-                  .set_constraints_RHS(availability_resources)
-                  .add_constraints(name="my_constraints")
-                  .set_objective(benefits, GRB.MAXIMIZE)  # Maximizing profit
-                  .build()
-                  )
-        solver.solve()
-
-        if (solver.get_objective_value()!=0):
-        # Extract the solution
-            solution = solver.get_variables()
-            solution_text = "Solution:\n"
-            for var_name, var_value in solution.items():
-                solution_text += f"{var_name} = {var_value}\n"
-            solution_text += f"Optimal Objective Value: {solver.get_objective_value()}\n"
-            font = self.solution_display.font()
-            font.setPointSize(12)  
-            self.solution_display.setFont(font)
-            # Update the QPlainTextEdit with the solution
-            self.solution_display.setPlainText(solution_text)
+        self.what_if_runner.start(what_if_job)
+
+    def inputs_unchanged(self, inputs):
+        # the report only answers questions about the inputs it was computed for
+        items, _, salary_hour, wood_price, availability_resources = inputs
+        solved_items, solved_salary, solved_cost, solved_capacities = self.solved_inputs
+        return (np.array_equal(items, solved_items) and salary_hour == solved_salary and wood_price == solved_cost
+                and np.array_equal(availability_resources, solved_capacities))
+
+    def display_what_if(self, answer):
+        question, result = answer
+        if result.objective_value is None:
+            self.what_if_display.setText(f"{question}: no solution ({result.status})")
         else:
-            self.solution_display.setPlainText("No solution found")
+            self.what_if_display.setText(f"{question}: profit {result.objective_value:g} (re-solved)")
+
+    def display_what_if_error(self, message):
+        self.what_if_display.setText(f"What-if failed: {message}")
+
+    def display_solve_error(self, message):
+        self.show_no_solution("No solution found")
+        QMessageBox.critical(self, 'Error', 'Error: ' + message)
+
+    def display_solve_cancelled(self):
+        self.show_no_solution("Solve cancelled")
+
+    def closeEvent(self, event):
+        self.solve_runner.wait()
+        self.sweep_runner.wait()
+        self.what_if_runner.wait()
+        if self.production_model is not None:
+            # the live LP is only freed here, it is kept between solves
+            self.production_model.dispose()
+            self.production_model = None
+        super().closeEvent(event)
         
     def open_homepage(self):
         # Import inside the function to avoid circular import
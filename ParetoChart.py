@@ -0,0 +1,118 @@
+from PyQt5.QtCore import QPointF, QRectF, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+from ParetoFrontier import MEASURE_LABELS, non_dominated
+
+MARGIN = 40
+POINT_RADIUS = 4
+# a click farther than this many pixels from every point selects nothing
+CLICK_DISTANCE = 12
+
+
+class ParetoChart(QWidget):
+    # scatter of the frontier points (total salary across, the measure up) with the non-dominated
+    # points joined as a staircase; points can be added one by one while the frontier is computed.
+    # Clicking a point emits its index in points.
+    pointClicked = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(220)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.measure = "popularity"
+        self.points = []
+        self.frontier = []
+        self.selected = None
+
+    def clear(self, measure="popularity"):
+        self.measure = measure
+        self.points = []
+        self.frontier = []
+        self.selected = None
+        self.update()
+
+    def add_point(self, point):
+        self.points.append(point)
+        self.frontier = non_dominated(self.points, self.measure)
+        self.update()
+
+    def set_selected(self, index):
+        self.selected = index
+        self.update()
+
+    def plot_area(self):
+        return QRectF(MARGIN, MARGIN / 2, max(self.width() - 1.5 * MARGIN, 1), max(self.height() - 1.5 * MARGIN, 1))
+
+    def ranges(self):
+        salaries = [point.salary for point in self.points]
+        values = [point.value(self.measure) for point in self.points]
+        low_x, high_x = min(salaries), max(salaries)
+        low_y, high_y = min(values), max(values)
+        return low_x, max(high_x - low_x, 1e-9), low_y, max(high_y - low_y, 1e-9)
+
+    def position(self, point, area, ranges):
+        low_x, span_x, low_y, span_y = ranges
+        return QPointF(area.left() + (point.salary - low_x) / span_x * area.width(),
+                       area.bottom() - (point.value(self.measure) - low_y) / span_y * area.height())
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        area = self.plot_area()
+        painter.setPen(QPen(QColor("#233154")))
+        painter.drawLine(area.bottomLeft(), area.bottomRight())
+        painter.drawLine(area.bottomLeft(), area.topLeft())
+        painter.drawText(QRectF(area.left(), area.bottom() + 4, area.width(), MARGIN), Qt.AlignHCenter | Qt.AlignTop,
+                         "Total salary ($)")
+        painter.save()
+        painter.translate(4, area.center().y())
+        painter.rotate(-90)
+        painter.drawText(QRectF(-area.height() / 2, 0, area.height(), MARGIN - 8), Qt.AlignHCenter | Qt.AlignTop,
+                         MEASURE_LABELS[self.measure])
+        painter.restore()
+        if not self.points:
+            painter.drawText(area, Qt.AlignCenter, "No frontier computed yet")
+            return
+
+        ranges = self.ranges()
+        low_x, span_x, low_y, span_y = ranges
+        painter.drawText(QRectF(area.left(), area.bottom() + 4, area.width(), MARGIN), Qt.AlignLeft | Qt.AlignTop,
+                         f"{low_x:g}")
+        painter.drawText(QRectF(area.left(), area.bottom() + 4, area.width(), MARGIN), Qt.AlignRight | Qt.AlignTop,
+                         f"{low_x + span_x:g}")
+        painter.drawText(QRectF(0, area.top() - 6, MARGIN - 4, 14), Qt.AlignRight | Qt.AlignVCenter,
+                         f"{low_y + span_y:g}")
+        painter.drawText(QRectF(0, area.bottom() - 8, MARGIN - 4, 14), Qt.AlignRight | Qt.AlignVCenter,
+                         f"{low_y:g}")
+
+        # staircase: a list stays the best one until the budget reaches the next point
+        if self.frontier:
+            path = QPainterPath(self.position(self.frontier[0], area, ranges))
+            for point in self.frontier[1:]:
+                corner = self.position(point, area, ranges)
+                path.lineTo(corner.x(), path.currentPosition().y())
+                path.lineTo(corner)
+            painter.setPen(QPen(QColor("#4b6cb7"), 2))
+            painter.drawPath(path)
+
+        frontier = set(map(id, self.frontier))
+        for index, point in enumerate(self.points):
+            color = QColor("#233154") if id(point) in frontier else QColor("#9aa5bd")
+            if index == self.selected:
+                color = QColor("#d9534f")
+            painter.setPen(QPen(color))
+            painter.setBrush(color)
+            painter.drawEllipse(self.position(point, area, ranges), POINT_RADIUS, POINT_RADIUS)
+
+    def mousePressEvent(self, event):
+        if not self.points or event.button() != Qt.LeftButton:
+            return super().mousePressEvent(event)
+        area = self.plot_area()
+        ranges = self.ranges()
+        distances = [(self.position(point, area, ranges) - QPointF(event.pos())).manhattanLength()
+                     for point in self.points]
+        index = min(range(len(distances)), key=distances.__getitem__)
+        if distances[index] <= CLICK_DISTANCE:
+            self.set_selected(index)
+            self.pointClicked.emit(index)
@@ -0,0 +1,201 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+import SolverBackend
+from SelectionProblem import build_selection_solver
+from SolverBackend import DEFAULT_BACKEND, MAXIMIZE
+from Telemetry import emit, phase
+
+# what the frontier trades against total salary
+MEASURES = ("popularity", "head_count")
+MEASURE_LABELS = {"popularity": "Total popularity", "head_count": "Head count"}
+# two points whose salary and measure agree this closely are the same point
+TOLERANCE = 1e-6
+
+
+class SelectionInstance:
+    # the guest selection data without the salary budget, which each frontier point sets itself
+    def __init__(self, salaries, masses, popularities, vips, ship_weight, min_vip_count, cliques):
+        self.salaries = np.asarray(salaries, dtype=float)
+        self.masses = np.asarray(masses, dtype=float)
+        self.popularities = np.asarray(popularities, dtype=float)
+        self.vips = np.asarray(vips, dtype=bool)
+        self.ship_weight = ship_weight
+        self.min_vip_count = min_vip_count
+        self.cliques = [list(clique) for clique in cliques]
+
+    def measure(self, measure):
+        # objective coefficients of a measure
+        if measure == "popularity":
+            return self.popularities
+        if measure == "head_count":
+            return np.ones(len(self.salaries))
+        raise ValueError(f"unknown measure {measure!r}, expected one of {', '.join(MEASURES)}")
+
+    def build(self, budget, objectives, backend=None):
+        return build_selection_solver(self.salaries, self.masses, self.popularities, self.vips, self.ship_weight,
+                                      budget, self.min_vip_count, self.cliques, backend=backend,
+                                      objectives=objectives)
+
+
+class ParetoPoint:
+    # the best list for the measure whose total salary stays within epsilon (the cheapest one among equals)
+    def __init__(self, epsilon, status, selected=None, salary=None, popularity=None, head_count=None,
+                 solve_time=0.0):
+        self.epsilon = epsilon
+        self.status = status
+        # indices of the selected celebrities
+        self.selected = selected
+        self.salary = salary
+        self.popularity = popularity
+        self.head_count = head_count
+        self.solve_time = solve_time
+
+    def has_solution(self):
+        return self.selected is not None
+
+    def value(self, measure):
+        return self.popularity if measure == "popularity" else self.head_count
+
+    def solution(self, number_of_celebrities):
+        # 0/1 vector over all celebrities, as SolveResult.values
+        values = np.zeros(number_of_celebrities)
+        if self.selected is not None:
+            values[self.selected] = 1.0
+        return values
+
+    def to_dict(self):
+        return {
+            "epsilon": self.epsilon,
+            "status": self.status,
+            "salary": self.salary,
+            "popularity": self.popularity,
+            "head_count": self.head_count,
+            "selected": None if self.selected is None else self.selected.tolist(),
+            "solve_time": self.solve_time,
+        }
+
+
+def solve_point(instance, measure, epsilon, start=None, backend=None, cancel_event=None):
+    # one epsilon-constraint point: total salary <= epsilon, the measure first, then the salary;
+    # start is a 0/1 list that is feasible for epsilon, used as MIP start
+    started = time.perf_counter()
+    with instance.build(epsilon, [(-instance.salaries, MAXIMIZE), (instance.measure(measure), MAXIMIZE)],
+                        backend) as solver:
+        if start is not None:
+            solver.set_start(start)
+        solver.solve(cancel_event)
+        result = solver.get_result()
+    point = ParetoPoint(epsilon, result.status, solve_time=time.perf_counter() - started)
+    if result.has_solution() and result.status in (SolverBackend.OPTIMAL, SolverBackend.LIMIT_REACHED):
+        point.selected = np.flatnonzero(np.asarray(result.values) > 0.5)
+        point.salary = float(instance.salaries[point.selected].sum())
+        point.popularity = float(instance.popularities[point.selected].sum())
+        point.head_count = len(point.selected)
+    emit("pareto_point", measure=measure, epsilon=epsilon, status=point.status, salary=point.salary,
+         seconds=point.solve_time)
+    return point
+
+
+def salary_range(instance, measure, budget, backend=None, cancel_event=None):
+    # (cheapest point, best point within budget), or None when no list fits the budget
+    with instance.build(budget, [(-instance.salaries, MAXIMIZE)], backend) as solver:
+        solver.solve(cancel_event)
+        cheapest = solver.get_result()
+    if cheapest.status != SolverBackend.OPTIMAL:
+        return None
+    low = float(instance.salaries @ np.asarray(cheapest.values))
+    return (solve_point(instance, measure, low, cheapest.values, backend, cancel_event),
+            solve_point(instance, measure, budget, None, backend, cancel_event))
+
+
+def warm_start(points, epsilon, number_of_celebrities):
+    # the completed list that fits epsilon best, which is feasible for it
+    fitting = [point for point in points if point.has_solution() and point.salary <= epsilon]
+    if not fitting:
+        return None
+    return max(fitting, key=lambda point: point.epsilon).solution(number_of_celebrities)
+
+
+def start_worker(backend):
+    if backend == "gurobi":
+        from GurobiEnvironment import configure_environments
+        configure_environments({"OutputFlag": 0, "Threads": 1})
+
+
+def frontier_points(instance, budget, measure="popularity", steps=20, workers=None, backend=None,
+                    cancel_event=None):
+    # yields the frontier points as they are solved: both ends first, then epsilon = evenly spaced salaries
+    # in between, each solve starting from the best list already found that fits its epsilon. With more
+    # than one worker the points are solved in separate processes, at most workers at a time.
+    backend = backend or DEFAULT_BACKEND
+    with phase("pareto_range", measure=measure, celebrities=len(instance.salaries)):
+        ends = salary_range(instance, measure, budget, backend, cancel_event)
+    if ends is None:
+        return
+    done = list(ends)
+    yield from ends
+    low, high = ends[0].salary, ends[1].salary
+    epsilons = list(np.linspace(low, high, max(steps, 2))[1:-1]) if high - low > TOLERANCE else []
+    n = len(instance.salaries)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(epsilons))
+
+    if workers <= 1:
+        for epsilon in epsilons:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            point = solve_point(instance, measure, epsilon, warm_start(done, epsilon, n), backend, cancel_event)
+            done.append(point)
+            yield point
+        return
+
+    # spawned processes, forking a process that runs a GUI or a solver thread is not safe
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=start_worker, initargs=(backend,))
+    try:
+        queue = list(epsilons)
+        running = set()
+        while queue or running:
+            while queue and len(running) < workers:
+                epsilon = queue.pop(0)
+                running.add(pool.submit(solve_point, instance, measure, epsilon, warm_start(done, epsilon, n),
+                                        backend))
+            # wake up now and then to notice a cancel, the running solves can't be stopped from here
+            finished, running = wait(running, timeout=0.2, return_when=FIRST_COMPLETED)
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            for future in finished:
+                point = future.result()
+                done.append(point)
+                yield point
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def non_dominated(points, measure):
+    # the distinct points no other point beats on both salary and measure, by increasing salary
+    solved = sorted((point for point in points if point.has_solution()),
+                    key=lambda point: (point.salary, -point.value(measure)))
+    frontier = []
+    for point in solved:
+        if not frontier or point.value(measure) > frontier[-1].value(measure) + TOLERANCE:
+            frontier.append(point)
+    return frontier
+
+
+def pareto_frontier(instance, budget, measure="popularity", steps=20, workers=None, backend=None,
+                    cancel_event=None, report=None):
+    # the non-dominated points; report(point) is called for every solved point as soon as it comes in,
+    # before it is known whether a later point dominates it
+    points = []
+    for point in frontier_points(instance, budget, measure, steps, workers, backend, cancel_event):
+        points.append(point)
+        if report is not None and point.has_solution():
+            report(point)
+    return non_dominated(points, measure)
@@ -0,0 +1,146 @@
+import numpy as np
+import scipy.sparse as sp
+
+# what happened to each original row of A x <= b during presolve
+ROW_KEPT = 0        # still in the model, as reduced row row_target[i]
+ROW_BOUND = 1       # single-variable row, turned into a bound on variable row_target[i]
+ROW_DUPLICATE = 2   # row_scale[i] * (reduced row row_target[i]) with a looser or equal right-hand side
+ROW_REDUNDANT = 3   # can never be violated given the variable bounds
+ROW_EMPTY = 4       # all-zero row with a non-negative right-hand side
+
+# bounds at or beyond this magnitude are treated as infinite
+INFINITE_BOUND = 1e20
+TOLERANCE = 1e-9
+
+
+class PresolveInfo:
+    def __init__(self, A, b, row_kind, row_target, row_scale, kept_rows, lbs, ubs, lb_rows, ub_rows):
+        # original rows, kept so slacks can be reported against them
+        self.A = A
+        self.b = b
+        self.row_kind = row_kind
+        self.row_target = row_target
+        self.row_scale = row_scale
+        self.kept_rows = kept_rows
+        # tightened bounds, and which original row produced each bound (-1 when none did)
+        self.lbs = lbs
+        self.ubs = ubs
+        self.lb_rows = lb_rows
+        self.ub_rows = ub_rows
+
+    @property
+    def reduced_A(self):
+        return self.A[self.kept_rows]
+
+    @property
+    def reduced_b(self):
+        return self.b[self.kept_rows]
+
+    def summary(self):
+        counts = np.bincount(self.row_kind, minlength=5)
+        return {
+            "rows": len(self.b),
+            "kept": int(counts[ROW_KEPT]),
+            "bounds": int(counts[ROW_BOUND]),
+            "duplicates": int(counts[ROW_DUPLICATE]),
+            "redundant": int(counts[ROW_REDUNDANT]),
+            "empty": int(counts[ROW_EMPTY]),
+        }
+
+    def original_slacks(self, x):
+        return self.b - self.A @ x
+
+    def original_duals(self, reduced_duals, reduced_costs, x):
+        # map duals of the reduced model back onto the original rows
+        duals = np.zeros(len(self.b))
+        kept = self.row_kind == ROW_KEPT
+        duals[kept] = reduced_duals[self.row_target[kept]]
+        # a bound row carries the reduced cost of its variable when that bound is active
+        for bound_rows, bounds in ((self.ub_rows, self.ubs), (self.lb_rows, self.lbs)):
+            active = np.flatnonzero((bound_rows >= 0) & (np.abs(x - bounds) <= 1e-7 * np.maximum(1.0, np.abs(bounds))))
+            rows = bound_rows[active]
+            duals[rows] = reduced_costs[active] / self.row_scale[rows]
+        return duals
+
+
+def presolve_rows(A, b, lbs, ubs, integer=None):
+    # A x <= b with lbs <= x <= ubs; returns PresolveInfo describing the reduced row set
+    A = sp.csr_matrix(A, dtype=float)
+    A.eliminate_zeros()
+    b = np.asarray(b, dtype=float).copy()
+    lbs = np.asarray(lbs, dtype=float).copy()
+    ubs = np.asarray(ubs, dtype=float).copy()
+    if integer is None:
+        integer = np.zeros(len(lbs), dtype=bool)
+    m = A.shape[0]
+
+    row_kind = np.full(m, ROW_KEPT, dtype=np.int8)
+    row_target = np.full(m, -1, dtype=np.int64)
+    row_scale = np.ones(m)
+    lb_rows = np.full(len(lbs), -1, dtype=np.int64)
+    ub_rows = np.full(len(ubs), -1, dtype=np.int64)
+    nnz = np.diff(A.indptr)
+
+    # all-zero rows: 0 <= b is either always true or infeasible (left in so the solver reports it)
+    row_kind[(nnz == 0) & (b >= -TOLERANCE)] = ROW_EMPTY
+
+    # single-variable rows a * x_j <= b become x_j <= b / a (a > 0) or x_j >= b / a (a < 0)
+    singletons = np.flatnonzero(nnz == 1)
+    columns = A.indices[A.indptr[singletons]]
+    coefficients = A.data[A.indptr[singletons]]
+    row_kind[singletons] = ROW_BOUND
+    row_target[singletons] = columns
+    row_scale[singletons] = coefficients
+    for row, j, a in zip(singletons.tolist(), columns.tolist(), coefficients.tolist()):
+        bound = b[row] / a
+        if a > 0:
+            if integer[j]:
+                bound = np.floor(bound + TOLERANCE)
+            if bound < ubs[j]:
+                ubs[j] = bound
+                ub_rows[j] = row
+        else:
+            if integer[j]:
+                bound = np.ceil(bound - TOLERANCE)
+            if bound > lbs[j]:
+                lbs[j] = bound
+                lb_rows[j] = row
+
+    # rows whose largest possible activity over the (tightened) bounds stays within b
+    candidates = np.flatnonzero(row_kind == ROW_KEPT)
+    if len(candidates):
+        sub = A[candidates]
+        upper = np.where(ubs >= INFINITE_BOUND, np.inf, ubs)
+        lower = np.where(lbs <= -INFINITE_BOUND, -np.inf, lbs)
+        max_activity = sub.maximum(0) @ upper + sub.minimum(0) @ lower
+        redundant = max_activity <= b[candidates] + TOLERANCE
+        row_kind[candidates[redundant]] = ROW_REDUNDANT
+
+    # parallel rows: keep the tightest one per normalized coefficient pattern; infeasible empty rows
+    # have no pattern and go to the solver as they are
+    groups = {}
+    for row in np.flatnonzero((row_kind == ROW_KEPT) & (nnz > 0)).tolist():
+        start, end = A.indptr[row], A.indptr[row + 1]
+        data = A.data[start:end]
+        scale = np.abs(data).max()
+        key = (A.indices[start:end].tobytes(), np.round(data / scale, 12).tobytes())
+        groups.setdefault(key, []).append((b[row] / scale, row, scale))
+    for group in groups.values():
+        if len(group) == 1:
+            continue
+        _, kept, kept_scale = min(group)
+        for _, row, scale in group:
+            if row != kept:
+                row_kind[row] = ROW_DUPLICATE
+                row_target[row] = kept
+                row_scale[row] = scale / kept_scale
+
+    kept_rows = np.flatnonzero(row_kind == ROW_KEPT)
+    # duplicates point at an original row so far, re-point everything at reduced row indices
+    reduced_index = np.full(m, -1, dtype=np.int64)
+    reduced_index[kept_rows] = np.arange(len(kept_rows))
+    row_target[kept_rows] = reduced_index[kept_rows]
+    duplicates = np.flatnonzero(row_kind == ROW_DUPLICATE)
+    row_target[duplicates] = reduced_index[row_target[duplicates]]
+
+    return PresolveInfo(A, b, row_kind, row_target, row_scale, kept_rows, lbs, ubs, lb_rows, ub_rows)
@@ -0,0 +1,100 @@
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+from InstanceIO import write_celebrity_columns, write_production
+from SolverBackend import INTERRUPTED
+from Telemetry import emit
+
+# directory the pages record their solves to; recording is off while it is unset
+CORPUS_ENVIRONMENT_VARIABLE = "SOLVER_CORPUS"
+
+logger = logging.getLogger("telemetry")
+
+
+def worth_recording(result):
+    # cache hits took no solve and cancelled solves were cut short, neither says how long a solve takes
+    return not result.cached and result.status != INTERRUPTED
+
+
+def recorded_fields(result):
+    # what replay_corpus.py compares a new solve against
+    return {
+        "backend": result.backend,
+        "status": result.status,
+        "objective_value": result.objective_value,
+        "mip_gap": result.mip_gap,
+        "build_time": result.build_time,
+        "solve_time": result.solve_time,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+class ProblemCorpus:
+    # writes every solved page instance to a directory as a batch_solve.py spec (the page's inputs and
+    # the data file in the columnar binary format of InstanceIO) with the recorded timing and result
+    # under "recorded", so replay_corpus.py can solve it again and compare
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def entry_name(self, kind):
+        with self.lock:
+            number = next(self.counter)
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{number:04d}-{kind}"
+
+    def record_production(self, items, salary, raw_material_cost, capacities, result):
+        if not worth_recording(result):
+            return None
+        name = self.entry_name("production")
+        return self.write(name, lambda path: write_production(path, items),
+                          {"type": "production", "salary": salary, "raw_material_cost": raw_material_cost,
+                           "capacities": [float(capacity) for capacity in capacities]}, result)
+
+    def record_selection(self, columns, ship_weight, budget, min_vip_count, result):
+        # columns is an InstanceIO.CelebrityColumns snapshot of the store taken when the solve started
+        if not worth_recording(result):
+            return None
+        name = self.entry_name("selection")
+        return self.write(name, lambda path: write_celebrity_columns(path, columns),
+                          {"type": "selection", "ship_weight": ship_weight, "budget": budget,
+                           "min_vip_count": min_vip_count}, result)
+
+    def write(self, name, write_data, spec, result):
+        # the spec is written last and renamed into place, so a replay never sees half an entry;
+        # a failed recording is logged and never fails the solve
+        start = time.perf_counter()
+        data_path = os.path.join(self.directory, name + ".bin")
+        spec_path = os.path.join(self.directory, name + ".json")
+        try:
+            write_data(data_path)
+            spec = dict(spec, name=name, data=os.path.basename(data_path), recorded=recorded_fields(result))
+            with open(spec_path + ".tmp", "w") as file:
+                json.dump(spec, file, indent=2)
+            os.replace(spec_path + ".tmp", spec_path)
+        except OSError as error:
+            logger.warning("could not record %s to the corpus: %s", name, error)
+            return None
+        emit("corpus_record", entry=name, type=spec["type"], seconds=time.perf_counter() - start)
+        return spec_path
+
+
+_corpus = None
+_corpus_lock = threading.Lock()
+
+
+def corpus_from_environment():
+    # the corpus named by SOLVER_CORPUS, created on first use, or None when recording is off
+    global _corpus
+    directory = os.environ.get(CORPUS_ENVIRONMENT_VARIABLE)
+    if not directory:
+        return None
+    with _corpus_lock:
+        if _corpus is None:
+            _corpus = ProblemCorpus(directory)
+    return _corpus
@@ -0,0 +1,187 @@
+import time
+import numpy as np
+import gurobipy as gp
+from gurobipy import GRB
+import SolverBackend
+from GurobiEnvironment import new_model, release_model
+from GurobiSolver import gurobi_sensitivity, gurobi_status, optimize
+from ProductionProblem import HOURS, RAW_MATERIALS, PRICE, DEMAND, RESOURCE_NAMES, item_names
+from SolutionCache import CachedSolution, instance_key
+from SolverBackend import SolveResult
+from Telemetry import emit, phase
+
+
+class ProductionModel:
+    # one live production LP:  max sum(benefit_i x_i)  s.t.  resources x <= capacities,  0 <= x_i <= demand_i
+    # Edits are applied to the Gurobi model in place, and each re-solve starts from the previous basis.
+    def __init__(self):
+        self.model = new_model("production")
+        self.model.ModelSense = GRB.MAXIMIZE
+        self.resources = [self.model.addLConstr(gp.LinExpr(), GRB.LESS_EQUAL, 0.0, name=name)
+                          for name in RESOURCE_NAMES]
+        self.item_ids = []
+        self.items = np.zeros((0, 5))
+        self.variables = []
+        self.salary = 0.0
+        self.raw_material_cost = 0.0
+        self.capacities = np.zeros(len(RESOURCE_NAMES))
+        # basis of the last optimal solve, kept aligned with variables / resources
+        self.vbasis = None
+        self.cbasis = None
+        self.structure_changed = False
+        self.status = None
+        self.cache = None
+
+    def set_cache(self, cache):
+        self.cache = cache
+        return self
+
+    def dispose(self):
+        # frees the live LP and returns its environment to the pool; the model can't be solved again
+        if self.model is not None:
+            release_model(self.model)
+            self.model = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
+        return False
+
+    def benefits(self, items=None):
+        items = self.items if items is None else items
+        return items[:, PRICE] - items[:, RAW_MATERIALS] * self.raw_material_cost - items[:, HOURS] * self.salary
+
+    def update_objective(self):
+        if self.variables:
+            self.model.setAttr("Obj", self.variables, self.benefits().tolist())
+
+    def set_salary(self, salary):
+        if salary != self.salary:
+            self.salary = salary
+            self.update_objective()
+
+    def set_raw_material_cost(self, raw_material_cost):
+        if raw_material_cost != self.raw_material_cost:
+            self.raw_material_cost = raw_material_cost
+            self.update_objective()
+
+    def set_capacities(self, capacities):
+        capacities = np.asarray(capacities, dtype=float)
+        for i in np.flatnonzero(capacities != self.capacities):
+            self.resources[i].RHS = capacities[i]
+        self.capacities = capacities.copy()
+
+    def set_item(self, index, values):
+        values = np.asarray(values, dtype=float)
+        # a copy: the row is overwritten below and still compared against afterwards
+        old = self.items[index].copy()
+        if np.array_equal(values, old):
+            return
+        var = self.variables[index]
+        for r in range(len(RESOURCE_NAMES)):
+            if values[r] != old[r]:
+                self.model.chgCoeff(self.resources[r], var, values[r])
+        if values[DEMAND] != old[DEMAND]:
+            var.UB = values[DEMAND]
+        self.items[index] = values
+        if values[PRICE] != old[PRICE] or values[HOURS] != old[HOURS] or values[RAW_MATERIALS] != old[RAW_MATERIALS]:
+            var.Obj = self.benefits(values.reshape(1, -1))[0]
+
+    def add_item(self, item_id, values):
+        values = np.asarray(values, dtype=float)
+        column = gp.Column(values[:len(RESOURCE_NAMES)].tolist(), self.resources)
+        var = self.model.addVar(lb=0.0, ub=values[DEMAND], obj=self.benefits(values.reshape(1, -1))[0],
+                                column=column, name=f"Item_{len(self.variables) + 1}")
+        self.variables.append(var)
+        self.item_ids.append(item_id)
+        self.items = np.vstack([self.items, values])
+        if self.vbasis is not None:
+            self.vbasis.append(GRB.NONBASIC_LOWER)
+        self.structure_changed = True
+
+    def remove_item(self, index):
+        self.model.remove(self.variables.pop(index))
+        self.item_ids.pop(index)
+        self.items = np.delete(self.items, index, axis=0)
+        if self.vbasis is not None and self.vbasis.pop(index) == GRB.BASIC:
+            # keep one basic variable per row: a slack takes the place of the removed column
+            nonbasic = [r for r, status in enumerate(self.cbasis) if status != GRB.BASIC]
+            if nonbasic:
+                self.cbasis[nonbasic[0]] = GRB.BASIC
+        self.structure_changed = True
+
+    def sync(self, item_ids, items, salary, raw_material_cost, capacities):
+        # bring the live model in line with the page, touching only what changed
+        items = np.asarray(items, dtype=float).reshape(-1, 5)
+        wanted = set(item_ids)
+        for index in reversed(range(len(self.item_ids))):
+            if self.item_ids[index] not in wanted:
+                self.remove_item(index)
+        self.set_salary(salary)
+        self.set_raw_material_cost(raw_material_cost)
+        self.set_capacities(capacities)
+        position = {item_id: index for index, item_id in enumerate(self.item_ids)}
+        for item_id, values in zip(item_ids, items):
+            if item_id in position:
+                self.set_item(position[item_id], values)
+            else:
+                self.add_item(item_id, values)
+        if self.item_ids != list(item_ids):
+            raise ValueError("items must keep their relative order between solves")
+        if self.structure_changed:
+            # positions moved, keep the names in line with the page rows
+            self.model.setAttr("VarName", self.variables, self.names())
+
+    def names(self):
+        return item_names(len(self.variables))
+
+    def cache_key(self):
+        resources = self.items[:, :len(RESOURCE_NAMES)].T
+        return instance_key(resources, self.capacities, [(self.benefits(), GRB.MAXIMIZE)],
+                            np.zeros(len(self.items)), self.items[:, DEMAND], ['C'] * len(self.items), self.names())
+
+    def solve(self, cancel_event=None):
+        start = time.perf_counter()
+        cache_key = self.cache_key() if self.cache is not None else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                emit("build", backend="gurobi", variables=len(self.variables), cached=True,
+                     seconds=time.perf_counter() - start)
+                self.status = cached.status
+                result = SolveResult(cached.status, cached.objective_value, cached.values, cached.names,
+                                     cached.backend, time.perf_counter() - start, 0.0, cached=True)
+                result.sensitivity = cached.sensitivity
+                return result
+
+        with phase("update", backend="gurobi", warm=self.vbasis is not None):
+            self.model.update()
+            if self.structure_changed and self.vbasis is not None:
+                # items were added or removed: restart from the last basis, new items nonbasic at zero
+                self.model.setAttr("VBasis", self.variables, self.vbasis)
+                self.model.setAttr("CBasis", self.resources, self.cbasis)
+        self.structure_changed = False
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        optimize(self.model, cancel_event)
+        solve_time = time.perf_counter() - start
+
+        self.status = gurobi_status(self.model.status)
+        values, objective_value, sensitivity = None, None, None
+        if self.status == SolverBackend.OPTIMAL:
+            with phase("extract", backend="gurobi", variables=len(self.variables)):
+                self.vbasis = self.model.getAttr("VBasis", self.variables) if self.variables else []
+                self.cbasis = self.model.getAttr("CBasis", self.resources)
+                values = np.array(self.model.getAttr("X", self.variables)) if self.variables else np.zeros(0)
+                objective_value = self.model.objVal
+                sensitivity = gurobi_sensitivity(self.model, self.variables, self.resources)
+        if cache_key is not None and self.status in SolverBackend.FINAL_STATUSES:
+            self.cache.put(cache_key, CachedSolution(self.status, objective_value, values, self.names(),
+                                                     sensitivity=sensitivity))
+        result = SolveResult(self.status, objective_value, values, self.names(), "gurobi",
+                             build_time, solve_time, self.model.status)
+        result.sensitivity = sensitivity
+        return result
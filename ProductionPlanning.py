@@ -0,0 +1,253 @@
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+import SolverBackend
+from ProductionProblem import HOURS, PRICE, RAW_MATERIALS, RESOURCE_NAMES, item_names, production_arrays
+from SolverBackend import CONTINUOUS, INTEGER, MAXIMIZE, limit_time, make_builder
+from Telemetry import emit, phase
+
+# periods of each rolling-horizon window, and how many of them are kept before the window moves on
+WINDOW = 28
+COMMIT = 7
+
+
+class PlanningInstance:
+    # production over several periods with stock carried from one period to the next.
+    # items is an (N, 5) array of item rows as in ProductionProblem (the demand column is not used),
+    # demand a (T, N) array of the demand of every item in every period, capacities a (T, 3) calendar
+    # of the resources available in every period, holding_costs the cost of keeping one unit in stock
+    # for a period and initial_stock the stock before the first period. demand and capacities are
+    # only sliced, so memory-mapped arrays (InstanceIO.read_planning) are never loaded whole.
+    def __init__(self, items, demand, capacities, salary, raw_material_cost, holding_costs=None, initial_stock=None):
+        self.items = np.asarray(items, dtype=float).reshape(-1, 5)
+        n = len(self.items)
+        self.demand = demand
+        self.capacities = capacities
+        self.salary = salary
+        self.raw_material_cost = raw_material_cost
+        self.holding_costs = np.zeros(n) if holding_costs is None else np.asarray(holding_costs, dtype=float)
+        self.initial_stock = np.zeros(n) if initial_stock is None else np.asarray(initial_stock, dtype=float)
+        if demand.shape != (len(capacities), n) or capacities.shape[1:] != (len(RESOURCE_NAMES),):
+            raise ValueError(f"expected demand of shape (periods, {n}) and capacities of shape "
+                             f"(periods, {len(RESOURCE_NAMES)}), got {demand.shape} and {capacities.shape}")
+
+    def number_of_items(self):
+        return len(self.items)
+
+    def number_of_periods(self):
+        return len(self.demand)
+
+    def unit_costs(self):
+        # raw materials and wages of one unit of every item
+        return self.items[:, RAW_MATERIALS] * self.raw_material_cost + self.items[:, HOURS] * self.salary
+
+    def window(self, start, end, initial_stock):
+        # periods start..end-1 as an instance of their own, starting from initial_stock
+        return PlanningInstance(self.items, np.array(self.demand[start:end], dtype=float),
+                                np.array(self.capacities[start:end], dtype=float), self.salary,
+                                self.raw_material_cost, self.holding_costs, initial_stock)
+
+
+def planning_names(number_of_items, number_of_periods):
+    return [f"{kind}_{i + 1}_{t + 1}" for t in range(number_of_periods) for kind in ("Make", "Stock")
+            for i in range(number_of_items)]
+
+
+def planning_arrays(instance):
+    # the time-expanded LP over x = [make_1 .. make_N, stock_1 .. stock_N] of every period in turn:
+    #   resources    A make_t <= capacities_t
+    #   sales        stock_(t-1) + make_t - stock_t, between 0 and demand_t
+    #   objective    price x sales - unit cost x make - holding cost x stock
+    # Sales are not variables of their own; with them written out the objective gives make_t its usual
+    # benefit, stock_t minus its holding cost and the last stock also minus its price, as nothing is
+    # sold after the last period. Returns A, b, c and the upper bounds of the variables.
+    n, periods = instance.number_of_items(), instance.number_of_periods()
+    A_resources = production_arrays(instance.items, instance.salary, instance.raw_material_cost,
+                                    np.zeros(len(RESOURCE_NAMES)))[0]
+    make = sp.hstack([sp.identity(n), sp.csr_matrix((n, n))])
+    stock = sp.hstack([sp.csr_matrix((n, n)), sp.identity(n)])
+    sales = (sp.kron(sp.identity(periods), make - stock) + sp.kron(sp.eye(periods, k=-1), stock)).tocsr()
+    resources = sp.kron(sp.identity(periods), sp.hstack([A_resources, sp.csr_matrix((len(RESOURCE_NAMES), n))]))
+    A = sp.vstack([resources, sales, -sales], format="csr")
+    demand = np.asarray(instance.demand, dtype=float)
+    # the initial stock is sold in the first period like stock carried over
+    opening = np.zeros((periods, n))
+    opening[0] = instance.initial_stock
+    b = np.concatenate([np.asarray(instance.capacities, dtype=float).reshape(-1), (demand - opening).reshape(-1),
+                        opening.reshape(-1)])
+    benefits = instance.items[:, PRICE] - instance.unit_costs()
+    c = np.tile(np.concatenate([benefits, -instance.holding_costs]), periods)
+    if periods:
+        c[-n:] -= instance.items[:, PRICE]
+    # nothing is made beyond what can be sold over the remaining periods
+    remaining = np.cumsum(demand[::-1], axis=0)[::-1]
+    ubs = np.stack([remaining, remaining + instance.initial_stock], axis=1).reshape(-1)
+    return A, b, c, ubs
+
+
+def build_planning_solver(instance, backend=None, integer=False, cache=None):
+    # the whole time-expanded model on any backend; integer makes whole units of every item
+    n, periods = instance.number_of_items(), instance.number_of_periods()
+    A, b, c, ubs = planning_arrays(instance)
+    vtypes = np.tile(np.array([INTEGER if integer else CONTINUOUS] * n + [CONTINUOUS] * n), periods)
+    builder = (make_builder(backend)
+               .add_variables(2 * n * periods, names=planning_names(n, periods), ubs=ubs, vtypes=vtypes)
+               .set_constraints_matrix(A, b)
+               .add_constraints(name="planning")
+               .set_objective(c, MAXIMIZE))
+    if cache is not None:
+        builder = builder.set_cache(cache)
+    return builder.build()
+
+
+def plan_arrays(values, instance):
+    # (make, stock, sales), each (T, N), from the solution values of build_planning_solver
+    n, periods = instance.number_of_items(), instance.number_of_periods()
+    values = np.asarray(values, dtype=float).reshape(periods, 2, n)
+    make, stock = values[:, 0], values[:, 1]
+    carried = np.vstack([instance.initial_stock.reshape(1, -1), stock[:-1]])
+    return make, stock, np.maximum(carried + make - stock, 0.0)
+
+
+def start_values(make, stock, instance):
+    # a feasible start for a window from the plan of the window before: its plan for the periods both
+    # windows share, then nothing made and stock sold while it lasts
+    n, periods = instance.number_of_items(), instance.number_of_periods()
+    values = np.zeros((periods, 2, n))
+    shared = min(len(make), periods)
+    values[:shared, 0] = make[:shared]
+    values[:shared, 1] = stock[:shared]
+    level = stock[shared - 1] if shared else instance.initial_stock
+    for t in range(shared, periods):
+        level = np.maximum(level - instance.demand[t], 0.0)
+        values[t, 1] = level
+    return values.reshape(-1)
+
+
+class PlanResult:
+    # a plan over every period: quantities made, stock at the end of each period and sales, each (T, N)
+    def __init__(self, status, make, stock, sales, names, backend, windows=1, build_time=0.0, solve_time=0.0,
+                 periods_planned=None):
+        self.status = status
+        self.make = make
+        self.stock = stock
+        self.sales = sales
+        self.names = names
+        self.backend = backend
+        self.windows = windows
+        self.build_time = build_time
+        self.solve_time = solve_time
+        # periods with a plan, fewer than all of them when a window failed or the solve was cancelled
+        self.periods_planned = len(make) if periods_planned is None else periods_planned
+
+    def has_solution(self):
+        return self.periods_planned > 0
+
+    def profit(self, instance):
+        # revenue of the sales minus making and holding costs, per period
+        return (self.sales @ instance.items[:, PRICE] - self.make @ instance.unit_costs()
+                - self.stock @ instance.holding_costs)
+
+    def to_dict(self, instance=None):
+        record = {
+            "status": self.status,
+            "backend": self.backend,
+            "windows": self.windows,
+            "periods_planned": self.periods_planned,
+            "build_time": self.build_time,
+            "solve_time": self.solve_time,
+            "names": list(self.names),
+            "make": self.make[:self.periods_planned].tolist(),
+            "stock": self.stock[:self.periods_planned].tolist(),
+            "sales": self.sales[:self.periods_planned].tolist(),
+        }
+        if instance is not None:
+            profit = self.profit(instance)[:self.periods_planned]
+            record["profit"] = float(profit.sum())
+            record["profit_per_period"] = profit.tolist()
+        return record
+
+
+def empty_plan(instance):
+    shape = (instance.number_of_periods(), instance.number_of_items())
+    return np.zeros(shape), np.zeros(shape), np.zeros(shape)
+
+
+def solve_plan(instance, backend=None, integer=False, time_limit=None, cancel_event=None):
+    # every period in one model
+    backend = backend or SolverBackend.DEFAULT_BACKEND
+    make, stock, sales = empty_plan(instance)
+    start = time.perf_counter()
+    with build_planning_solver(instance, backend, integer) as solver:
+        build_time = time.perf_counter() - start
+        if time_limit is not None:
+            limit_time(solver, time_limit)
+        solver.solve(cancel_event)
+        result = solver.get_result()
+    planned = 0
+    if result.has_solution() and result.status in (SolverBackend.OPTIMAL, SolverBackend.LIMIT_REACHED):
+        make, stock, sales = plan_arrays(result.values, instance)
+        planned = instance.number_of_periods()
+    return PlanResult(result.status, make, stock, sales, item_names(instance.number_of_items()), backend, 1, build_time,
+                      result.solve_time, planned)
+
+
+def rolling_horizon(instance, window=WINDOW, commit=COMMIT, backend=None, integer=False, time_limit=None,
+                    cancel_event=None, report=None):
+    # solves periods start..start+window-1, keeps the plan of the first commit periods and moves on by
+    # commit periods, starting the next window from the stock the kept plan leaves. Each window is a
+    # model of window periods, so memory and time per window don't grow with the horizon; the periods
+    # after the kept ones only look ahead, a window that ends early would run its stock down. Every
+    # window starts from the plan of the one before (a MIP start for integer plans); time_limit is per window.
+    # report(window number, first period, end period, status) is called after every window.
+    if not 0 < commit <= window:
+        raise ValueError(f"commit must be between 1 and window ({window}), got {commit}")
+    backend = backend or SolverBackend.DEFAULT_BACKEND
+    periods = instance.number_of_periods()
+    make, stock, sales = empty_plan(instance)
+    level = instance.initial_stock
+    build_time = solve_time = 0.0
+    status = SolverBackend.OPTIMAL
+    previous = None
+    first = windows = 0
+    while first < periods:
+        if cancel_event is not None and cancel_event.is_set():
+            status = SolverBackend.INTERRUPTED
+            break
+        end = min(first + window, periods)
+        part = instance.window(first, end, level)
+        with phase("planning_window", backend=backend, first=first, end=end) as fields:
+            start = time.perf_counter()
+            with build_planning_solver(part, backend, integer) as solver:
+                build_time += time.perf_counter() - start
+                if time_limit is not None:
+                    limit_time(solver, time_limit)
+                if previous is not None:
+                    solver.set_start(start_values(*previous, part))
+                solver.solve(cancel_event)
+                result = solver.get_result()
+            solve_time += result.solve_time
+            fields["status"] = result.status
+        windows += 1
+        if report is not None:
+            report(windows, first, end, result.status)
+        if not result.has_solution() or result.status not in (SolverBackend.OPTIMAL, SolverBackend.LIMIT_REACHED):
+            status = result.status
+            break
+        if result.status != SolverBackend.OPTIMAL:
+            status = result.status
+        part_make, part_stock, part_sales = plan_arrays(result.values, part)
+        # the last window keeps all of its periods
+        kept = end - first if end == periods else commit
+        make[first:first + kept] = part_make[:kept]
+        stock[first:first + kept] = part_stock[:kept]
+        sales[first:first + kept] = part_sales[:kept]
+        level = part_stock[kept - 1]
+        previous = (part_make[kept:], part_stock[kept:])
+        first += kept
+    emit("rolling_horizon", backend=backend, periods=periods, items=instance.number_of_items(), windows=windows,
+         status=status, build_seconds=build_time, solve_seconds=solve_time)
+    return PlanResult(status, make, stock, sales, item_names(instance.number_of_items()), backend, windows, build_time, solve_time,
+                      first)
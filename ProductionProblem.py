@@ -0,0 +1,41 @@
+import numpy as np
+import scipy.sparse as sp
+
+from SolverBackend import MAXIMIZE, make_builder
+
+# columns of an item row
+HOURS, MACHINE_HOURS, RAW_MATERIALS, PRICE, DEMAND = range(5)
+# resource rows of the model, in the order of the capacities
+RESOURCE_NAMES = ["manual_hours", "machine_hours", "raw_materials"]
+
+
+def item_names(number_of_items):
+    return [f"Item_{i+1}" for i in range(number_of_items)]
+
+
+def production_arrays(items, salary, raw_material_cost, capacities):
+    # items is an (N, 5) array of [hours, machine hours, raw materials, price, demand] rows;
+    # returns A (resources x items), b (capacities), c (benefit per item) and the demand upper bounds
+    items = np.asarray(items, dtype=float).reshape(-1, 5)
+    A = sp.csr_matrix(items[:, :len(RESOURCE_NAMES)].T)
+    benefits = items[:, PRICE] - items[:, RAW_MATERIALS] * raw_material_cost - items[:, HOURS] * salary
+    return A, np.asarray(capacities, dtype=float), benefits, items[:, DEMAND]
+
+
+def build_production_solver(items, salary, raw_material_cost, capacities, backend=None, cache=None):
+    # one-off production LP on any backend: max benefits x  s.t.  A x <= capacities,  0 <= x <= demand
+    return build_resource_lp(*production_arrays(items, salary, raw_material_cost, capacities), backend=backend,
+                             cache=cache)
+
+
+def build_resource_lp(A, b, benefits, demand, backend=None, cache=None):
+    # the production LP for any number of resources (rows of A)
+    builder = make_builder(backend)
+    builder = (builder
+               .add_variables(len(benefits), names=item_names(len(benefits)), ubs=demand)
+               .set_constraints_matrix(A, b)
+               .add_constraints(name="my_constraints")
+               .set_objective(benefits, MAXIMIZE))
+    if cache is not None:
+        builder = builder.set_cache(cache)
+    return builder.build()
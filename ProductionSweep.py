@@ -0,0 +1,177 @@
+import time
+import numpy as np
+
+import SolverBackend
+from ProductionProblem import RESOURCE_NAMES, build_production_solver, item_names, production_arrays
+from SolverBackend import DEFAULT_BACKEND
+
+# inputs a sweep can vary: the two costs (objective) and each resource capacity (right-hand side)
+OBJECTIVE_PARAMETERS = ("salary", "raw_material_cost")
+SWEEP_PARAMETERS = OBJECTIVE_PARAMETERS + tuple(RESOURCE_NAMES)
+# one Gurobi model with a scenario per value, a warm-started re-solve per value, or independent builds
+SWEEP_METHODS = ("scenarios", "sequential", "independent")
+
+
+class SweepResult:
+    # objective and plan (quantity of every item) for each value of the swept parameter
+    def __init__(self, parameter, values, objective_values, plans, statuses, names, method, solve_time):
+        self.parameter = parameter
+        self.values = values
+        self.objective_values = objective_values
+        # plans[k] is the plan for values[k], NaN where that point has no solution
+        self.plans = plans
+        self.statuses = statuses
+        self.names = names
+        self.method = method
+        self.solve_time = solve_time
+
+    def to_dict(self):
+        return {
+            "parameter": self.parameter,
+            "values": self.values.tolist(),
+            "objective_values": self.objective_values.tolist(),
+            "plans": self.plans.tolist(),
+            "statuses": list(self.statuses),
+            "names": list(self.names),
+            "method": self.method,
+            "solve_time": self.solve_time,
+        }
+
+
+def sweep_values(start, stop, steps):
+    return np.linspace(start, stop, steps)
+
+
+def point_inputs(parameter, value, salary, raw_material_cost, capacities):
+    # the (salary, raw material cost, capacities) of one sweep point
+    capacities = np.array(capacities, dtype=float)
+    if parameter == "salary":
+        return value, raw_material_cost, capacities
+    if parameter == "raw_material_cost":
+        return salary, value, capacities
+    capacities[RESOURCE_NAMES.index(parameter)] = value
+    return salary, raw_material_cost, capacities
+
+
+def what_if(sensitivity, items, salary, raw_material_cost, capacities, parameter, value):
+    # profit with one input changed, read off the sensitivity report of the solved inputs without
+    # re-solving; None when the change leaves the range where that report holds
+    if parameter not in SWEEP_PARAMETERS:
+        raise ValueError(f"unknown parameter {parameter!r}, expected one of {', '.join(SWEEP_PARAMETERS)}")
+    point_salary, point_cost, point_capacities = point_inputs(parameter, value, salary, raw_material_cost,
+                                                              capacities)
+    if parameter in OBJECTIVE_PARAMETERS:
+        benefits = production_arrays(items, point_salary, point_cost, point_capacities)[2]
+        return sensitivity.objective_what_if(benefits)
+    row = RESOURCE_NAMES.index(parameter)
+    return sensitivity.rhs_what_if(row, point_capacities[row])
+
+
+def sweep_production(items, salary, raw_material_cost, capacities, parameter, values, method=None, backend=None,
+                     cancel_event=None):
+    # solve the production LP once per value of parameter, every other input as given
+    if parameter not in SWEEP_PARAMETERS:
+        raise ValueError(f"unknown sweep parameter {parameter!r}, expected one of {', '.join(SWEEP_PARAMETERS)}")
+    backend = backend or DEFAULT_BACKEND
+    method = method or ("scenarios" if backend == "gurobi" else "independent")
+    if method not in SWEEP_METHODS:
+        raise ValueError(f"unknown sweep method {method!r}, expected one of {', '.join(SWEEP_METHODS)}")
+    if backend != "gurobi" and method != "independent":
+        raise ValueError(f"the {method} sweep needs the gurobi backend")
+    items = np.asarray(items, dtype=float).reshape(-1, 5)
+    values = np.asarray(values, dtype=float)
+    start = time.perf_counter()
+    objective_values = np.full(len(values), np.nan)
+    plans = np.full((len(values), len(items)), np.nan)
+    statuses = [SolverBackend.NOT_SOLVED] * len(values)
+    sweep = {"scenarios": sweep_scenarios, "sequential": sweep_sequential, "independent": sweep_independent}[method]
+    sweep(items, salary, raw_material_cost, capacities, parameter, values, objective_values, plans, statuses,
+          backend, cancel_event)
+    return SweepResult(parameter, values, objective_values, plans, statuses, item_names(len(items)), method,
+                       time.perf_counter() - start)
+
+
+def live_model(items, salary, raw_material_cost, capacities):
+    from ProductionModel import ProductionModel
+    model = ProductionModel()
+    model.sync(list(range(len(items))), items, salary, raw_material_cost, capacities)
+    model.model.Params.OutputFlag = 0
+    return model
+
+
+def sweep_scenarios(items, salary, raw_material_cost, capacities, parameter, values, objective_values, plans,
+                    statuses, backend, cancel_event):
+    # one multi-scenario model: scenario k changes the objective (ScenNObj) or one capacity (ScenNRHS)
+    with live_model(items, salary, raw_material_cost, capacities) as production:
+        solve_scenarios(production, items, salary, raw_material_cost, capacities, parameter, values,
+                        objective_values, plans, statuses, cancel_event)
+
+
+def solve_scenarios(production, items, salary, raw_material_cost, capacities, parameter, values, objective_values,
+                    plans, statuses, cancel_event):
+    from GurobiSolver import gurobi_status, optimize
+    model = production.model
+    model.NumScenarios = len(values)
+    for k, value in enumerate(values):
+        model.Params.ScenarioNumber = k
+        if parameter in OBJECTIVE_PARAMETERS:
+            point_salary, point_cost, _ = point_inputs(parameter, value, salary, raw_material_cost, capacities)
+            benefits = production_arrays(items, point_salary, point_cost, capacities)[2]
+            if production.variables:
+                model.setAttr("ScenNObj", production.variables, benefits.tolist())
+        else:
+            production.resources[RESOURCE_NAMES.index(parameter)].ScenNRHS = value
+    # solved as one model, like a MIP, so there is no basis to keep: no ProductionModel.solve, but the
+    # same timed, reported and cancellable optimize
+    optimize(model, cancel_event)
+    if gurobi_status(model.status) != SolverBackend.OPTIMAL:
+        statuses[:] = [gurobi_status(model.status)] * len(values)
+        return
+    for k in range(len(values)):
+        model.Params.ScenarioNumber = k
+        objective = model.ScenNObjVal
+        if abs(objective) >= SolverBackend.INFINITY:
+            statuses[k] = SolverBackend.INFEASIBLE
+            continue
+        statuses[k] = SolverBackend.OPTIMAL
+        objective_values[k] = objective
+        if production.variables:
+            plans[k] = model.getAttr("ScenNX", production.variables)
+
+
+def sweep_sequential(items, salary, raw_material_cost, capacities, parameter, values, objective_values, plans,
+                     statuses, backend, cancel_event):
+    # one live LP, edited in place between points: each solve starts from the previous optimal basis
+    with live_model(items, salary, raw_material_cost, capacities) as production:
+        for k, value in enumerate(values):
+            point_salary, point_cost, point_capacities = point_inputs(parameter, value, salary, raw_material_cost,
+                                                                      capacities)
+            production.set_salary(point_salary)
+            production.set_raw_material_cost(point_cost)
+            production.set_capacities(point_capacities)
+            record_point(production.solve(cancel_event), k, objective_values, plans, statuses)
+            if statuses[k] == SolverBackend.INTERRUPTED:
+                return
+
+
+def sweep_independent(items, salary, raw_material_cost, capacities, parameter, values, objective_values, plans,
+                      statuses, backend, cancel_event):
+    # a fresh model per point, on any backend
+    for k, value in enumerate(values):
+        point_salary, point_cost, point_capacities = point_inputs(parameter, value, salary, raw_material_cost,
+                                                                  capacities)
+        solver = build_production_solver(items, point_salary, point_cost, point_capacities, backend=backend)
+        with solver:
+            if backend == "gurobi":
+                solver.model.Params.OutputFlag = 0
+            solver.solve(cancel_event)
+            record_point(solver.get_result(), k, objective_values, plans, statuses)
+        if statuses[k] == SolverBackend.INTERRUPTED:
+            return
+
+
+def record_point(result, k, objective_values, plans, statuses):
+    statuses[k] = result.status
+    if result.status == SolverBackend.OPTIMAL:
+        objective_values[k] = result.objective_value
+        plans[k] = result.values
@@ -0,0 +1,327 @@
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+import SolverBackend
+from Presolve import INFINITE_BOUND, presolve_rows
+from SolutionCache import CachedSolution, CachedSolver, instance_key
+from Telemetry import emit, phase
+from SolverBackend import (BINARY, CONTINUOUS, EQUAL, FINAL_STATUSES, GREATER_EQUAL, INFINITY, LESS_EQUAL, MAXIMIZE,
+                           SolveResult, as_csr, as_vector, name_index, single_solution_pool)
+
+# scipy.optimize (HiGHS) status codes mapped onto the normalized SolverBackend statuses
+SCIPY_STATUSES = {
+    0: SolverBackend.OPTIMAL,
+    1: SolverBackend.LIMIT_REACHED,
+    2: SolverBackend.INFEASIBLE,
+    3: SolverBackend.UNBOUNDED,
+}
+
+# objectives after the first may degrade by this much, like Gurobi's default ObjNAbsTol
+OBJECTIVE_ABS_TOLERANCE = 1e-6
+
+
+def scipy_status(code):
+    return SCIPY_STATUSES.get(code, SolverBackend.ERROR)
+
+
+class ScipySolverBuilder:
+    # same builder API as GurobiSolverBuilder for matrix data, solved with HiGHS through scipy.optimize;
+    # needs no license, so it also runs instances above the size-limited Gurobi license
+    def __init__(self):
+        self.created_at = time.perf_counter()
+        self.variable_names = []
+        self.variable_lbs = []
+        self.variable_ubs = []
+        self.variable_vtypes = []
+        self.constraints_A = None
+        self.constraints_RHS = np.zeros(0)
+        self.extra_constraints = []
+        self.objectives = []
+        self.presolve = True
+        self.cache = None
+        self.time_limit = None
+
+    def number_of_variables(self):
+        return len(self.variable_names)
+
+    def add_variable(self, name, lb=0, ub=INFINITY, vtype=CONTINUOUS):
+        return self.add_variables(1, names=[name], lbs=[lb], ubs=[ub], vtypes=[vtype])
+
+    def add_variables(self, number_of_variables, names=None, lbs=None, ubs=None, vtypes=None):
+        if names is None:
+            names = [("x " + str(i)) for i in range(number_of_variables)]
+        self.variable_names.extend(names)
+        self.variable_lbs.append(as_vector(lbs, number_of_variables, 0.0))
+        self.variable_ubs.append(as_vector(ubs, number_of_variables, INFINITY))
+        self.variable_vtypes.append(as_vector(vtypes, number_of_variables, CONTINUOUS, dtype='U1'))
+        return self
+
+    def set_objective(self, coeffs, senses):
+        self.objectives.append((as_vector(coeffs, self.number_of_variables()), senses))
+        return self
+
+    def set_objectives(self, objectives):
+        self.objectives = objectives
+        return self
+
+    def set_constraints_LHS(self, LHS):
+        # LHS[i][j] is the coefficient of variable i in constraint j (one row per variable)
+        self.constraints_A = as_csr(LHS).T.tocsr()
+        return self
+
+    def set_constraints_matrix(self, A, RHS=None):
+        self.constraints_A = as_csr(A)
+        if RHS is not None:
+            self.set_constraints_RHS(RHS)
+        return self
+
+    def set_constraints_RHS(self, RHS):
+        self.constraints_RHS = as_vector(RHS, 0)
+        return self
+
+    def add_constraint_rows(self, A, RHS):
+        self.extra_constraints.append((as_csr(A), as_vector(RHS, 0)))
+        return self
+
+    def add_constraint(self, expr, sense, rhs, name=""):
+        # one row given by its coefficients over the variables (HiGHS takes no expressions), appended
+        # after the constraint matrix like add_constraint_rows; an equality is a <= and a >= row.
+        # Rows have no names in SciPy, name is ignored
+        try:
+            row = as_csr(expr)
+        except (TypeError, ValueError):
+            raise TypeError(f"the HiGHS backend takes a constraint as its coefficients over the variables, "
+                            f"not {type(expr).__name__}") from None
+        if row.shape[0] != 1:
+            raise ValueError(f"expected one row of coefficients, got {row.shape[0]}")
+        if sense == LESS_EQUAL:
+            return self.add_constraint_rows(row, [rhs])
+        if sense == GREATER_EQUAL:
+            return self.add_constraint_rows(-row, [-rhs])
+        if sense == EQUAL:
+            return self.add_constraint_rows(sp.vstack([row, -row]), [rhs, -rhs])
+        raise ValueError(f"unknown constraint sense {sense!r}, expected '<', '>' or '='")
+
+    def add_constraints(self, name="constraints"):
+        return self
+
+    def set_presolve(self, presolve):
+        self.presolve = presolve
+        return self
+
+    def set_cache(self, cache):
+        self.cache = cache
+        return self
+
+    def set_time_limit(self, seconds):
+        self.time_limit = seconds
+        return self
+
+    def constraints_matrix(self):
+        n = self.number_of_variables()
+        blocks = [(self.constraints_A, self.constraints_RHS)] if self.constraints_A is not None else []
+        blocks += self.extra_constraints
+        if not blocks:
+            return sp.csr_matrix((0, n)), np.zeros(0)
+        for A, b in blocks:
+            if A.shape[0] != len(b):
+                raise ValueError(f"constraint matrix has {A.shape[0]} rows but {len(b)} right-hand sides")
+            if A.shape[1] != n:
+                raise ValueError(f"constraint matrix has {A.shape[1]} columns but {n} variables")
+        return sp.vstack([A for A, _ in blocks], format='csr'), np.concatenate([b for _, b in blocks])
+
+    def build(self):
+        n = self.number_of_variables()
+        A, b = self.constraints_matrix()
+        lbs = np.concatenate(self.variable_lbs) if n else np.zeros(0)
+        ubs = np.concatenate(self.variable_ubs) if n else np.zeros(0)
+        vtypes = np.concatenate(self.variable_vtypes) if n else np.zeros(0, dtype='U1')
+        objectives = [(as_vector(coeffs, n), senses) for coeffs, senses in self.objectives]
+        cache_key = None
+        if self.cache is not None and n:
+            cache_key = instance_key(A, b, objectives, lbs, ubs, vtypes, self.variable_names, backend="highs")
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                emit("build", backend="highs", variables=n, cached=True, seconds=time.perf_counter() - self.created_at)
+                return CachedSolver(cached, time.perf_counter() - self.created_at)
+        solver = ScipySolver(A, b, objectives, lbs, ubs, vtypes, list(self.variable_names), self.presolve, self.time_limit)
+        solver.cache = self.cache
+        solver.cache_key = cache_key
+        solver.build_time = time.perf_counter() - self.created_at
+        emit("build", backend="highs", variables=n, constraints=A.shape[0], objectives=len(objectives), cached=False,
+             seconds=solver.build_time)
+        return solver
+
+
+class ScipySolver:
+    def __init__(self, A, b, objectives, lbs, ubs, vtypes, names, presolve=True, time_limit=None):
+        self.A = A
+        self.b = b
+        self.objectives = objectives
+        self.lbs = lbs
+        self.ubs = ubs
+        self.vtypes = vtypes
+        self.names = names
+        self.name_index = None
+        self.presolve = presolve
+        self.time_limit = time_limit
+        self.presolve_info = None
+        self.cache = None
+        self.cache_key = None
+        self.status = SolverBackend.NOT_SOLVED
+        self.raw_status = None
+        self.values = None
+        self.duals = None
+        self.build_time = 0.0
+        # seconds spent in presolve_rows, part of solve_time
+        self.presolve_time = 0.0
+        self.solve_time = 0.0
+
+    def solve(self, cancel_event=None):
+        # HiGHS can't be stopped mid-solve from Python, cancel_event is checked between objectives.
+        # time_limit covers the whole solve: each objective gets what the ones before it left over.
+        start = time.perf_counter()
+        A, b, lbs, ubs = self.A, self.b, self.lbs, self.ubs
+        if self.presolve and A.shape[0] > 0:
+            self.presolve_info = presolve_rows(A, b, lbs, ubs, self.vtypes != CONTINUOUS)
+            self.presolve_time = time.perf_counter() - start
+            A, b = self.presolve_info.reduced_A, self.presolve_info.reduced_b
+            lbs, ubs = self.presolve_info.lbs, self.presolve_info.ubs
+        lbs = np.where(lbs <= -INFINITE_BOUND, -np.inf, lbs)
+        ubs = np.where(ubs >= INFINITE_BOUND, np.inf, ubs)
+        binary = self.vtypes == BINARY
+        lbs[binary] = np.maximum(lbs[binary], 0.0)
+        ubs[binary] = np.minimum(ubs[binary], 1.0)
+        integrality = (self.vtypes != CONTINUOUS).astype(np.uint8)
+
+        objectives = self.objectives or [(np.zeros(len(self.names)), MAXIMIZE)]
+        # like Gurobi: every objective uses the sense of the first one, and objective i has priority i,
+        # so the last objective is optimized first and each later stage may not degrade the earlier ones
+        sense = objectives[0][1]
+        stages = [sense * np.asarray(coeffs, dtype=float) for coeffs, _ in reversed(objectives)]
+        x = None
+        for stage, c in enumerate(stages):
+            if cancel_event is not None and cancel_event.is_set():
+                self.status = SolverBackend.INTERRUPTED
+                break
+            time_left = None
+            if self.time_limit is not None:
+                time_left = self.time_limit - (time.perf_counter() - start)
+                if time_left <= 0:
+                    self.status = SolverBackend.LIMIT_REACHED
+                    break
+            if stage > 0:
+                # fix the previous stage's optimum (within tolerance) before optimizing the next objective
+                A = sp.vstack([A, sp.csr_matrix(stages[stage - 1].reshape(1, -1))], format='csr')
+                b = np.append(b, previous + OBJECTIVE_ABS_TOLERANCE)
+            result = self.run_highs(c, A, b, lbs, ubs, integrality, time_left, last=stage == len(stages) - 1)
+            self.raw_status = result.status
+            self.status = scipy_status(result.status)
+            if result.x is not None:
+                # a stopped MIP still returns its incumbent, which also satisfies the earlier stages
+                x = result.x
+            if self.status != SolverBackend.OPTIMAL:
+                break
+            previous = result.fun
+        # like Gurobi's SolCount > 0: a limited solve keeps the best solution found, of this stage or
+        # of the stage before it
+        self.values = x if self.status in (SolverBackend.OPTIMAL, SolverBackend.LIMIT_REACHED) else None
+        self.solve_time = time.perf_counter() - start
+        emit("optimize", backend="highs", status=self.status, stages=len(stages), variables=len(self.names),
+             constraints=self.A.shape[0], nonzeros=self.A.nnz, presolve_seconds=self.presolve_time,
+             seconds=self.solve_time)
+        if self.cache is not None and self.cache_key is not None and self.status in FINAL_STATUSES:
+            objective_value = self.get_objective_value() if self.values is not None else None
+            self.cache.put(self.cache_key, CachedSolution(self.status, objective_value, self.values, self.names, "highs"))
+
+    def run_highs(self, c, A, b, lbs, ubs, integrality, time_limit, last):
+        options = {} if time_limit is None else {"time_limit": time_limit}
+        if not integrality.any() and len(self.objectives) <= 1 and last:
+            # pure LP: linprog also reports the duals
+            result = linprog(c, A_ub=A if A.shape[0] else None, b_ub=b if A.shape[0] else None,
+                             bounds=np.column_stack([lbs, ubs]), method="highs", options=options)
+            if result.status == 0 and A.shape[0]:
+                # scipy minimizes sense * c, Gurobi's Pi is the derivative of the objective itself
+                self.duals = self.objectives[0][1] * result.ineqlin.marginals if self.objectives else result.ineqlin.marginals
+            return result
+        constraints = [LinearConstraint(A, -np.inf, b)] if A.shape[0] else []
+        return milp(c, integrality=integrality, bounds=Bounds(lbs, ubs), constraints=constraints, options=options)
+
+    def get_solution_status(self):
+        return self.raw_status
+
+    def get_status(self):
+        return self.status
+
+    def has_solution(self):
+        return self.values is not None
+
+    def get_values(self):
+        return self.values
+
+    def set_solution_pool(self, size, search_mode=2, gap=None, report=None):
+        # no pool through SciPy: get_pool returns the one solution, and report is never called
+        pass
+
+    def get_pool(self):
+        return single_solution_pool(self)
+
+    def dispose(self):
+        # nothing native to free, the arrays go with the solver
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
+        return False
+
+    def set_start(self, values):
+        # SciPy's HiGHS interface takes no MIP start, every solve starts from scratch
+        pass
+
+    def index_of(self, name):
+        if self.name_index is None:
+            self.name_index = name_index(self.names)
+        return self.name_index[name]
+
+    def get_variable(self, name):
+        return self.values[self.index_of(name)]
+
+    def get_variables(self):
+        return dict(zip(self.names, self.values.tolist()))
+
+    def get_objective_value(self):
+        # value of the first objective, as Gurobi's ObjVal
+        if self.values is None:
+            raise AttributeError("no solution available")
+        if not self.objectives:
+            return 0.0
+        return float(np.dot(self.objectives[0][0], self.values))
+
+    def get_constraint_slacks(self):
+        if self.presolve_info is not None:
+            return self.presolve_info.original_slacks(self.values)
+        A = self.A
+        if self.A.shape[0] == 0:
+            return np.zeros(0)
+        return self.b - A @ self.values
+
+    def get_constraint_duals(self):
+        # shadow prices of the original rows, same sign convention as Gurobi's Pi (LP models only)
+        if self.duals is None:
+            raise AttributeError("duals are only available for solved single-objective LP models")
+        if self.presolve_info is None:
+            return self.duals
+        c = self.objectives[0][0]
+        reduced_costs = c - self.presolve_info.reduced_A.T @ self.duals
+        return self.presolve_info.original_duals(self.duals, reduced_costs, self.values)
+
+    def get_result(self):
+        with phase("extract", backend="highs", variables=len(self.names)):
+            objective_value = self.get_objective_value() if self.values is not None else None
+            return SolveResult(self.status, objective_value, self.values, self.names, "highs",
+                               self.build_time, self.solve_time, self.raw_status)
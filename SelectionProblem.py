@@ -0,0 +1,84 @@
+import numpy as np
+import scipy.sparse as sp
+
+from SolverBackend import BINARY, MAXIMIZE, OPTIMAL, make_builder
+
+# alternative lists searched for by default, and their largest relative salary gap to the cheapest list
+ALTERNATIVES = 5
+ALTERNATIVES_GAP = 0.2
+
+
+def guest_names(number_of_celebrities):
+    return [f'x_{i}' for i in range(number_of_celebrities)]
+
+
+def selection_objectives(salaries, popularities):
+    # popularity, then salary, then head count; objective i gets priority i in the solver
+    return [
+        (np.asarray(popularities, dtype=float), MAXIMIZE),
+        (-np.asarray(salaries, dtype=float), MAXIMIZE),
+        (np.ones(len(salaries)), MAXIMIZE),
+    ]
+
+
+def clique_rows(cliques, number_of_celebrities):
+    # at most one celebrity of each clique of mutually conflicting celebrities: sum(x[clique]) <= 1
+    rows = np.repeat(np.arange(len(cliques)), [len(clique) for clique in cliques])
+    columns = np.fromiter((i for clique in cliques for i in clique), dtype=int, count=len(rows))
+    matrix = sp.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(cliques), number_of_celebrities))
+    return matrix, np.ones(len(cliques))
+
+
+def build_selection_solver(salaries, masses, popularities, vips, ship_weight, budget, min_vip_count, cliques,
+                           backend=None, cache=None, objectives=None, min_head_count=None):
+    # guest selection MIP on any backend; cliques are lists of celebrity indices that exclude each
+    # other (ConflictGraph.clique_cover(), or single pairs). objectives defaults to selection_objectives;
+    # min_head_count adds sum(x) >= min_head_count.
+    salaries = np.asarray(salaries, dtype=float)
+    masses = np.asarray(masses, dtype=float)
+    vips = np.asarray(vips, dtype=bool)
+    n = len(salaries)
+
+    # mass and salary budgets, and at least one VIP: -sum(x_vip) <= -1
+    constraints_LHS = np.column_stack([masses, salaries, -vips.astype(float)])
+    constraints_RHS = [ship_weight, budget, -1]
+
+    # at least min_vip_count VIP celebrities: -sum(x_vip) <= -min_vip_count
+    vip_indices = np.flatnonzero(vips)
+    vip_row = sp.csr_matrix((-np.ones(len(vip_indices)), (np.zeros(len(vip_indices), dtype=int), vip_indices)), shape=(1, n))
+    conflict_matrix, conflict_RHS = clique_rows(cliques, n)
+
+    builder = make_builder(backend)
+    builder = (builder
+               .add_variables(n, names=guest_names(n), vtypes=[BINARY] * n)
+               .set_objectives(selection_objectives(salaries, popularities) if objectives is None else objectives)
+               .set_constraints_LHS(constraints_LHS).set_constraints_RHS(constraints_RHS)
+               .add_constraint_rows(vip_row, [-min_vip_count])
+               .add_constraint_rows(conflict_matrix, conflict_RHS))
+    if min_head_count is not None:
+        builder = builder.add_constraint_rows(sp.csr_matrix(-np.ones((1, n))), [-min_head_count])
+    if cache is not None:
+        builder = builder.set_cache(cache)
+    return builder.build()
+
+
+def alternative_lists(salaries, masses, popularities, vips, ship_weight, budget, min_vip_count, cliques,
+                      count=ALTERNATIVES, gap=ALTERNATIVES_GAP, backend=None, cancel_event=None, report=None):
+    # the count best guest lists in the order of selection_objectives, as (result of the usual solve, pool).
+    # The usual solve gives the largest head count; the solution pool then holds the count cheapest lists
+    # with that head count (objective: minus the total salary), so their gaps are relative salary gaps.
+    # report(PoolSolution) is called for every list the pool search finds, on Gurobi only.
+    with build_selection_solver(salaries, masses, popularities, vips, ship_weight, budget, min_vip_count, cliques,
+                                backend=backend) as result_solver:
+        result_solver.solve(cancel_event)
+        result = result_solver.get_result()
+    if result.status != OPTIMAL:
+        return result, []
+    head_count = int(round(float(np.sum(result.values))))
+    with build_selection_solver(salaries, masses, popularities, vips, ship_weight, budget, min_vip_count, cliques,
+                                backend=backend, objectives=[(-np.asarray(salaries, dtype=float), MAXIMIZE)],
+                                min_head_count=head_count) as solver:
+        solver.set_solution_pool(count, gap=gap, report=report)
+        solver.set_start(result.values)
+        solver.solve(cancel_event)
+        return result, solver.get_pool()
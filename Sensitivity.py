@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class Sensitivity:
+    # LP sensitivity report of an optimal solution of  max/min c x  s.t.  A x <= b:
+    # shadow prices (Pi) and right-hand side ranges (SARHSLow/Up) per row, reduced costs (RC) and
+    # objective coefficient ranges (SAObjLow/Up) per variable. Ranges are NaN where the solver gave none.
+    def __init__(self, objective_value, x, c, b, pi, slack, rhs_low, rhs_up, rc, obj_low, obj_up, names, row_names):
+        self.objective_value = objective_value
+        self.x = np.asarray(x, dtype=float)
+        self.c = np.asarray(c, dtype=float)
+        self.b = np.asarray(b, dtype=float)
+        self.pi = np.asarray(pi, dtype=float)
+        self.slack = np.asarray(slack, dtype=float)
+        self.rhs_low = np.asarray(rhs_low, dtype=float)
+        self.rhs_up = np.asarray(rhs_up, dtype=float)
+        self.rc = np.asarray(rc, dtype=float)
+        self.obj_low = np.asarray(obj_low, dtype=float)
+        self.obj_up = np.asarray(obj_up, dtype=float)
+        self.names = names
+        self.row_names = row_names
+
+    def rhs_what_if(self, row, rhs):
+        # objective value after moving one right-hand side, without re-solving; None when rhs leaves
+        # the range where the current basis (and so the shadow price) stays valid
+        if not self.rhs_low[row] <= rhs <= self.rhs_up[row]:
+            return None
+        return self.objective_value + self.pi[row] * (rhs - self.b[row])
+
+    def objective_what_if(self, c):
+        # objective value after changing any number of objective coefficients, without re-solving.
+        # The plan stays optimal when the changes use at most 100% of their allowed ranges in total
+        # (the 100% rule); None when that can't be guaranteed.
+        c = np.asarray(c, dtype=float)
+        delta = c - self.c
+        changed = delta != 0
+        if not changed.any():
+            return self.objective_value
+        allowed = np.where(delta > 0, self.obj_up - self.c, self.c - self.obj_low)[changed]
+        if np.isnan(allowed).any():
+            return None
+        with np.errstate(divide="ignore"):
+            used = np.where(np.isinf(allowed), 0.0, np.abs(delta[changed]) / allowed)
+        if used.sum() > 1.0:
+            return None
+        return float(c @ self.x)
+
+    def to_dict(self):
+        return {
+            "objective_value": self.objective_value,
+            "x": self.x.tolist(),
+            "c": self.c.tolist(),
+            "b": self.b.tolist(),
+            "pi": self.pi.tolist(),
+            "slack": self.slack.tolist(),
+            "rhs_low": self.rhs_low.tolist(),
+            "rhs_up": self.rhs_up.tolist(),
+            "rc": self.rc.tolist(),
+            "obj_low": self.obj_low.tolist(),
+            "obj_up": self.obj_up.tolist(),
+            "names": list(self.names),
+            "row_names": list(self.row_names),
+        }
+
+
+def sensitivity_from_dict(record):
+    # the inverse of Sensitivity.to_dict
+    return Sensitivity(record["objective_value"], record["x"], record["c"], record["b"], record["pi"], record["slack"],
+                       record["rhs_low"], record["rhs_up"], record["rc"], record["obj_low"], record["obj_up"],
+                       record["names"], record["row_names"])
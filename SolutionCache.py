@@ -0,0 +1,177 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse as sp
+
+from SolverBackend import SolveResult, name_index, single_solution_pool
+
+
+def _update_array(digest, array, dtype=float):
+    array = np.ascontiguousarray(array, dtype=dtype)
+    if dtype is float:
+        # -0.0 and 0.0 must hash the same
+        array = array + 0.0
+    digest.update(str(array.shape).encode())
+    digest.update(array.tobytes())
+
+
+def _update_matrix(digest, matrix):
+    # canonical CSR: sorted column indices, no explicit zeros, duplicates summed
+    matrix = sp.csr_matrix(matrix, dtype=float)
+    matrix.sum_duplicates()
+    matrix.eliminate_zeros()
+    matrix.sort_indices()
+    digest.update(str(matrix.shape).encode())
+    _update_array(digest, matrix.indptr, np.int64)
+    _update_array(digest, matrix.indices, np.int64)
+    _update_array(digest, matrix.data)
+
+
+def instance_key(A, b, objectives, lbs, ubs, vtypes, names=None, backend="gurobi"):
+    # canonical hash of a model A x <= b, lbs <= x <= ubs with the given objectives;
+    # two instances with the same key have the same solutions
+    digest = hashlib.blake2b(digest_size=20)
+    if backend != "gurobi":
+        # backends may pick different optima among ties, so each keeps its own entries
+        digest.update(backend.encode())
+    _update_matrix(digest, A)
+    _update_array(digest, b)
+    _update_array(digest, lbs)
+    _update_array(digest, ubs)
+    digest.update("".join(np.asarray(vtypes, dtype='U1').tolist()).encode())
+    for coeffs, sense in objectives:
+        _update_array(digest, coeffs)
+        digest.update(str(sense).encode())
+    if names is not None:
+        digest.update("\0".join(names).encode())
+    return digest.hexdigest()
+
+
+class CachedSolution:
+    # status is one of the normalized SolverBackend statuses
+    def __init__(self, status, objective_value, values, names, backend="gurobi", sensitivity=None):
+        self.status = status
+        self.objective_value = objective_value
+        self.values = values
+        self.names = names
+        self.backend = backend
+        # Sensitivity report of an optimal LP, so a cache hit answers what-if questions like a solve
+        self.sensitivity = sensitivity
+
+
+class CachedSolver:
+    # answers the solver queries from a cached solution without any Gurobi model
+    def __init__(self, cached, build_time=0.0):
+        self.cached = cached
+        self.build_time = build_time
+        self.name_index = None
+
+    def solve(self, cancel_event=None):
+        pass
+
+    def get_solution_status(self):
+        # the backend's own status code is not kept, only the normalized one
+        return self.cached.status
+
+    def get_status(self):
+        return self.cached.status
+
+    def get_result(self):
+        result = SolveResult(self.cached.status, self.cached.objective_value, self.cached.values,
+                             self.cached.names, self.cached.backend, self.build_time, 0.0, cached=True)
+        result.sensitivity = self.cached.sensitivity
+        return result
+
+    def has_solution(self):
+        return self.cached.values is not None
+
+    def get_values(self):
+        return self.cached.values
+
+    def dispose(self):
+        # no model behind a cached answer
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.dispose()
+        return False
+
+    def set_start(self, values):
+        pass
+
+    def set_solution_pool(self, size, search_mode=2, gap=None, report=None):
+        pass
+
+    def get_pool(self):
+        return single_solution_pool(self)
+
+    def index_of(self, name):
+        if self.name_index is None:
+            self.name_index = name_index(self.cached.names)
+        return self.name_index[name]
+
+    def get_variable(self, name):
+        return self.cached.values[self.index_of(name)]
+
+    def get_variables(self):
+        return dict(zip(self.cached.names, self.cached.values.tolist()))
+
+    def get_objective_value(self):
+        if self.cached.objective_value is None:
+            raise AttributeError("cached solution has no objective value")
+        return self.cached.objective_value
+
+
+class SolutionCache:
+    # bounded LRU map from instance_key() to CachedSolution, shared between solver threads
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            solution = self.entries.get(key)
+            if solution is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return solution
+
+    def put(self, key, solution):
+        with self.lock:
+            self.entries[key] = solution
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# cache shared by the GUI pages
+solution_cache = SolutionCache()
@@ -0,0 +1,97 @@
+import itertools
+import json
+import os
+import socket
+
+from SolveService import SERVICE_ENVIRONMENT_VARIABLE, parse_address
+from SolverBackend import INTERRUPTED, SolveResult, result_from_dict
+
+# seconds between checks of the cancel event while waiting for the service
+POLL_INTERVAL = 0.1
+
+
+def service_address():
+    # address of the solve service the pages submit to (SOLVER_SERVICE), None to solve in-process
+    return os.environ.get(SERVICE_ENVIRONMENT_VARIABLE) or None
+
+
+class SolveClient:
+    # blocking client of SolveService for one connection, used from a solver thread
+    def __init__(self, address):
+        kind, where = parse_address(address)
+        if kind == "unix":
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(where)
+        else:
+            self.socket = socket.create_connection(where)
+        self.socket.settimeout(POLL_INTERVAL)
+        self.buffer = b""
+        self.ids = itertools.count(1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.socket.close()
+
+    def send(self, message):
+        self.socket.sendall((json.dumps(message) + "\n").encode())
+
+    def receive(self, cancel_event=None):
+        # the next event, or None once cancel_event is set
+        while b"\n" not in self.buffer:
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            try:
+                chunk = self.socket.recv(1 << 16)
+            except socket.timeout:
+                continue
+            if not chunk:
+                raise ConnectionError("the solve service closed the connection")
+            self.buffer += chunk
+        line, self.buffer = self.buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def solve(self, problem, threads=None, cancel_event=None, report=None):
+        # submits problem (SolveService.production_problem / selection_problem) and waits for its
+        # SolveResult; report(event) is called with the queued and started events on the way
+        request_id = str(next(self.ids))
+        self.send({"op": "solve", "id": request_id, "problem": problem, "threads": threads})
+        while True:
+            event = self.receive(cancel_event)
+            if event is None:
+                self.send({"op": "cancel", "id": request_id})
+                return SolveResult(INTERRUPTED, None, None, [], "service")
+            if event.get("id") != request_id:
+                continue
+            if event["event"] == "result":
+                return result_from_dict(event["result"])
+            if event["event"] in ("error", "rejected"):
+                raise RuntimeError(f"solve service: {event['error']}")
+            if report is not None:
+                report(event)
+
+    def status(self):
+        self.send({"op": "status"})
+        while True:
+            event = self.receive()
+            if event.get("event") == "status":
+                return event
+
+
+def solve_on_service(problem, cancel_event=None, report=None, threads=None, address=None):
+    with SolveClient(address or service_address()) as client:
+        return client.solve(problem, threads, cancel_event, report)
+
+
+def describe_event(event):
+    # short text of a queued or started event, for the pages
+    if event["event"] == "queued":
+        shared = ", shared with an identical request" if event.get("shared") else ""
+        return f"Queued on the solve service (position {event['position']}{shared})..."
+    if event["event"] == "started":
+        return f"Solving on the solve service ({event['threads']} threads)..."
+    return ""
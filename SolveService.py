@@ -0,0 +1,343 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from SolverBackend import DEFAULT_BACKEND
+from Telemetry import emit
+
+# Local solve service: one process that owns the solver workers (each with a warm environment) and a
+# fixed core budget, shared by every copy of the app. Clients send one JSON object per line over a Unix
+# or TCP socket and get events back, one JSON object per line, tagged with the id they chose:
+#
+#   {"op": "solve", "id": "7", "problem": {...}, "threads": 2}
+#       -> {"id": "7", "event": "queued", "position": 3, "shared": false}
+#       -> {"id": "7", "event": "started", "threads": 2, "batch": 1}
+#       -> {"id": "7", "event": "result", "result": {SolveResult.to_dict()}, "seconds": 0.41}
+#          or {"id": "7", "event": "error" | "rejected", "error": "..."}
+#   {"op": "cancel", "id": "7"}  -> {"id": "7", "event": "cancelled"}
+#   {"op": "status"}             -> {"event": "status", "queued": ..., "running": ..., "memory": {...}, ...}
+#
+# Problems are production_problem / selection_problem dicts. A problem that is already queued or
+# running is not solved twice: the new request shares its result ("shared": true). Problems with at
+# most SMALL_PROBLEM variables are solved in batches of up to BATCH_SIZE on one worker with one thread.
+SERVICE_ENVIRONMENT_VARIABLE = "SOLVER_SERVICE"
+QUEUE_SIZE = 256
+SMALL_PROBLEM = 2000
+BATCH_SIZE = 16
+# seconds a batch waits for more small problems
+BATCH_WINDOW = 0.005
+# solver threads of a large problem whose request names none
+DEFAULT_THREADS = 2
+
+
+def production_problem(items, salary, raw_material_cost, capacities):
+    return {"type": "production", "items": np.asarray(items, dtype=float).tolist(), "salary": salary,
+            "raw_material_cost": raw_material_cost, "capacities": [float(capacity) for capacity in capacities]}
+
+
+def selection_problem(salaries, masses, popularities, vips, ship_weight, budget, min_vip_count, cliques):
+    return {"type": "selection", "salaries": np.asarray(salaries, dtype=float).tolist(),
+            "masses": np.asarray(masses, dtype=float).tolist(),
+            "popularities": np.asarray(popularities, dtype=float).tolist(),
+            "vips": np.asarray(vips, dtype=bool).tolist(), "ship_weight": ship_weight, "budget": budget,
+            "min_vip_count": min_vip_count, "cliques": [[int(i) for i in clique] for clique in cliques]}
+
+
+def problem_size(problem):
+    return len(problem["items"]) if problem["type"] == "production" else len(problem["salaries"])
+
+
+def problem_key(problem):
+    # identical problems have the same key, whoever sends them
+    return hashlib.sha256(json.dumps(problem, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def parse_address(text):
+    # "unix:/path/to/socket", "tcp:host:port" or "host:port"
+    if text.startswith("unix:"):
+        return "unix", text[len("unix:"):]
+    if text.startswith("tcp:"):
+        text = text[len("tcp:"):]
+    host, _, port = text.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+# -- worker processes ---------------------------------------------------------------------------------
+
+def start_service_worker(backend):
+    # every worker starts its solver environment once, before the first problem arrives
+    if backend == "gurobi":
+        from GurobiEnvironment import configure_environments
+        from GurobiSolver import start_environment
+        configure_environments({"OutputFlag": 0})
+        start_environment()
+
+
+def solve_problem(problem, backend, threads):
+    from ProductionProblem import build_production_solver
+    from SelectionProblem import build_selection_solver
+    from SolutionCache import solution_cache
+    if backend == "gurobi":
+        from GurobiEnvironment import configure_environments
+        # applies to the models this worker builds from now on
+        configure_environments({"Threads": threads})
+    if problem["type"] == "production":
+        solver = build_production_solver(np.asarray(problem["items"], dtype=float).reshape(-1, 5), problem["salary"],
+                                         problem["raw_material_cost"], problem["capacities"], backend=backend,
+                                         cache=solution_cache)
+    elif problem["type"] == "selection":
+        solver = build_selection_solver(problem["salaries"], problem["masses"], problem["popularities"],
+                                        problem["vips"], problem["ship_weight"], problem["budget"],
+                                        problem["min_vip_count"], problem["cliques"], backend=backend,
+                                        cache=solution_cache)
+    else:
+        raise ValueError(f"unknown problem type {problem['type']!r}")
+    # the model is freed before the next problem of the batch is built
+    with solver:
+        solver.solve()
+        return solver.get_result().to_dict()
+
+
+def worker_memory(backend):
+    # live models and native memory left in this worker, which stays 0 models between batches
+    if backend != "gurobi":
+        return None
+    from GurobiEnvironment import memory_usage
+    return memory_usage()
+
+
+def solve_batch(problems, backend, threads):
+    # (one answer per problem: {"result": ...} or {"error": ...}, worker pid, worker memory)
+    answers = []
+    for problem in problems:
+        try:
+            answers.append({"result": solve_problem(problem, backend, threads)})
+        except Exception as error:
+            answers.append({"error": f"{type(error).__name__}: {error}"})
+    return answers, os.getpid(), worker_memory(backend)
+
+
+# -- service ------------------------------------------------------------------------------------------
+
+class Job:
+    # one distinct problem and every (connection, request id) waiting for it
+    def __init__(self, key, problem, threads):
+        self.key = key
+        self.problem = problem
+        self.threads = threads
+        self.size = problem_size(problem)
+        self.subscribers = []
+        self.started = False
+        self.queued_at = time.perf_counter()
+
+    def abandoned(self):
+        return not self.subscribers
+
+
+class SolveService:
+    def __init__(self, backend=None, cores=None, queue_size=QUEUE_SIZE, small_problem=SMALL_PROBLEM,
+                 batch_size=BATCH_SIZE, batch_window=BATCH_WINDOW):
+        self.backend = backend or DEFAULT_BACKEND
+        self.cores = cores or os.cpu_count() or 1
+        self.small_problem = small_problem
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.queue = asyncio.Queue(queue_size)
+        # a large job taken off the queue while a batch was being filled, dispatched next
+        self.held = None
+        self.free_threads = self.cores
+        self.threads_freed = asyncio.Condition()
+        self.in_flight = {}
+        self.running = 0
+        self.solved = 0
+        self.shared = 0
+        # memory report of each worker process after its last batch, by pid
+        self.memory = {}
+        # one process per core at most, each with a warm environment; spawned, not forked, so the
+        # event loop and its sockets stay in this process
+        self.pool = ProcessPoolExecutor(self.cores, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=start_service_worker, initargs=(self.backend,))
+
+    async def serve(self, address):
+        kind, where = parse_address(address)
+        if kind == "unix":
+            if os.path.exists(where):
+                os.unlink(where)
+            server = await asyncio.start_unix_server(self.handle_connection, path=where)
+        else:
+            server = await asyncio.start_server(self.handle_connection, *where)
+        dispatcher = asyncio.create_task(self.dispatch())
+        emit("service_start", address=address, backend=self.backend, cores=self.cores)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            dispatcher.cancel()
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_connection(self, reader, writer):
+        requests = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    await send(writer, {"event": "error", "error": f"invalid JSON: {error}"})
+                    continue
+                if not isinstance(request, dict):
+                    await send(writer, {"event": "error", "error": "expected a JSON object"})
+                    continue
+                op = request.get("op", "solve")
+                if op == "solve":
+                    requests.add(request.get("id"))
+                    await self.submit(writer, request)
+                elif op == "cancel":
+                    self.unsubscribe(writer, request.get("id"))
+                    await send(writer, {"id": request.get("id"), "event": "cancelled"})
+                elif op == "status":
+                    await send(writer, self.status())
+                else:
+                    await send(writer, {"id": request.get("id"), "event": "error", "error": f"unknown op {op!r}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # a client that went away no longer waits for anything
+            for request_id in requests:
+                self.unsubscribe(writer, request_id)
+            writer.close()
+
+    async def submit(self, writer, request):
+        request_id = request.get("id")
+        try:
+            problem = request["problem"]
+            key = problem_key(problem)
+            size = problem_size(problem)
+        except (KeyError, TypeError) as error:
+            await send(writer, {"id": request_id, "event": "error", "error": f"invalid problem: {error}"})
+            return
+        try:
+            threads = max(1, min(int(request.get("threads") or DEFAULT_THREADS), self.cores))
+        except (TypeError, ValueError, OverflowError) as error:
+            await send(writer, {"id": request_id, "event": "error", "error": f"invalid threads: {error}"})
+            return
+        job = self.in_flight.get(key)
+        shared = job is not None
+        if shared:
+            self.shared += 1
+        else:
+            job = Job(key, problem, threads)
+            try:
+                self.queue.put_nowait(job)
+            except asyncio.QueueFull:
+                await send(writer, {"id": request_id, "event": "rejected", "error": "the solve queue is full"})
+                return
+            self.in_flight[key] = job
+        job.subscribers.append((writer, request_id))
+        emit("service_submit", type=problem["type"], size=size, shared=shared, queued=self.queue.qsize())
+        if job.started:
+            await send(writer, {"id": request_id, "event": "started", "threads": job.threads, "shared": True})
+        else:
+            await send(writer, {"id": request_id, "event": "queued", "position": self.queue.qsize(), "shared": shared})
+
+    def unsubscribe(self, writer, request_id):
+        for job in list(self.in_flight.values()):
+            job.subscribers = [(w, i) for w, i in job.subscribers if not (w is writer and i == request_id)]
+            if job.abandoned() and not job.started:
+                # still queued: the dispatcher skips it
+                del self.in_flight[job.key]
+
+    def status(self):
+        memory = {}
+        for report in self.memory.values():
+            for field, value in report.items():
+                memory[field] = memory.get(field, 0) + value
+        return {"event": "status", "backend": self.backend, "cores": self.cores, "free_threads": self.free_threads,
+                "queued": self.queue.qsize(), "running": self.running, "solved": self.solved, "shared": self.shared,
+                "memory": memory}
+
+    async def next_job(self, timeout=None):
+        if self.held is not None:
+            job, self.held = self.held, None
+            return job
+        if timeout is None:
+            return await self.queue.get()
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+    async def dispatch(self):
+        # takes jobs in order; small ones go in batches, each job or batch waits for its threads
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.next_job()
+            if job.abandoned():
+                continue
+            batch, threads = [job], job.threads
+            if job.size <= self.small_problem:
+                threads = 1
+                deadline = loop.time() + self.batch_window
+                while len(batch) < self.batch_size:
+                    try:
+                        other = await self.next_job(max(deadline - loop.time(), 0.0))
+                    except asyncio.TimeoutError:
+                        break
+                    if other.abandoned():
+                        continue
+                    if other.size > self.small_problem:
+                        self.held = other
+                        break
+                    batch.append(other)
+            async with self.threads_freed:
+                await self.threads_freed.wait_for(lambda: self.free_threads >= threads)
+                self.free_threads -= threads
+            asyncio.create_task(self.run(batch, threads))
+
+    async def run(self, batch, threads):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.running += len(batch)
+        for job in batch:
+            job.started = True
+            await self.broadcast(job, {"event": "started", "threads": threads, "batch": len(batch)})
+        try:
+            answers, pid, memory = await loop.run_in_executor(self.pool, solve_batch, [job.problem for job in batch],
+                                                              self.backend, threads)
+            if memory is not None:
+                self.memory[pid] = memory
+        except Exception as error:
+            answers = [{"error": f"{type(error).__name__}: {error}"}] * len(batch)
+        finally:
+            self.running -= len(batch)
+            async with self.threads_freed:
+                self.free_threads += threads
+                self.threads_freed.notify_all()
+        seconds = time.perf_counter() - start
+        emit("service_batch", jobs=len(batch), threads=threads, seconds=seconds)
+        for job, answer in zip(batch, answers):
+            self.in_flight.pop(job.key, None)
+            self.solved += 1
+            if "result" in answer:
+                await self.broadcast(job, {"event": "result", "result": answer["result"],
+                                           "seconds": time.perf_counter() - job.queued_at})
+            else:
+                await self.broadcast(job, {"event": "error", "error": answer["error"]})
+
+    async def broadcast(self, job, message):
+        for writer, request_id in list(job.subscribers):
+            await send(writer, dict(message, id=request_id))
+
+
+async def send(writer, message):
+    # a client that disconnected misses its events, the service carries on
+    try:
+        writer.write((json.dumps(message) + "\n").encode())
+        await writer.drain()
+    except (ConnectionError, RuntimeError):
+        pass
@@ -0,0 +1,157 @@
+import importlib
+import threading
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+from Telemetry import phase
+
+
+class SolveWorker(QObject):
+    # runs job(cancel_event) in a background thread and posts its return value back; a streaming
+    # job is called as job(cancel_event, report) and each report(value) is posted as progress
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    progress = pyqtSignal(object)
+
+    def __init__(self, job, stream=False):
+        super().__init__()
+        self.job = job
+        self.stream = stream
+        self.cancel_event = threading.Event()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            with phase("preload_wait"):
+                wait_for_preload()
+            with phase("job", stream=self.stream):
+                if self.stream:
+                    result = self.job(self.cancel_event, self.progress.emit)
+                else:
+                    result = self.job(self.cancel_event)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit(result)
+
+
+class SolveRunner(QObject):
+    # keeps at most one solve running; starting a new one cancels the running solve and
+    # runs the new job as soon as the old thread has stopped. Several runners (a page's solve,
+    # Pareto and alternatives runners) may run at once: every model their jobs build gets a
+    # pooled Gurobi environment of its own (GurobiEnvironment), so no environment is shared
+    # between threads
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    running_changed = pyqtSignal(bool)
+    # values reported by a streaming job, until it is replaced or cancelled
+    progress = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread = None
+        self.worker = None
+        self.pending_job = None
+
+    def is_running(self):
+        return self.thread is not None
+
+    def start(self, job, stream=False):
+        if self.thread is not None:
+            # replace the running solve: stop it and remember only the latest job
+            self.pending_job = (job, stream)
+            self.worker.cancel_event.set()
+            return
+        self.thread = QThread()
+        self.worker = SolveWorker(job, stream)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.on_worker_progress)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.failed.connect(self.on_worker_failed)
+        self.worker.finished.connect(self.thread.quit)
+        self.worker.failed.connect(self.thread.quit)
+        self.thread.finished.connect(self.on_thread_finished)
+        self.thread.start()
+        self.running_changed.emit(True)
+
+    def cancel(self):
+        self.pending_job = None
+        if self.worker is not None:
+            self.worker.cancel_event.set()
+
+    @pyqtSlot(object)
+    def on_worker_progress(self, value):
+        if self.pending_job is None and self.worker is not None and not self.worker.cancel_event.is_set():
+            self.progress.emit(value)
+
+    @pyqtSlot(object)
+    def on_worker_finished(self, result):
+        if self.pending_job is not None:
+            return  # a newer solve replaces this one
+        if self.worker.cancel_event.is_set():
+            self.cancelled.emit()
+        else:
+            self.finished.emit(result)
+
+    @pyqtSlot(str)
+    def on_worker_failed(self, message):
+        if self.pending_job is not None:
+            return
+        if self.worker.cancel_event.is_set():
+            self.cancelled.emit()
+        else:
+            self.failed.emit(message)
+
+    @pyqtSlot()
+    def on_thread_finished(self):
+        self.worker.deleteLater()
+        self.thread.deleteLater()
+        self.thread = None
+        self.worker = None
+        pending, self.pending_job = self.pending_job, None
+        if pending is not None:
+            self.start(*pending)
+        else:
+            self.running_changed.emit(False)
+
+    def wait(self):
+        # blocks until the running solve has stopped, used when the window is closed
+        self.cancel()
+        if self.thread is not None:
+            self.thread.wait()
+
+
+# background import of the pages and the solver, started once the home window is up
+_preload_thread = None
+
+
+def preload_solver(modules=()):
+    # imports modules and starts the solver environment on a background thread, so neither the first
+    # page nor the first solve pays for it; later calls return the same thread
+    global _preload_thread
+    if _preload_thread is None:
+        _preload_thread = threading.Thread(target=_preload, args=(tuple(modules),), name="solver-preload",
+                                           daemon=True)
+        _preload_thread.start()
+    return _preload_thread
+
+
+def _preload(modules):
+    try:
+        for module in modules:
+            importlib.import_module(module)
+        from SolverBackend import DEFAULT_BACKEND
+        if DEFAULT_BACKEND == "gurobi":
+            from GurobiSolver import start_environment
+            start_environment()
+        else:
+            importlib.import_module("ScipySolver")
+    except Exception:
+        # a missing module or license is reported again, with its own message, where it is first used
+        pass
+
+
+def wait_for_preload():
+    # the preload starts the first pooled Gurobi environment, so no solve starts a second one meanwhile
+    if _preload_thread is not None:
+        _preload_thread.join()
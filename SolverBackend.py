@@ -0,0 +1,181 @@
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+# Backend-neutral constants. The values match gurobipy's GRB constants, so code written
+# against either one builds the same models.
+MINIMIZE = 1
+MAXIMIZE = -1
+CONTINUOUS = 'C'
+BINARY = 'B'
+INTEGER = 'I'
+INFINITY = 1e100
+LESS_EQUAL = '<'
+GREATER_EQUAL = '>'
+EQUAL = '='
+
+# normalized solve statuses, shared by every backend
+OPTIMAL = "optimal"
+INFEASIBLE = "infeasible"
+UNBOUNDED = "unbounded"
+INF_OR_UNBD = "infeasible_or_unbounded"
+INTERRUPTED = "interrupted"
+LIMIT_REACHED = "limit_reached"  # time, node, iteration or solution limit
+NOT_SOLVED = "not_solved"
+ERROR = "error"
+
+# re-solving an instance that ended in one of these gives the same answer
+FINAL_STATUSES = (OPTIMAL, INFEASIBLE, UNBOUNDED, INF_OR_UNBD)
+
+# every builder implements the GurobiSolverBuilder methods used with matrix data:
+#   add_variables, add_variable, set_objective, set_objectives, set_constraints_LHS,
+#   set_constraints_matrix, set_constraints_RHS, add_constraint_rows, add_constraints,
+#   set_presolve, set_cache, build
+# and every solver built by them implements:
+#   solve(cancel_event=None), get_status, get_solution_status, has_solution, get_values, index_of,
+#   get_variable, get_variables, get_objective_value, get_constraint_slacks, get_result, set_start,
+#   set_solution_pool, get_pool (only Gurobi keeps a pool, the other solvers return their one solution),
+#   dispose (frees the native model; a solver is also a context manager that disposes it on exit)
+BACKENDS = ("gurobi", "highs")
+DEFAULT_BACKEND = os.environ.get("SOLVER_BACKEND", "gurobi")
+
+
+class SolveResult:
+    # what a solve produced, in the same shape whatever backend ran it
+    def __init__(self, status, objective_value, values, names, backend, build_time=0.0, solve_time=0.0, raw_status=None,
+                 mip_gap=None, best_bound=None, cached=False):
+        self.status = status
+        self.objective_value = objective_value
+        # solution values in variable order, None when there is no solution
+        self.values = values
+        self.names = names
+        self.backend = backend
+        # wall-clock seconds spent building the model and inside the solver
+        self.build_time = build_time
+        self.solve_time = solve_time
+        self.raw_status = raw_status
+        # relative gap and bound of the last objective, for MIPs stopped before proving optimality
+        self.mip_gap = mip_gap
+        self.best_bound = best_bound
+        # True when the answer came from a solution cache instead of a solve
+        self.cached = cached
+        # Sensitivity report of an optimal LP, when the backend provides one
+        self.sensitivity = None
+
+    def has_solution(self):
+        return self.values is not None
+
+    def variables(self):
+        if self.values is None:
+            return {}
+        return dict(zip(self.names, np.asarray(self.values).tolist()))
+
+    def to_dict(self):
+        return {
+            "status": self.status,
+            "objective_value": self.objective_value,
+            "values": None if self.values is None else np.asarray(self.values).tolist(),
+            "names": list(self.names),
+            "backend": self.backend,
+            "build_time": self.build_time,
+            "solve_time": self.solve_time,
+            "raw_status": self.raw_status,
+            "mip_gap": self.mip_gap,
+            "best_bound": self.best_bound,
+            "cached": self.cached,
+            "sensitivity": None if self.sensitivity is None else self.sensitivity.to_dict(),
+        }
+
+
+class PoolSolution:
+    # one solution of a solver's solution pool
+    def __init__(self, objective_value, values, gap=None):
+        self.objective_value = objective_value
+        self.values = values
+        # relative distance of the objective value to the best one (or, while solving, to the best bound)
+        self.gap = gap
+
+    def to_dict(self):
+        return {
+            "objective_value": self.objective_value,
+            "values": np.asarray(self.values).tolist(),
+            "gap": self.gap,
+        }
+
+
+def result_from_dict(record):
+    # the inverse of SolveResult.to_dict, for results that come back as JSON
+    from Sensitivity import sensitivity_from_dict
+    values = record.get("values")
+    result = SolveResult(record["status"], record.get("objective_value"),
+                         None if values is None else np.asarray(values, dtype=float), record.get("names", []),
+                         record.get("backend"), record.get("build_time", 0.0), record.get("solve_time", 0.0),
+                         record.get("raw_status"), record.get("mip_gap"), record.get("best_bound"),
+                         record.get("cached", False))
+    if record.get("sensitivity") is not None:
+        result.sensitivity = sensitivity_from_dict(record["sensitivity"])
+    return result
+
+
+def relative_gap(objective_value, best):
+    # |best - objective_value| / |best|, None while best is not finite
+    if best is None or abs(best) >= INFINITY:
+        return None
+    return abs(best - objective_value) / max(abs(best), 1e-10)
+
+
+def single_solution_pool(solver):
+    # get_pool of a solver without a pool: its solution, if any
+    if not solver.has_solution():
+        return []
+    return [PoolSolution(solver.get_objective_value(), solver.get_values(), 0.0)]
+
+
+def name_index(names):
+    # name -> position map, built once per solver so lookups by name don't scan the names; a repeated
+    # name maps to its first position, like names.index(name)
+    index = {}
+    for position, name in enumerate(names):
+        index.setdefault(name, position)
+    return index
+
+
+def as_vector(values, size, default=0.0, dtype=float):
+    # broadcast None / scalars / lists / arrays to a flat array of length size
+    if values is None:
+        return np.full(size, default, dtype=dtype)
+    values = np.asarray(values, dtype=dtype)
+    if values.ndim == 0:
+        return np.full(size, values, dtype=dtype)
+    return values.reshape(-1)
+
+
+def as_csr(matrix):
+    # accept list of lists, dense NumPy arrays or any SciPy sparse matrix
+    if sp.issparse(matrix):
+        return sp.csr_matrix(matrix, dtype=float)
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    return sp.csr_matrix(matrix)
+
+
+def limit_time(solver, seconds):
+    # time limit of a built solver's next solve, on either backend
+    if hasattr(solver, "model"):
+        solver.model.Params.TimeLimit = seconds
+    else:
+        solver.time_limit = seconds
+
+
+def make_builder(backend=None):
+    # backends are imported on demand so a machine without gurobipy can still use HiGHS
+    backend = backend or DEFAULT_BACKEND
+    if backend == "gurobi":
+        from GurobiSolver import GurobiSolverBuilder
+        return GurobiSolverBuilder()
+    if backend == "highs":
+        from ScipySolver import ScipySolverBuilder
+        return ScipySolverBuilder()
+    raise ValueError(f"unknown solver backend {backend!r}, expected one of {', '.join(BACKENDS)}")
@@ -0,0 +1,169 @@
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+import SolverBackend
+from SolverBackend import SolveResult
+from Telemetry import emit
+
+# (name, Gurobi parameters) raced by default: the defaults, and settings that often win on hard selection
+# instances, by finding good lists early, by moving the bound, or just by taking another search path
+RACE_CONFIGURATIONS = [
+    ("default", {}),
+    ("feasibility", {"MIPFocus": 1, "Heuristics": 0.2}),
+    ("bound", {"MIPFocus": 3, "Presolve": 2}),
+    ("seed", {"MIPFocus": 2, "Seed": 1}),
+]
+# seconds a worker gets after the time limit to report its best solution before it is stopped
+GRACE_PERIOD = 5.0
+
+
+class RaceEntry:
+    # how one configuration did; status is None while it was still running when the race ended
+    def __init__(self, name, parameters):
+        self.name = name
+        self.parameters = parameters
+        self.status = None
+        self.objective_value = None
+        self.mip_gap = None
+        self.runtime = None
+        self.error = None
+
+    def to_dict(self):
+        return {"name": self.name, "parameters": self.parameters, "status": self.status,
+                "objective_value": self.objective_value, "mip_gap": self.mip_gap, "runtime": self.runtime,
+                "error": self.error}
+
+
+class RaceResult:
+    # the winning solve as a SolveResult, the winning configuration (None when nobody found a solution)
+    # and every configuration's RaceEntry
+    def __init__(self, result, winner, entries):
+        self.result = result
+        self.winner = winner
+        self.entries = entries
+
+    def to_dict(self):
+        return {"winner": self.winner, "result": self.result.to_dict(),
+                "entries": [entry.to_dict() for entry in self.entries]}
+
+
+def objective_key(model):
+    # the objective values, highest priority first and signed so that smaller is better
+    if model.NumObj <= 1:
+        return (model.ModelSense * model.ObjVal,)
+    values = []
+    for number in range(model.NumObj):
+        model.Params.ObjNumber = number
+        values.append((model.ObjNPriority, model.ModelSense * model.ObjNVal))
+    return tuple(value for _, value in sorted(values, reverse=True))
+
+
+def race_worker(path, index, parameters, threads, time_limit, results):
+    # runs in its own process: reads the model file, solves it with one configuration and posts
+    # (index, status, objective key, objective value, mip gap, runtime, values, error)
+    try:
+        import gurobipy as gp
+        from GurobiEnvironment import configure_environments, environment_pool
+        from GurobiSolver import gurobi_statistics, gurobi_status
+        configure_environments({"OutputFlag": 0})
+        model = environment_pool().read(path)
+        model.Params.Threads = threads
+        if time_limit is not None:
+            model.Params.TimeLimit = time_limit
+        for name, value in parameters.items():
+            model.setParam(name, value)
+        model.optimize()
+        status = gurobi_status(model.Status)
+        if model.SolCount > 0:
+            values = np.asarray(gp.MVar.fromlist(model.getVars()).getAttr("X"))
+            # MIPGap is missing for LPs and some multi-objective models
+            results.put((index, status, objective_key(model), model.ObjVal, gurobi_statistics(model).get("mip_gap"),
+                         model.Runtime, values, None))
+        else:
+            results.put((index, status, None, None, None, model.Runtime, None, None))
+    except Exception as error:
+        results.put((index, SolverBackend.ERROR, None, None, None, None, None, f"{type(error).__name__}: {error}"))
+
+
+def race_model(model, variable_indices, names, configurations=None, threads=None, time_limit=None,
+               cancel_event=None):
+    # solves model under every configuration at once, one process each with an equal share of threads;
+    # the first proven optimum wins and the other processes are killed. Without one before time_limit,
+    # the best solution any configuration reports wins. variable_indices picks the values to return.
+    # The processes are spawned, so a calling script needs the usual if __name__ == "__main__" guard.
+    configurations = configurations or RACE_CONFIGURATIONS
+    threads = threads or os.cpu_count() or 1
+    threads_each = max(1, threads // len(configurations))
+    start = time.perf_counter()
+    directory = tempfile.mkdtemp(prefix="race-")
+    path = os.path.join(directory, "model.mps")
+    model.write(path)
+    # spawned, not forked: the caller may be a GUI or have solver threads running
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    entries = [RaceEntry(name, dict(parameters)) for name, parameters in configurations]
+    workers = [context.Process(target=race_worker, args=(path, index, entry.parameters, threads_each, time_limit,
+                                                          results), daemon=True)
+               for index, entry in enumerate(entries)]
+    for worker in workers:
+        worker.start()
+
+    solutions = {}  # index -> values
+    best = None  # (objective key, index) of the best solution reported so far
+    winner = None
+    pending = len(workers)
+    deadline = None if time_limit is None else start + time_limit + GRACE_PERIOD
+    interrupted = False
+    try:
+        while pending and winner is None:
+            if cancel_event is not None and cancel_event.is_set():
+                interrupted = True
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            try:
+                index, status, key, objective_value, mip_gap, runtime, values, error = results.get(timeout=0.1)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers) and results.empty():
+                    break
+                continue
+            pending -= 1
+            entry = entries[index]
+            entry.status, entry.objective_value, entry.mip_gap = status, objective_value, mip_gap
+            entry.runtime, entry.error = runtime, error
+            if key is not None:
+                solutions[index] = values
+                if best is None or key < best[0]:
+                    best = (key, index)
+            if status in SolverBackend.FINAL_STATUSES:
+                # proven optimal (or proven to have no solution): nobody can do better
+                winner = index
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    seconds = time.perf_counter() - start
+    if winner is None and best is not None and not interrupted:
+        winner = best[1]
+    if winner is not None:
+        entry = entries[winner]
+        values = solutions.get(winner)
+        result = SolveResult(entry.status, entry.objective_value, None if values is None else values[variable_indices],
+                             names, "gurobi", solve_time=seconds, mip_gap=entry.mip_gap)
+    else:
+        status = SolverBackend.INTERRUPTED if interrupted else next(
+            (entry.status for entry in entries if entry.status is not None), SolverBackend.ERROR)
+        result = SolveResult(status, None, None, names, "gurobi", solve_time=seconds)
+    name = None if winner is None else entries[winner].name
+    emit("race", configurations=len(entries), threads=threads_each, winner=name, status=result.status, seconds=seconds)
+    return RaceResult(result, name, entries)
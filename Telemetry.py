@@ -0,0 +1,67 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Structured events of the solver stack. Each event is one logging record on the "telemetry" logger
+# whose message reads "<event> key=value ...", with the event name and its fields attached to the
+# record. A JSON-lines trace of every event can be written with start_trace(path), or by setting the
+# SOLVER_TRACE environment variable before main.py, batch_solve.py or benchmark.py starts.
+logger = logging.getLogger("telemetry")
+TRACE_ENVIRONMENT_VARIABLE = "SOLVER_TRACE"
+
+
+def emit(event, **fields):
+    if logger.isEnabledFor(logging.INFO):
+        message = " ".join([event] + [f"{key}={value}" for key, value in fields.items()])
+        logger.info(message, extra={"event": event, "fields": fields})
+
+
+@contextmanager
+def phase(event, **fields):
+    # times the block and emits event with its duration in seconds; the block can add fields to the
+    # dict it is given
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        fields["seconds"] = time.perf_counter() - start
+        emit(event, **fields)
+
+
+class JsonLinesHandler(logging.Handler):
+    # one JSON object per event: its time, name, thread and fields
+    def __init__(self, path):
+        super().__init__(logging.INFO)
+        self.file = open(path, "a")
+        self.file_lock = threading.Lock()
+
+    def emit(self, record):
+        event = getattr(record, "event", None)
+        if event is None:
+            return
+        line = json.dumps({"time": record.created, "event": event, "thread": record.threadName,
+                           **record.fields}, default=float)
+        with self.file_lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+
+    def close(self):
+        with self.file_lock:
+            self.file.close()
+        super().close()
+
+
+def start_trace(path):
+    handler = JsonLinesHandler(path)
+    logger.addHandler(handler)
+    if logger.getEffectiveLevel() > logging.INFO:
+        logger.setLevel(logging.INFO)
+    return handler
+
+
+def start_trace_from_environment():
+    path = os.environ.get(TRACE_ENVIRONMENT_VARIABLE)
+    return start_trace(path) if path else None
@@ -0,0 +1,139 @@
+"""Solve production and guest selection instances without the GUI.
+
+    python batch_solve.py INPUT... [--workers N] [--threads T] [--backend gurobi|highs] [--output FILE]
+                          [--trace FILE]
+
+Each INPUT is an instance spec (.json), a manifest with one spec per line (.jsonl) or a directory
+whose *.json files are specs. A spec names its data file (CSV or columnar binary, see InstanceIO)
+relative to the spec and holds the page's other inputs:
+
+    {"type": "production", "data": "items.csv", "salary": 2, "raw_material_cost": 1,
+     "capacities": [24, 100, 50]}
+    {"type": "selection", "data": "celebrities.bin", "ship_weight": 200, "budget": 1000,
+     "min_vip_count": 1}
+
+Instances are solved in parallel by a process pool, each worker limited to --threads solver threads,
+and one JSON line per instance is written as soon as it is solved. --trace appends every worker's
+solver telemetry events (see Telemetry) to FILE as JSON lines.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from CelebrityStore import CelebrityStore
+from InstanceIO import read_celebrities, read_production
+from ProductionProblem import build_production_solver
+from SelectionProblem import build_selection_solver
+from SolverBackend import DEFAULT_BACKEND, ERROR
+from Telemetry import start_trace
+
+INSTANCE_TYPES = ("production", "selection")
+
+
+def read_specs(paths):
+    # instance specs from spec files, manifests and directories, with absolute data paths
+    specs = []
+    for path in paths:
+        if os.path.isdir(path):
+            specs += read_specs(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                       if name.endswith(".json")))
+        elif path.endswith(".jsonl"):
+            with open(path) as file:
+                for line_number, line in enumerate(file, 1):
+                    if line.strip():
+                        specs.append(resolve_spec(json.loads(line), path, f"{path}:{line_number}"))
+        else:
+            with open(path) as file:
+                specs.append(resolve_spec(json.load(file), path, path))
+    return specs
+
+
+def resolve_spec(spec, spec_path, source):
+    if spec.get("type") not in INSTANCE_TYPES:
+        raise ValueError(f"{source}: type must be one of {', '.join(INSTANCE_TYPES)}")
+    spec = dict(spec)
+    spec["data"] = os.path.join(os.path.dirname(os.path.abspath(spec_path)), spec["data"])
+    spec.setdefault("name", source)
+    return spec
+
+
+def build_instance(spec, backend=None, cache=None):
+    # the same models the pages build, from a spec's data file and inputs
+    if spec["type"] == "production":
+        items = read_production(spec["data"])
+        return build_production_solver(items, spec["salary"], spec["raw_material_cost"], spec["capacities"],
+                                       backend=backend, cache=cache)
+    columns = read_celebrities(spec["data"])
+    store = CelebrityStore()
+    store.extend(columns.names, columns.salaries, columns.masses, columns.popularities, columns.vips,
+                 columns.problems_with, columns.conflict_pairs)
+    return build_selection_solver(store.salary_column(), store.mass_column(), store.popularity_column(),
+                                  store.vip_column(), spec["ship_weight"], spec["budget"], spec["min_vip_count"],
+                                  store.conflicts.clique_cover(), backend=backend, cache=cache)
+
+
+def start_worker(backend, threads, trace=None):
+    # solver logs and license banners go to stderr, stdout only carries the JSON lines
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    if trace:
+        start_trace(trace)
+    if backend == "gurobi":
+        from GurobiEnvironment import configure_environments
+        # applies to every model this worker creates, so workers x threads never exceeds the cores
+        configure_environments({"OutputFlag": 0, "Threads": threads})
+
+
+def solve_instance(spec, backend, include_values=False):
+    start = time.perf_counter()
+    try:
+        with build_instance(spec, backend) as solver:
+            solver.solve()
+            record = solver.get_result().to_dict()
+    except Exception as error:
+        record = {"status": ERROR, "error": f"{type(error).__name__}: {error}", "backend": backend}
+    if not include_values:
+        record.pop("values", None)
+        record.pop("names", None)
+    record["instance"] = spec["name"]
+    record["type"] = spec["type"]
+    record["wall_time"] = time.perf_counter() - start
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve production and guest selection instances in parallel.")
+    parser.add_argument("inputs", nargs="+", help="instance specs, manifests (.jsonl) or directories")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: cores / threads)")
+    parser.add_argument("--threads", type=int, default=1, help="solver threads per worker (default: 1)")
+    parser.add_argument("--backend", choices=("gurobi", "highs"), default=DEFAULT_BACKEND)
+    parser.add_argument("--output", default="-", help="JSON lines file (default: stdout)")
+    parser.add_argument("--values", action="store_true", help="include the solution values")
+    parser.add_argument("--trace", default=os.environ.get("SOLVER_TRACE"), help="JSON lines telemetry file")
+    args = parser.parse_args(argv)
+
+    specs = read_specs(args.inputs)
+    workers = args.workers or max(1, (os.cpu_count() or 1) // args.threads)
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    start = time.perf_counter()
+    failures = 0
+    try:
+        with ProcessPoolExecutor(workers, initializer=start_worker, initargs=(args.backend, args.threads, args.trace)) as pool:
+            futures = [pool.submit(solve_instance, spec, args.backend, args.values) for spec in specs]
+            for future in as_completed(futures):
+                record = future.result()
+                failures += record["status"] == ERROR
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"solved {len(specs)} instances with {workers} workers x {args.threads} threads "
+          f"in {time.perf_counter() - start:.2f}s, {failures} failed", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
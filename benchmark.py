@@ -0,0 +1,210 @@
+"""Time model building and solving across a ladder of generated instance sizes.
+
+    python benchmark.py [--models production,selection,knapsack] [--production-sizes 100,1000,...]
+                        [--selection-sizes 50,200,...] [--knapsack-sizes 20,50,...] [--repeats N] [--seed S]
+                        [--backend gurobi|highs]
+                        [--output FILE] [--baseline FILE] [--tolerance 0.25] [--trace FILE]
+
+Instances come from InstanceGenerators with a fixed seed, so two runs time the same models. knapsack
+solves the selection instances of --knapsack-sizes with the combinatorial engine (ConflictKnapsack)
+instead of a MIP; run selection with the same sizes to compare the two. Every size
+is built and solved --repeats times and the median of each phase is kept, in seconds:
+
+    generate   drawing the instance
+    prepare    work before the builder (the clique cover of the conflict graph, for selection)
+    build      the solver builder, presolve excluded
+    presolve   the row presolve pass
+    solve      the solver itself, presolve excluded
+    extract    reading the solution back (get_result)
+
+Results are written as JSON. With --baseline, every phase that is slower than in the baseline file by
+more than --tolerance (and by more than --min-delta seconds, so timer noise is ignored) is reported as a
+regression, and so is a changed objective value; the exit status is then 1. --trace writes the solver
+telemetry events of every run (see Telemetry) to FILE as JSON lines.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from CelebrityStore import CelebrityStore
+from ConflictKnapsack import ConflictKnapsackSolver
+from InstanceGenerators import celebrity_instance, production_instance
+from ProductionProblem import build_resource_lp
+from SelectionProblem import build_selection_solver
+from SolverBackend import DEFAULT_BACKEND, ERROR, limit_time
+from Telemetry import start_trace
+
+MODELS = ("production", "selection", "knapsack")
+PHASES = ("generate", "prepare", "build", "presolve", "solve", "extract")
+# where each backend's presolve pass runs, so it can be taken out of that phase
+PRESOLVE_PHASE = {"gurobi": "build", "highs": "solve"}
+
+
+def sizes(text):
+    return [int(size) for size in text.split(",") if size]
+
+
+def time_production(size, args):
+    timings = {}
+    start = time.perf_counter()
+    A, capacities, benefits, demand = production_instance(size, args.resources, args.density, args.seed)
+    timings["generate"] = time.perf_counter() - start
+    timings["prepare"] = 0.0
+    return timings, lambda: build_resource_lp(A, capacities, benefits, demand, backend=args.backend)
+
+
+def time_selection(size, args, engine=False):
+    timings = {}
+    start = time.perf_counter()
+    columns, ship_weight, budget, min_vip_count = celebrity_instance(size, args.vip_ratio, args.conflict_density,
+                                                                     args.seed)
+    timings["generate"] = time.perf_counter() - start
+    start = time.perf_counter()
+    store = CelebrityStore()
+    store.extend(columns.names, columns.salaries, columns.masses, columns.popularities, columns.vips,
+                 conflict_pairs=columns.conflict_pairs)
+    cliques = store.clique_cover()
+    timings["prepare"] = time.perf_counter() - start
+    arguments = (store.salary_column(), store.mass_column(), store.popularity_column(), store.vip_column(), ship_weight,
+                 budget, min_vip_count, cliques)
+    if engine:
+        return timings, lambda: ConflictKnapsackSolver(*arguments)
+    return timings, lambda: build_selection_solver(*arguments, backend=args.backend)
+
+
+def run_once(build, backend, time_limit):
+    # (timings of build, presolve, solve and extract, result) of one build and solve
+    start = time.perf_counter()
+    solver = build()
+    build_time = time.perf_counter() - start
+    with solver:
+        if time_limit is not None:
+            limit_time(solver, time_limit)
+        start = time.perf_counter()
+        solver.solve()
+        solve_time = time.perf_counter() - start
+        start = time.perf_counter()
+        result = solver.get_result()
+        timings = {"build": build_time, "presolve": solver.presolve_time, "solve": solve_time,
+                   "extract": time.perf_counter() - start}
+    timings[PRESOLVE_PHASE[backend]] -= solver.presolve_time
+    return timings, result
+
+
+def benchmark(model, size, args):
+    record = {"model": model, "size": size}
+    try:
+        if model == "production":
+            prepared, build = time_production(size, args)
+        else:
+            prepared, build = time_selection(size, args, engine=model == "knapsack")
+        runs = [run_once(build, args.backend, args.time_limit) for _ in range(args.repeats)]
+    except Exception as error:
+        record.update(status=ERROR, error=f"{type(error).__name__}: {error}")
+        return record
+    result = runs[-1][1]
+    timings = dict(prepared)
+    for phase in ("build", "presolve", "solve", "extract"):
+        timings[phase] = statistics.median(run[phase] for run, _ in runs)
+    record.update(status=result.status, objective_value=result.objective_value, mip_gap=result.mip_gap,
+                  timings=timings)
+    return record
+
+
+def compare(results, baseline, tolerance, min_delta):
+    # regressions of results against a previous benchmark file, one dict per slower phase or changed objective
+    previous = {(record["model"], record["size"]): record for record in baseline["results"]}
+    regressions = []
+    for record in results:
+        old = previous.get((record["model"], record["size"]))
+        if old is None or "timings" not in old or "timings" not in record:
+            continue
+        for phase in PHASES:
+            before, after = old["timings"].get(phase), record["timings"][phase]
+            if before is not None and after > before * (1 + tolerance) and after - before > min_delta:
+                regressions.append({"model": record["model"], "size": record["size"], "phase": phase,
+                                    "baseline": before, "current": after, "ratio": after / max(before, 1e-12)})
+        before, after = old.get("objective_value"), record.get("objective_value")
+        if before is not None and after is not None and abs(after - before) > 1e-6 * max(1.0, abs(before)):
+            regressions.append({"model": record["model"], "size": record["size"], "phase": "objective_value",
+                                "baseline": before, "current": after, "ratio": after / before if before else None})
+    return regressions
+
+
+def environment(backend):
+    info = {"python": platform.python_version(), "machine": platform.machine(), "backend": backend}
+    if backend == "gurobi":
+        import gurobipy as gp
+        info["gurobi"] = ".".join(map(str, gp.gurobi.version()))
+    else:
+        import scipy
+        info["scipy"] = scipy.__version__
+    return info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time model building and solving across instance sizes.")
+    parser.add_argument("--models", default=",".join(MODELS), help="comma-separated models to run")
+    parser.add_argument("--production-sizes", type=sizes, default=[100, 1000, 10000, 100000])
+    parser.add_argument("--selection-sizes", type=sizes, default=[50, 200, 1000, 5000])
+    parser.add_argument("--knapsack-sizes", type=sizes, default=[20, 40, 60])
+    parser.add_argument("--resources", type=int, default=3, help="production resources (default: 3)")
+    parser.add_argument("--density", type=float, default=1.0, help="production matrix density (default: 1)")
+    parser.add_argument("--vip-ratio", type=float, default=0.1)
+    parser.add_argument("--conflict-density", type=float, default=0.001, help="share of conflicting pairs")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=("gurobi", "highs"), default=DEFAULT_BACKEND)
+    parser.add_argument("--threads", type=int, default=1, help="solver threads (default: 1)")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per solve")
+    parser.add_argument("--output", default="-", help="JSON file (default: stdout)")
+    parser.add_argument("--baseline", default=None, help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (default: 0.25)")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="ignored slowdown in seconds")
+    parser.add_argument("--trace", default=os.environ.get("SOLVER_TRACE"), help="JSON lines telemetry file")
+    args = parser.parse_args(argv)
+    if args.trace:
+        start_trace(args.trace)
+
+    if args.backend == "gurobi":
+        from GurobiEnvironment import configure_environments
+        configure_environments({"OutputFlag": 0, "Threads": args.threads})
+    settings = {name: value for name, value in vars(args).items() if name not in ("output", "baseline", "trace")}
+    ladders = {"production": args.production_sizes, "selection": args.selection_sizes,
+               "knapsack": args.knapsack_sizes}
+    results = []
+    for model in args.models.split(","):
+        if model not in MODELS:
+            parser.error(f"unknown model {model!r}, expected one of {', '.join(MODELS)}")
+        for size in ladders[model]:
+            record = benchmark(model, size, args)
+            results.append(record)
+            timings = record.get("timings", {})
+            print(f"{model:10} {size:>8} {record['status']:14} "
+                  + " ".join(f"{phase} {timings[phase] * 1000:9.1f}ms" for phase in timings)
+                  + (f" {record['error']}" if "error" in record else ""), file=sys.stderr)
+
+    report = {"environment": environment(args.backend), "settings": settings, "results": results}
+    exit_status = 0
+    if args.baseline:
+        with open(args.baseline) as file:
+            report["regressions"] = compare(results, json.load(file), args.tolerance, args.min_delta)
+        for regression in report["regressions"]:
+            print(f"regression: {regression['model']} {regression['size']} {regression['phase']} "
+                  f"{regression['baseline']:.6g} -> {regression['current']:.6g}", file=sys.stderr)
+        exit_status = 1 if report["regressions"] else 0
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    return exit_status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
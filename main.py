@@ -1,6 +1,9 @@
+import logging
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
 from HomePage import HomePage
+from Telemetry import start_trace_from_environment
 # GUI stylesstyle_sheet =
 style_sheet="""
     QWidget {
@@ -49,6 +52,9 @@ style_sheet="""
     }
 """
 if __name__ == '__main__':
+    # SOLVER_LOG_LEVEL=INFO prints the solver telemetry events, SOLVER_TRACE=FILE writes them as JSON lines
+    logging.basicConfig(level=os.environ.get("SOLVER_LOG_LEVEL", "WARNING"))
+    start_trace_from_environment()
     app = QApplication(sys.argv)
     app.setStyleSheet(style_sheet)
 
@@ -0,0 +1,98 @@
+"""Plan production over many periods, with stock carried from one period to the next.
+
+    python plan_production.py INSTANCE [--window 28] [--commit 7] [--full] [--integer] [--time-limit S]
+                              [--backend gurobi|highs] [--generate ITEMS PERIODS] [--seed N]
+                              [--output FILE] [--plan FILE] [--trace FILE]
+
+INSTANCE is a multi-period instance in the columnar binary format (InstanceIO.write_planning): the item
+rows of the production page, the demand of every item in every period, the capacity calendar, the
+holding costs and the initial stock. With --generate, a seeded instance of ITEMS items over PERIODS
+periods (InstanceGenerators.planning_instance) is written to INSTANCE first.
+
+The plan is solved over a rolling horizon: a model of --window periods is solved, the plan of its
+first --commit periods is kept and the next window starts from the stock they leave, warm-started from
+the plan of the window before. Memory and time per window stay the same however long the horizon is.
+--full solves all periods in one model instead. --integer makes whole units of every item, and
+--time-limit bounds each window (or the full model) in seconds; on either backend a window stopped by
+the limit keeps the best plan found so far.
+
+The status, the profit (per period and in total) and the times are written as JSON; --plan writes the
+quantities made, the stock and the sales of every item in every period to a columnar binary file.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from InstanceGenerators import planning_instance
+from InstanceIO import read_planning, write_columns, write_planning
+from ProductionPlanning import COMMIT, WINDOW, rolling_horizon, solve_plan
+from SolverBackend import DEFAULT_BACKEND, ERROR, INTERRUPTED
+from Telemetry import start_trace
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan production over many periods.")
+    parser.add_argument("instance", help="multi-period instance (.bin)")
+    parser.add_argument("--window", type=int, default=WINDOW, help=f"periods per window (default: {WINDOW})")
+    parser.add_argument("--commit", type=int, default=COMMIT, help=f"periods kept per window (default: {COMMIT})")
+    parser.add_argument("--full", action="store_true", help="solve every period in one model")
+    parser.add_argument("--integer", action="store_true", help="make whole units")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per window (or for --full)")
+    parser.add_argument("--backend", choices=("gurobi", "highs"), default=DEFAULT_BACKEND)
+    parser.add_argument("--generate", type=int, nargs=2, metavar=("ITEMS", "PERIODS"), default=None,
+                        help="write a generated instance to INSTANCE first")
+    parser.add_argument("--seed", type=int, default=0, help="seed of --generate (default: 0)")
+    parser.add_argument("--output", default="-", help="JSON file (default: stdout)")
+    parser.add_argument("--plan", default=None, help="columnar binary file for the plan")
+    parser.add_argument("--trace", default=os.environ.get("SOLVER_TRACE"), help="JSON lines telemetry file")
+    args = parser.parse_args(argv)
+    if args.trace:
+        start_trace(args.trace)
+    if not 0 < args.commit <= args.window:
+        parser.error("--commit must be between 1 and --window")
+
+    if args.generate:
+        write_planning(args.instance, planning_instance(*args.generate, seed=args.seed))
+    instance = read_planning(args.instance)
+    if args.backend == "gurobi":
+        from GurobiEnvironment import configure_environments
+        configure_environments({"OutputFlag": 0})
+
+    def report(window, first, end, status):
+        print(f"window {window}: periods {first + 1}-{end} {status}", file=sys.stderr)
+
+    start = time.perf_counter()
+    if args.full:
+        result = solve_plan(instance, args.backend, args.integer, args.time_limit)
+    else:
+        result = rolling_horizon(instance, args.window, args.commit, args.backend, args.integer, args.time_limit,
+                                 report=report)
+    seconds = time.perf_counter() - start
+
+    record = result.to_dict(instance)
+    for plan in ("make", "stock", "sales"):
+        record.pop(plan)
+    record.pop("names")
+    record["instance"] = args.instance
+    record["items"] = instance.number_of_items()
+    record["periods"] = instance.number_of_periods()
+    record["seconds"] = seconds
+    text = json.dumps(record, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    if args.plan and result.has_solution():
+        planned = result.periods_planned
+        write_columns(args.plan, "plan", {"make": result.make[:planned], "stock": result.stock[:planned],
+                                          "sales": result.sales[:planned]})
+    print(f"{result.status}: {result.periods_planned} of {instance.number_of_periods()} periods planned in "
+          f"{result.windows} windows, profit {record.get('profit', 0.0):.2f}, {seconds:.2f}s", file=sys.stderr)
+    return 1 if result.status in (ERROR, INTERRUPTED) or not result.has_solution() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Race Gurobi parameter sets on one instance and report which one wins.
+
+    python race_solve.py SPEC [--threads T] [--time-limit S] [--configurations FILE] [--output FILE]
+                         [--trace FILE]
+
+SPEC is an instance spec as read by batch_solve.py. The model is solved under every configuration at
+once, each in its own process with an equal share of --threads; the first proven optimum wins and the
+other processes are stopped. If none proves optimality within --time-limit seconds, the best solution
+found wins. --configurations is a JSON object of named Gurobi parameter sets,
+
+    {"default": {}, "feasibility": {"MIPFocus": 1}, "bound": {"MIPFocus": 3, "Presolve": 2}}
+
+and defaults to SolverRace.RACE_CONFIGURATIONS. The result, the winner and how every configuration did
+are written as JSON.
+"""
+import argparse
+import json
+import os
+import sys
+
+from batch_solve import build_instance, read_specs
+from SolverBackend import ERROR
+from Telemetry import start_trace
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Race Gurobi parameter sets on one instance.")
+    parser.add_argument("spec", help="instance spec (.json)")
+    parser.add_argument("--threads", type=int, default=None, help="threads shared by all racers (default: cores)")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds before the best solution wins")
+    parser.add_argument("--configurations", default=None, help="JSON file of named Gurobi parameter sets")
+    parser.add_argument("--output", default="-", help="JSON file (default: stdout)")
+    parser.add_argument("--values", action="store_true", help="include the solution values")
+    parser.add_argument("--trace", default=os.environ.get("SOLVER_TRACE"), help="JSON lines telemetry file")
+    args = parser.parse_args(argv)
+    if args.trace:
+        start_trace(args.trace)
+
+    configurations = None
+    if args.configurations:
+        with open(args.configurations) as file:
+            configurations = list(json.load(file).items())
+    specs = read_specs([args.spec])
+    if len(specs) != 1:
+        parser.error("expected exactly one instance spec")
+    from GurobiEnvironment import configure_environments
+    configure_environments({"OutputFlag": 0})
+    with build_instance(specs[0], "gurobi") as solver:
+        race = solver.race(configurations, args.threads, args.time_limit)
+    report = race.to_dict()
+    if not args.values:
+        report["result"].pop("values", None)
+        report["result"].pop("names", None)
+    report["instance"] = specs[0]["name"]
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    print(f"winner: {race.winner} ({race.result.status}, {race.result.solve_time:.2f}s)", file=sys.stderr)
+    return 1 if race.result.status == ERROR else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Solve a recorded corpus again and compare with the recorded solves.
+
+    python replay_corpus.py CORPUS... [--workers N] [--threads T] [--backend gurobi|highs]
+                            [--tolerance 0.25] [--min-delta 0.05] [--output FILE] [--trace FILE]
+
+A corpus is the directory the pages record to when SOLVER_CORPUS is set (see ProblemCorpus): one
+batch_solve.py spec per solved instance, with its data file and, under "recorded", the backend, status,
+objective value and build and solve times of the original solve. Every entry is solved again without
+the GUI, in parallel as in batch_solve.py, on its recorded backend unless --backend is given.
+
+One JSON line per entry is written with the recorded and the new result. A solve that is slower than
+recorded by more than --tolerance (and by more than --min-delta seconds), a changed status or a changed
+objective value is a regression; the exit status is then 1. The production page re-solves a live model
+from the previous basis, so its recorded solve times can be lower than those of a solve from scratch.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from batch_solve import read_specs, solve_instance, start_worker
+from SolverBackend import ERROR
+
+
+def replay_entry(spec, backend):
+    recorded = spec.get("recorded", {})
+    record = solve_instance(spec, backend or recorded.get("backend", "gurobi"))
+    record["recorded"] = recorded
+    return record
+
+
+def regressions(record, tolerance, min_delta):
+    # how a replayed entry is worse than its recording, as short descriptions
+    recorded = record["recorded"]
+    found = []
+    if record["status"] != recorded.get("status"):
+        found.append(f"status {recorded.get('status')} -> {record['status']}")
+    before, after = recorded.get("objective_value"), record.get("objective_value")
+    if before is not None and after is not None and abs(after - before) > 1e-6 * max(1.0, abs(before)):
+        found.append(f"objective {before:.6g} -> {after:.6g}")
+    before, after = recorded.get("solve_time"), record.get("solve_time")
+    if before is not None and after is not None and after > before * (1 + tolerance) and after - before > min_delta:
+        found.append(f"solve time {before:.3f}s -> {after:.3f}s")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a recorded corpus again and compare with the recording.")
+    parser.add_argument("corpora", nargs="+", help="corpus directories or single entries (.json)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: cores / threads)")
+    parser.add_argument("--threads", type=int, default=1, help="solver threads per worker (default: 1)")
+    parser.add_argument("--backend", choices=("gurobi", "highs"), default=None,
+                        help="solve every entry on this backend (default: the recorded one)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (default: 0.25)")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="ignored slowdown in seconds")
+    parser.add_argument("--output", default="-", help="JSON lines file (default: stdout)")
+    parser.add_argument("--trace", default=os.environ.get("SOLVER_TRACE"), help="JSON lines telemetry file")
+    args = parser.parse_args(argv)
+
+    specs = read_specs(args.corpora)
+    workers = args.workers or max(1, (os.cpu_count() or 1) // args.threads)
+    # one backend per worker setup: with entries from both backends the Gurobi settings are applied anyway
+    backends = {args.backend or spec.get("recorded", {}).get("backend", "gurobi") for spec in specs}
+    worker_backend = "gurobi" if "gurobi" in backends else "highs"
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    start = time.perf_counter()
+    failures = regressed = 0
+    try:
+        with ProcessPoolExecutor(workers, initializer=start_worker,
+                                 initargs=(worker_backend, args.threads, args.trace)) as pool:
+            futures = [pool.submit(replay_entry, spec, args.backend) for spec in specs]
+            for future in as_completed(futures):
+                record = future.result()
+                record["regressions"] = regressions(record, args.tolerance, args.min_delta)
+                failures += record["status"] == ERROR
+                regressed += bool(record["regressions"])
+                for regression in record["regressions"]:
+                    print(f"regression: {record['instance']} {regression}", file=sys.stderr)
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"replayed {len(specs)} entries with {workers} workers x {args.threads} threads "
+          f"in {time.perf_counter() - start:.2f}s, {regressed} regressed, {failures} failed", file=sys.stderr)
+    return 1 if failures or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Run the local solve service the GUI pages can submit to.
+
+    python solve_service.py [--address unix:/tmp/solver.sock | tcp:127.0.0.1:8765] [--cores N]
+                            [--backend gurobi|highs] [--queue-size N] [--small-problem N]
+                            [--batch-size N] [--trace FILE]
+
+The service keeps one solver process per core, each with its environment started once, and never runs
+more solver threads than --cores in total. Requests are JSON lines over the socket (see SolveService):
+large problems get the threads they ask for, small ones (at most --small-problem variables) are solved
+in batches on one thread, and a problem that is already queued or running is solved only once. Start
+the GUI with SOLVER_SERVICE set to the same address to solve through the service:
+
+    SOLVER_SERVICE=unix:/tmp/solver.sock python main.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+from SolveService import BATCH_SIZE, QUEUE_SIZE, SERVICE_ENVIRONMENT_VARIABLE, SMALL_PROBLEM, SolveService
+from SolverBackend import DEFAULT_BACKEND
+from Telemetry import start_trace
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local solve service.")
+    parser.add_argument("--address", default=os.environ.get(SERVICE_ENVIRONMENT_VARIABLE, "unix:/tmp/solver.sock"),
+                        help="unix:PATH or tcp:HOST:PORT (default: SOLVER_SERVICE or unix:/tmp/solver.sock)")
+    parser.add_argument("--cores", type=int, default=None, help="solver threads in total (default: cores)")
+    parser.add_argument("--backend", choices=("gurobi", "highs"), default=DEFAULT_BACKEND)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="queued problems before rejecting")
+    parser.add_argument("--small-problem", type=int, default=SMALL_PROBLEM, help="largest problem that is batched")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="small problems per batch")
+    parser.add_argument("--trace", default=os.environ.get("SOLVER_TRACE"), help="JSON lines telemetry file")
+    args = parser.parse_args(argv)
+    if args.trace:
+        start_trace(args.trace)
+
+    async def serve():
+        service = SolveService(args.backend, args.cores, args.queue_size, args.small_problem, args.batch_size)
+        print(f"solve service on {args.address}: {service.cores} cores, {args.backend}", file=sys.stderr)
+        await service.serve(args.address)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
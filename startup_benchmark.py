@@ -0,0 +1,85 @@
+"""Measure the cold start of the GUI.
+
+    python startup_benchmark.py [--runs N] [--output FILE]
+
+Every run starts a fresh interpreter that imports main and the home page, shows the home page and
+waits for its first paint, then for the background preload of the pages and the solver. Reported
+per run and as the median over the runs, in seconds:
+
+    import          importing main and HomePage
+    first_paint     from the start of the imports to the home page's first paint
+    preload         from the start of the imports to the end of the background preload
+    solver_loaded   whether gurobipy / SciPy's solvers were already imported at the first paint
+
+Set QT_QPA_PLATFORM=offscreen to run it without a display.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+TIMINGS = ("import", "first_paint", "preload")
+
+
+def measure():
+    # one cold start, in this interpreter
+    start = time.perf_counter()
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+    from PyQt5.QtWidgets import QApplication
+    import main
+    from HomePage import HomePage
+    from SolveWorker import wait_for_preload
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv[:1])
+    app.setStyleSheet(main.style_sheet)
+    home_page = HomePage()
+    record = {}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Paint and "first_paint" not in record:
+                record["first_paint"] = time.perf_counter() - start
+                record["solver_loaded"] = "gurobipy" in sys.modules or "scipy.optimize" in sys.modules
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    first_paint = FirstPaint()
+    home_page.installEventFilter(first_paint)
+    home_page.show()
+    app.exec_()
+    wait_for_preload()
+    record["import"] = imported - start
+    record["preload"] = time.perf_counter() - start
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the cold start of the GUI.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start (default: 5)")
+    parser.add_argument("--output", default=None, help="also write the results to this JSON file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        print(json.dumps(measure()))
+        return 0
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, __file__, "--child"], capture_output=True, text=True, check=True)
+        # the solver may print a banner, the record is the last line
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    summary = {name: statistics.median(run[name] for run in runs) for name in TIMINGS}
+    for name in TIMINGS:
+        print(f"{name:12} {summary[name] * 1000:8.1f} ms")
+    print(f"solver loaded before the first paint in {sum(run['solver_loaded'] for run in runs)} of {len(runs)} runs")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"runs": runs, "median": summary}, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
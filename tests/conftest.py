@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+import pytest
+
+# the modules under test sit at the top of the repository, next to main.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+
+@pytest.fixture
+def gurobi():
+    # gurobipy, or a skip when it isn't installed or has no license
+    gp = pytest.importorskip("gurobipy")
+    try:
+        gp.Model().dispose()
+    except gp.GurobiError:
+        pytest.skip("no Gurobi license")
+    return gp
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    # one QApplication for every Qt test, drawn offscreen
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def wait_until(qt_app):
+    # wait_until(condition) runs the Qt event loop until condition() holds, so queued signals from
+    # worker threads arrive
+    def wait(condition, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                raise AssertionError("timed out waiting for the Qt event loop")
+            qt_app.processEvents()
+            time.sleep(0.005)
+    return wait
@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+import pytest
+
+import batch_solve
+from InstanceGenerators import celebrity_instance
+from InstanceIO import write_celebrity_columns, write_production
+from SolverBackend import ERROR, OPTIMAL
+
+ITEMS = np.array([[1.0, 2.0, 3.0, 20.0, 4.0], [2.0, 1.0, 1.0, 15.0, 6.0]])
+
+
+@pytest.fixture
+def instances(tmp_path):
+    write_production(str(tmp_path / "items.csv"), ITEMS)
+    columns, ship_weight, budget, min_vip_count = celebrity_instance(30, vip_ratio=0.3, conflict_density=0.1, seed=1)
+    write_celebrity_columns(str(tmp_path / "celebrities.bin"), columns)
+    production = {"type": "production", "data": "items.csv", "salary": 2, "raw_material_cost": 1,
+                  "capacities": [10, 10, 10]}
+    selection = {"type": "selection", "data": "celebrities.bin", "ship_weight": ship_weight, "budget": budget,
+                 "min_vip_count": min_vip_count}
+    (tmp_path / "specs").mkdir()
+    (tmp_path / "specs" / "production.json").write_text(json.dumps(dict(production, data="../items.csv")))
+    (tmp_path / "manifest.jsonl").write_text(json.dumps(production) + "\n\n" + json.dumps(selection) + "\n")
+    return tmp_path
+
+
+def test_specs_come_from_directories_and_manifests(instances):
+    specs = batch_solve.read_specs([str(instances / "specs"), str(instances / "manifest.jsonl")])
+    assert [spec["type"] for spec in specs] == ["production", "production", "selection"]
+    assert specs[0]["data"] == str(instances / "specs" / ".." / "items.csv")
+    assert specs[2]["data"] == str(instances / "celebrities.bin")
+    # manifest lines are named by their line, blank lines included
+    assert specs[2]["name"] == f"{instances / 'manifest.jsonl'}:3"
+
+
+def test_unknown_type_names_its_source(tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    path.write_text('{"type": "planning", "data": "x.bin"}\n')
+    with pytest.raises(ValueError, match=r"manifest.jsonl:1: type must be one of production, selection"):
+        batch_solve.read_specs([str(path)])
+
+
+def test_failed_instance_is_recorded_not_raised(instances):
+    spec = batch_solve.resolve_spec({"type": "production", "data": "missing.csv", "salary": 2,
+                                     "raw_material_cost": 1, "capacities": [1, 1, 1]},
+                                    str(instances / "spec.json"), "spec.json")
+    record = batch_solve.solve_instance(spec, "highs")
+    assert record["status"] == ERROR
+    assert record["error"].startswith("FileNotFoundError")
+    assert record["instance"] == "spec.json"
+
+
+def test_pool_writes_one_line_per_instance(instances):
+    output = instances / "results.jsonl"
+    code = batch_solve.main([str(instances / "manifest.jsonl"), "--workers", "1", "--backend", "highs",
+                             "--output", str(output), "--values"])
+    assert code == 0
+    records = {record["type"]: record for record in map(json.loads, output.read_text().splitlines())}
+    assert records.keys() == {"production", "selection"}
+    assert all(record["status"] == OPTIMAL for record in records.values())
+    with batch_solve.build_instance(batch_solve.read_specs([str(instances / "manifest.jsonl")])[0],
+                                    "highs") as solver:
+        solver.solve()
+        assert records["production"]["objective_value"] == pytest.approx(solver.get_objective_value())
+    assert len(records["selection"]["values"]) == 30
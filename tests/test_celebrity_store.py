@@ -0,0 +1,24 @@
+from CelebrityStore import CelebrityStore
+
+
+def test_clique_cover_is_kept_until_celebrities_are_added():
+    store = CelebrityStore()
+    store.extend(["A", "B", "C"], [1, 1, 1], [1, 1, 1], [1, 1, 1], [False] * 3, [[], ["A"], []])
+    cover = store.clique_cover()
+    assert cover == [[0, 1]]
+    assert store.clique_cover() is cover
+    store.add("D", 1, 1, 1, False, ["C"])
+    assert sorted(store.clique_cover()) == [[0, 1], [2, 3]]
+    store.extend(["E"], [1], [1], [1], [False], conflict_pairs=[(0, 0)])
+    store.extend(["F"], [1], [1], [1], [False], [["E", "D"]])
+    assert sorted(store.clique_cover()) == [[0, 1], [2, 3], [3, 5], [4, 5]]
+
+
+def test_self_and_repeated_pairs_are_skipped():
+    store = CelebrityStore()
+    store.extend(["A", "B", "C"], [1, 1, 1], [1, 1, 1], [1, 1, 1], [False] * 3,
+                 conflict_pairs=[(1, 1), (0, 2), (2, 0), (0, 2)])
+    assert [store.problems_with[i] for i in range(3)] == [[], [], ["A"]]
+    assert store.conflicts.pairs() == [(0, 2)]
+    assert store.conflicts.neighbors(1) == set()
+    assert store.clique_cover() == [[0, 2]]
@@ -0,0 +1,63 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from ConflictGraph import ConflictGraph
+from InstanceGenerators import celebrity_instance, conflict_pairs
+from SelectionProblem import build_selection_solver
+
+
+def random_graph(people, density, seed):
+    graph = ConflictGraph()
+    for i in range(people):
+        graph.add(f"Celebrity {i}")
+    for i, j in conflict_pairs(people, density, np.random.default_rng(seed)).tolist():
+        graph.add_conflict(i, j)
+    return graph
+
+
+@pytest.mark.parametrize("people, density, seed", [(12, 0.3, 0), (40, 0.1, 1), (40, 0.6, 2), (80, 0.05, 3)])
+def test_cover_is_made_of_cliques_covering_every_pair(people, density, seed):
+    graph = random_graph(people, density, seed)
+    cliques = graph.clique_cover()
+    covered = set()
+    for clique in cliques:
+        assert len(clique) == len(set(clique)) >= 2
+        for i, j in itertools.combinations(clique, 2):
+            assert j in graph.neighbors(i)
+            covered.add((min(i, j), max(i, j)))
+    assert covered == set(graph.pairs())
+    assert len(cliques) <= graph.number_of_conflicts()
+
+
+def test_complete_graph_is_one_clique():
+    graph = ConflictGraph()
+    for i in range(6):
+        graph.add(f"Celebrity {i}", [f"Celebrity {j}" for j in range(i)])
+    assert graph.number_of_conflicts() == 15
+    assert graph.clique_cover() == [list(range(6))]
+
+
+def test_conflicts_by_name_reach_every_namesake():
+    graph = ConflictGraph()
+    graph.add("Ann")
+    graph.add("Ann")
+    graph.add("Bob", ["Ann", "Bob"])
+    # both Anns, and never Bob with himself
+    assert graph.pairs() == [(0, 2), (1, 2)]
+
+
+def test_clique_rows_select_like_pairwise_rows():
+    columns, ship_weight, budget, min_vip_count = celebrity_instance(30, vip_ratio=0.3, conflict_density=0.3, seed=4)
+    graph = random_graph(30, 0.3, 4)
+    objective_values = []
+    for cliques in (graph.clique_cover(), [list(pair) for pair in graph.pairs()]):
+        with build_selection_solver(columns.salaries, columns.masses, columns.popularities, columns.vips, ship_weight,
+                                    budget, min_vip_count, cliques, backend="highs") as solver:
+            solver.solve()
+            result = solver.get_result()
+        objective_values.append(result.objective_value)
+        chosen = np.flatnonzero(np.round(result.values) > 0).tolist()
+        assert not any(j in graph.neighbors(i) for i, j in itertools.combinations(chosen, 2))
+    assert objective_values[0] == pytest.approx(objective_values[1])
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from CelebrityStore import CelebrityStore
+from ConflictKnapsack import ConflictKnapsackSolver, knapsack_settings
+from InstanceGenerators import celebrity_instance
+from SelectionProblem import build_selection_solver
+from SolverBackend import INFEASIBLE, LIMIT_REACHED, OPTIMAL
+
+
+def selection_arguments(people, conflict_density, seed):
+    columns, ship_weight, budget, min_vip_count = celebrity_instance(people, vip_ratio=0.3,
+                                                                     conflict_density=conflict_density, seed=seed)
+    store = CelebrityStore()
+    store.extend(columns.names, columns.salaries, columns.masses, columns.popularities, columns.vips,
+                 conflict_pairs=columns.conflict_pairs)
+    return store, (store.salary_column(), store.mass_column(), store.popularity_column(), store.vip_column(),
+                   ship_weight, budget, min_vip_count, store.clique_cover())
+
+
+def priorities(store, values):
+    # head count, total salary and total popularity, the order the objectives are optimized in
+    return int(round(float(values.sum()))), float(store.salary_column() @ values), float(store.popularity_column() @ values)
+
+
+@pytest.mark.parametrize("people,conflict_density,seed", [(30, 0.0, 0), (40, 0.05, 1), (60, 0.01, 2),
+                                                          (60, 0.2, 3), (80, 0.0, 0)])
+def test_engine_matches_the_mip(people, conflict_density, seed):
+    store, arguments = selection_arguments(people, conflict_density, seed)
+    with build_selection_solver(*arguments, backend="highs") as solver:
+        solver.solve()
+        expected = solver.get_result()
+    with ConflictKnapsackSolver(*arguments, time_limit=30.0) as solver:
+        solver.solve()
+        result = solver.get_result()
+    assert result.status == OPTIMAL and result.mip_gap == 0.0
+    count, salary, popularity = priorities(store, result.values)
+    expected_count, expected_salary, expected_popularity = priorities(store, expected.values)
+    assert count == expected_count
+    assert salary == pytest.approx(expected_salary, abs=1e-6)
+    assert popularity == pytest.approx(expected_popularity)
+    for i, j in store.conflicts.pairs():
+        assert result.values[i] + result.values[j] <= 1
+
+
+def test_engine_reports_infeasible_lists():
+    store, arguments = selection_arguments(20, 0.0, 0)
+    arguments = arguments[:3] + (np.zeros(20, dtype=bool),) + arguments[4:]
+    with ConflictKnapsackSolver(*arguments) as solver:
+        solver.solve()
+        assert solver.get_status() == INFEASIBLE
+        assert not solver.has_solution()
+
+
+def test_node_limit_keeps_the_best_list_and_its_gap():
+    store, arguments = selection_arguments(100, 0.3, 1)
+    with ConflictKnapsackSolver(*arguments, node_limit=500) as solver:
+        solver.solve()
+        result = solver.get_result()
+    assert result.status == LIMIT_REACHED
+    assert result.has_solution() and result.mip_gap > 0
+    assert store.mass_column() @ result.values <= arguments[4] + 1e-6
+
+
+def test_settings_come_from_the_environment(monkeypatch):
+    monkeypatch.setenv("SOLVER_KNAPSACK_SETTINGS", '{"node_limit": 1000, "max_people": 25}')
+    assert knapsack_settings() == {"node_limit": 1000, "time_limit": 60.0, "max_people": 25}
+    store, arguments = selection_arguments(10, 0.0, 0)
+    assert ConflictKnapsackSolver(*arguments).node_limit == 1000
+    monkeypatch.setenv("SOLVER_KNAPSACK_SETTINGS", '{"nodes": 5}')
+    assert knapsack_settings()["node_limit"] == 2_000_000
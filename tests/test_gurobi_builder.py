@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from SolverBackend import MAXIMIZE, OPTIMAL, make_builder
+
+# maximize 3x + 2y + z with x + y + z <= 4, x + 3y <= 6, x <= 3
+A = np.array([[1.0, 1.0, 1.0], [1.0, 3.0, 0.0], [1.0, 0.0, 0.0]])
+b = [4.0, 6.0, 3.0]
+c = [3.0, 2.0, 1.0]
+
+
+def solve(builder):
+    with builder.build() as solver:
+        solver.solve()
+        return solver.get_result()
+
+
+def test_lhs_and_matrix_give_the_same_model(gurobi):
+    from GurobiSolver import GurobiSolverBuilder
+    by_variable = (GurobiSolverBuilder().add_variables(3).set_constraints_LHS(A.T)
+                   .set_constraints_RHS(b).add_constraints().set_objective(c, MAXIMIZE))
+    by_row = GurobiSolverBuilder().add_variables(3).set_constraints_matrix(sp.csr_matrix(A), b).set_objective(c, MAXIMIZE)
+    first, second = solve(by_variable), solve(by_row)
+    assert first.status == second.status == OPTIMAL
+    assert first.objective_value == pytest.approx(11.0)
+    assert np.allclose(first.values, second.values)
+
+
+def test_extra_rows_are_stacked_under_the_matrix(gurobi):
+    from GurobiSolver import GurobiSolverBuilder
+    # z >= 1 as -z <= -1 moves one unit of the shared row from y to z
+    builder = (GurobiSolverBuilder().add_variables(3).set_constraints_matrix(A, b)
+               .add_constraint_rows(sp.csr_matrix([[0.0, 0.0, -1.0]]), [-1.0]).set_objective(c, MAXIMIZE))
+    with builder.build() as solver:
+        solver.solve()
+        result = solver.get_result()
+        assert np.allclose(solver.get_constraint_slacks(), [0.0, 3.0, 0.0, 0.0])
+    assert result.objective_value == pytest.approx(10.0)
+    assert np.allclose(result.values, [3.0, 0.0, 1.0])
+
+
+def test_mismatched_right_hand_side_is_rejected(gurobi):
+    from GurobiSolver import GurobiSolverBuilder
+    builder = GurobiSolverBuilder().add_variables(3).set_constraints_matrix(A, b[:2]).set_objective(c, MAXIMIZE)
+    with pytest.raises(ValueError, match="3 rows but 2"):
+        builder.build()
+
+
+@pytest.mark.parametrize("presolve", [True, False])
+def test_gurobi_and_highs_agree(gurobi, presolve):
+    results = []
+    for backend in ("gurobi", "highs"):
+        builder = (make_builder(backend).add_variables(3, vtypes="I").set_constraints_matrix(A, [4.5, 6.5, 3.5])
+                   .set_presolve(presolve).set_objective(c, MAXIMIZE))
+        results.append(solve(builder))
+    assert results[0].status == results[1].status == OPTIMAL
+    assert results[0].objective_value == pytest.approx(results[1].objective_value)
+    assert results[0].objective_value == pytest.approx(11.0)
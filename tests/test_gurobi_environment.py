@@ -0,0 +1,87 @@
+import gc
+import logging
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def pool(gurobi):
+    from GurobiEnvironment import EnvironmentPool
+    pool = EnvironmentPool({"OutputFlag": 0}, size=2)
+    yield pool
+    pool.configure(size=0)
+
+
+def test_released_models_hand_their_environment_on(pool):
+    for _ in range(3):
+        model = pool.model("reused")
+        x = model.addVar(ub=2.0, obj=-1.0)
+        model.optimize()
+        assert x.X == 2.0
+        pool.release(model)
+        # a second release is harmless
+        pool.release(model)
+    assert pool.memory_usage()["environments_started"] == 1
+    assert pool.memory_usage()["live_models"] == 0 and pool.memory_usage()["idle_environments"] == 1
+
+
+def test_forgotten_model_is_returned_by_the_garbage_collector(pool):
+    model = pool.model()
+    assert pool.memory_usage()["live_models"] == 1
+    del model
+    gc.collect()
+    assert pool.memory_usage() == {"live_models": 0, "idle_environments": 1, "environments_started": 1,
+                                   "native_bytes": 0.0}
+
+
+def test_idle_environments_are_capped(pool):
+    models = [pool.model() for _ in range(4)]
+    for model in models:
+        pool.release(model)
+    assert pool.memory_usage()["environments_started"] == 4
+    assert pool.memory_usage()["idle_environments"] == 2
+    pool.configure(size=1)
+    assert pool.memory_usage()["idle_environments"] == 1
+
+
+def test_idle_environment_takes_the_latest_parameters(pool):
+    pool.release(pool.model())
+    pool.configure({"Threads": 1})
+    model = pool.model()
+    assert model.Params.Threads == 1
+    pool.release(model)
+
+
+def test_models_on_several_threads_each_get_an_environment(pool):
+    errors = []
+
+    def solve():
+        try:
+            for _ in range(5):
+                model = pool.model()
+                model.addVar(ub=1.0, obj=-1.0)
+                model.optimize()
+                assert model.ObjVal == -1.0
+                pool.release(model)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=solve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert pool.memory_usage()["live_models"] == 0
+    assert pool.memory_usage()["environments_started"] <= 4
+
+
+@pytest.mark.parametrize("text, parameters", [('{"Threads": 2}', {"Threads": 2}), ("[1, 2]", {}), ("Threads=2", {})])
+def test_parameters_come_from_the_environment(gurobi, monkeypatch, caplog, text, parameters):
+    import GurobiEnvironment
+    monkeypatch.setattr(GurobiEnvironment, "_pool", None)
+    monkeypatch.setenv(GurobiEnvironment.PARAMETERS_ENVIRONMENT_VARIABLE, text)
+    with caplog.at_level(logging.WARNING, logger="telemetry"):
+        assert GurobiEnvironment.environment_pool().parameters == parameters
+    assert ("ignoring SOLVER_GUROBI_PARAMETERS" in caplog.text) == (not parameters)
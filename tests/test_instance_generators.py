@@ -0,0 +1,57 @@
+import json
+
+import numpy as np
+import pytest
+
+import benchmark
+from InstanceGenerators import celebrity_instance, conflict_pairs, planning_instance, production_instance
+
+
+def test_same_seed_gives_the_same_production_instance():
+    A, capacities, benefits, demand = production_instance(50, resources=4, density=0.5, seed=7)
+    same = production_instance(50, resources=4, density=0.5, seed=7)
+    assert (A != same[0]).nnz == 0
+    for array, same_array in zip((capacities, benefits, demand), same[1:]):
+        assert np.array_equal(array, same_array)
+    assert not np.array_equal(benefits, production_instance(50, resources=4, density=0.5, seed=8)[2])
+    assert A.shape == (4, 50)
+    # every item uses at least one resource, and capacities cover a third of the demand
+    assert np.all(np.diff(A.tocsc().indptr) >= 1)
+    assert np.allclose(capacities, A @ demand / 3)
+
+
+def test_same_seed_gives_the_same_guests():
+    first, *limits = celebrity_instance(200, 0.2, 0.01, seed=3)
+    second, *same_limits = celebrity_instance(200, 0.2, 0.01, seed=3)
+    assert first.names == second.names and limits == same_limits
+    for column in ("salaries", "masses", "popularities", "vips", "conflict_pairs"):
+        assert np.array_equal(getattr(first, column), getattr(second, column))
+    assert first.vips.any()
+    pairs = first.conflict_pairs
+    assert np.all(pairs[:, 0] < pairs[:, 1]) and len(np.unique(pairs, axis=0)) == len(pairs)
+
+
+@pytest.mark.parametrize("people, density", [(0, 0.5), (1, 0.5), (100, 0.0)])
+def test_no_conflicts_to_draw(people, density):
+    assert conflict_pairs(people, density, np.random.default_rng(0)).shape == (0, 2)
+
+
+def test_planning_instance_has_no_weekend_hours():
+    instance = planning_instance(5, 14, seed=1)
+    assert instance.demand.shape == (14, 5) and instance.capacities.shape == (14, 3)
+    assert np.all(instance.capacities[[5, 6, 12, 13], :2] == 0)
+    assert np.array_equal(instance.demand, planning_instance(5, 14, seed=1).demand)
+
+
+def test_benchmark_flags_slower_phases_and_changed_objectives(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    assert benchmark.main(["--models", "production", "--production-sizes", "50", "--repeats", "1", "--backend",
+                           "highs", "--output", str(baseline)]) == 0
+    report = json.loads(baseline.read_text())
+    record = report["results"][0]
+    assert set(record["timings"]) == set(benchmark.PHASES)
+    slower = dict(record, timings={phase: seconds * 10 + 1 for phase, seconds in record["timings"].items()},
+                  objective_value=record["objective_value"] + 1)
+    regressions = benchmark.compare([slower], report, tolerance=0.25, min_delta=0.005)
+    assert {regression["phase"] for regression in regressions} == set(benchmark.PHASES) | {"objective_value"}
+    assert benchmark.compare([record], report, tolerance=0.25, min_delta=0.005) == []
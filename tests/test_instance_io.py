@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from InstanceIO import read_celebrities, read_production_csv
+
+HEADER = "name,salary,mass,popularity,vip,problems_with\n"
+PRODUCTION_HEADER = "manual_hours,machine_hours,raw_materials,price,demand\n"
+
+
+def test_short_celebrity_row_names_its_line(tmp_path):
+    path = tmp_path / "celebrities.csv"
+    path.write_text(HEADER + "Bob,10,60,5,true,\nAlice,10,60,5\n")
+    with pytest.raises(ValueError, match=r"celebrities.csv:3: expected at least 5 columns"):
+        read_celebrities(str(path))
+
+
+def test_blank_celebrity_rows_are_skipped(tmp_path):
+    path = tmp_path / "celebrities.csv"
+    path.write_text(HEADER + "Bob,10,60,5,true,\n\nAlice,12,61,4,false,Bob\n\n")
+    columns = read_celebrities(str(path))
+    assert columns.names == ["Bob", "Alice"]
+    assert columns.problems_with == [[], ["Bob"]]
+
+
+@pytest.mark.parametrize("row, message", [
+    ("1,2,abc,4,5", r"items.csv:5: raw_materials is not a number: 'abc'"),
+    ("1,2,3,4", r"items.csv:5: expected 5 values, found 4"),
+    ("1,2,3,-4,5", r"items.csv:5: price is negative or missing"),
+    ("1,2,3,4,nan", r"items.csv:5: demand is negative or missing"),
+])
+def test_bad_production_cell_names_its_line(tmp_path, row, message):
+    path = tmp_path / "items.csv"
+    # the blank line still counts, and the bad row sits in the second chunk
+    path.write_text(PRODUCTION_HEADER + "1,2,3,4,5\n\n1,2,3,4,5\n" + row + "\n")
+    with pytest.raises(ValueError, match=message):
+        read_production_csv(str(path), chunk_rows=2)
+
+
+def test_production_rows_are_read_in_chunks(tmp_path):
+    path = tmp_path / "items.csv"
+    items = np.arange(35.0).reshape(7, 5)
+    path.write_text(PRODUCTION_HEADER + "".join(",".join(f"{v:g}" for v in row) + "\n" for row in items))
+    assert np.array_equal(read_production_csv(str(path), chunk_rows=3), items)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from PyQt5.QtCore import Qt
+
+from PL_Problem import ItemTableModel, SolutionTableModel, parse_number
+from Sensitivity import Sensitivity
+
+
+@pytest.fixture
+def items(qt_app):
+    model = ItemTableModel()
+    model.add_items(np.arange(10.0).reshape(2, 5) + 1)
+    return model
+
+
+@pytest.mark.parametrize("text, number", [("12", 12.0), (" 2.5 ", 2.5), (".5", 0.5), ("", None), ("1.2.3", None),
+                                          ("-1", None), ("abc", None)])
+def test_parse_number(text, number):
+    assert parse_number(text) == number
+
+
+def test_edit_is_parsed_once_and_kept_as_a_number(items):
+    assert items.setData(items.index(1, 3), "42.5")
+    assert items.values[1, 3] == 42.5
+    assert items.data(items.index(1, 3)) == "42.5"
+    assert items.first_invalid() is None
+
+
+def test_invalid_cell_keeps_its_text_and_is_reported(items):
+    items.setData(items.index(1, 2), "12x")
+    assert np.isnan(items.values[1, 2])
+    assert items.data(items.index(1, 2)) == "12x"
+    assert items.first_invalid() == (1, 2)
+    items.setData(items.index(1, 2), "12")
+    assert items.first_invalid() is None
+
+
+def test_new_rows_are_empty_and_ids_stay_stable(items):
+    items.add_items(count=2)
+    assert items.rowCount() == 4
+    assert items.first_invalid() == (2, 0)
+    items.setData(items.index(3, 0), "bad")
+    items.remove_items([0, 2])
+    # ids are never reused, and the invalid text moves with its row
+    assert items.item_ids == [1, 3]
+    assert items.data(items.index(1, 0)) == "bad"
+    items.add_items(np.ones((1, 5)))
+    assert items.item_ids == [1, 3, 4]
+    assert items.items().shape == (3, 5)
+
+
+def test_solution_shows_the_top_k_in_sort_order(qt_app):
+    solution = SolutionTableModel(top_k=3)
+    solution.set_solution(["Item_1", "Item_2", "Item_3", "Item_4", "Item_5"], [4.0, 0.0, 9.0, 1.0, 7.0])
+    shown = lambda: [solution.data(solution.index(row, 0)) for row in range(solution.rowCount())]
+    assert shown() == ["Item_3", "Item_5", "Item_1"]
+    assert solution.columnCount() == 2
+    solution.sort(0, Qt.AscendingOrder)
+    assert shown() == ["Item_1", "Item_2", "Item_3"]
+    solution.set_top_k(10)
+    assert solution.rowCount() == 5
+
+
+def test_sensitivity_columns_sort_by_reduced_cost(qt_app):
+    sensitivity = Sensitivity(10.0, [1.0, 0.0, 2.0], [3.0, 1.0, 2.0], [4.0], [1.0], [0.0], [0.0], [8.0],
+                              [0.0, -2.0, 0.0], [2.0, -np.inf, 1.0], [np.inf, 3.0, 4.0], ["a", "b", "c"], ["r"])
+    solution = SolutionTableModel()
+    solution.set_solution(["a", "b", "c"], [1.0, 0.0, 2.0], sensitivity)
+    assert solution.columnCount() == 5
+    solution.sort(2, Qt.AscendingOrder)
+    assert [solution.data(solution.index(row, 0)) for row in range(3)] == ["b", "a", "c"]
+    # a later solve without a report falls back to the quantity column
+    solution.set_solution(["a", "b", "c"], [1.0, 0.0, 2.0])
+    assert solution.sort_column == 1 and solution.columnCount() == 2
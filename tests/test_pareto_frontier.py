@@ -0,0 +1,61 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from ParetoFrontier import ParetoPoint, SelectionInstance, non_dominated, pareto_frontier, warm_start
+from SolverBackend import OPTIMAL
+
+# ten guests, two VIPs, a few conflicts; small enough to enumerate every list
+SALARIES = [30.0, 45.0, 20.0, 60.0, 25.0, 50.0, 35.0, 40.0, 15.0, 55.0]
+MASSES = [70.0, 80.0, 60.0, 90.0, 65.0, 75.0, 85.0, 70.0, 55.0, 95.0]
+POPULARITIES = [5.0, 8.0, 3.0, 9.0, 4.0, 7.0, 6.0, 6.0, 2.0, 10.0]
+VIPS = [False, True, False, False, False, False, True, False, False, False]
+CONFLICTS = [[1, 3], [3, 9], [5, 9], [0, 2]]
+SHIP_WEIGHT, BUDGET = 400.0, 220.0
+
+
+def point(salary, popularity, epsilon=None):
+    return ParetoPoint(epsilon if epsilon is not None else salary, OPTIMAL, np.array([0]), salary, popularity, 1)
+
+
+def best_popularity(instance, salary):
+    # the best total popularity of any allowed list costing at most salary, by enumeration
+    best = -np.inf
+    for chosen in itertools.product((0, 1), repeat=len(SALARIES)):
+        x = np.array(chosen, dtype=float)
+        if (x @ instance.salaries <= salary + 1e-9 and x @ instance.masses <= SHIP_WEIGHT
+                and x @ instance.vips >= 1 and all(x[clique].sum() <= 1 for clique in CONFLICTS)):
+            best = max(best, x @ instance.popularities)
+    return best
+
+
+def test_non_dominated_keeps_the_cheapest_of_each_step():
+    points = [point(50, 10), point(40, 10), point(30, 8), point(45, 7), point(60, 12), point(60, 12 + 1e-9),
+              ParetoPoint(70, "infeasible")]
+    frontier = non_dominated(points, "popularity")
+    # equal salaries and measures within the tolerance count once
+    assert [(p.salary, p.popularity) for p in frontier] == [(30, 8), (40, 10), (60, pytest.approx(12))]
+
+
+def test_warm_start_is_the_widest_list_that_fits():
+    done = [point(30, 8, epsilon=30), point(48, 10, epsilon=55), point(70, 12, epsilon=70)]
+    done[1].selected = np.array([1, 3])
+    assert warm_start(done, 60, 5).tolist() == [0, 1, 0, 1, 0]
+    assert warm_start(done, 20, 5) is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_every_frontier_point_is_optimal_for_its_salary(workers):
+    instance = SelectionInstance(SALARIES, MASSES, POPULARITIES, VIPS, SHIP_WEIGHT, 1, CONFLICTS)
+    reported = []
+    frontier = pareto_frontier(instance, BUDGET, steps=6, workers=workers, backend="highs", report=reported.append)
+    assert len(reported) == 6
+    salaries = [p.salary for p in frontier]
+    popularities = [p.popularity for p in frontier]
+    assert salaries == sorted(salaries) and popularities == sorted(popularities)
+    assert popularities[-1] == best_popularity(instance, BUDGET)
+    for p in frontier:
+        assert p.popularity == best_popularity(instance, p.salary)
+        # the cheapest list with that popularity
+        assert best_popularity(instance, p.salary - 1e-3) < p.popularity
@@ -0,0 +1,105 @@
+import threading
+
+import numpy as np
+import pytest
+
+from InstanceGenerators import planning_instance
+from InstanceIO import read_planning, write_planning
+from ProductionPlanning import PlanningInstance, rolling_horizon, solve_plan
+from SolverBackend import LIMIT_REACHED, OPTIMAL
+
+
+def test_instance_shapes_are_checked():
+    items = np.ones((2, 5))
+    with pytest.raises(ValueError, match="expected demand"):
+        PlanningInstance(items, np.ones((3, 4)), np.ones((3, 3)), 2.0, 1.0)
+    with pytest.raises(ValueError, match="expected demand"):
+        PlanningInstance(items, np.ones((3, 2)), np.ones((3, 2)), 2.0, 1.0)
+
+
+def test_commit_must_fit_in_the_window():
+    instance = planning_instance(3, 7, seed=1)
+    with pytest.raises(ValueError, match="commit"):
+        rolling_horizon(instance, 7, 0)
+    with pytest.raises(ValueError, match="commit"):
+        rolling_horizon(instance, 7, 8)
+
+
+def test_single_window_matches_the_whole_plan():
+    instance = planning_instance(5, 10, seed=3)
+    whole = solve_plan(instance, backend="highs")
+    rolled = rolling_horizon(instance, 10, 10, backend="highs")
+    assert whole.status == rolled.status == OPTIMAL
+    assert rolled.windows == 1
+    assert rolled.profit(instance).sum() == pytest.approx(whole.profit(instance).sum())
+
+
+def test_plan_balances_stock_and_respects_demand_and_capacity():
+    instance = planning_instance(5, 14, seed=4)
+    result = rolling_horizon(instance, 7, 3, backend="highs")
+    assert result.status == OPTIMAL
+    assert result.periods_planned == 14
+    carried = np.vstack([instance.initial_stock, result.stock[:-1]])
+    assert np.allclose(carried + result.make - result.sales, result.stock, atol=1e-6)
+    assert np.all(result.sales <= instance.demand + 1e-6)
+    assert np.all(result.make >= -1e-9) and np.all(result.stock >= -1e-9)
+    used = result.make @ instance.items[:, :3]
+    assert np.all(used <= instance.capacities + 1e-6)
+
+
+def test_later_windows_improve_on_a_myopic_plan():
+    # a week-long window sees demand ahead, so it is never worse than planning a period at a time
+    instance = planning_instance(5, 14, seed=5)
+    myopic = rolling_horizon(instance, 1, 1, backend="highs")
+    ahead = rolling_horizon(instance, 7, 7, backend="highs")
+    assert ahead.profit(instance).sum() >= myopic.profit(instance).sum() - 1e-6
+
+
+def test_cancelled_plan_has_no_periods():
+    cancel_event = threading.Event()
+    cancel_event.set()
+    instance = planning_instance(3, 7, seed=1)
+    result = rolling_horizon(instance, 7, 7, backend="highs", cancel_event=cancel_event)
+    assert not result.has_solution()
+    assert result.to_dict()["make"] == []
+
+
+def test_result_record_holds_the_plan_and_its_profit():
+    instance = planning_instance(4, 7, seed=6)
+    result = solve_plan(instance, backend="highs")
+    record = result.to_dict(instance)
+    assert record["status"] == OPTIMAL
+    assert record["periods_planned"] == 7
+    assert len(record["names"]) == 4
+    assert np.allclose(record["make"], result.make)
+    assert record["profit"] == pytest.approx(sum(record["profit_per_period"]))
+    assert "profit" not in result.to_dict()
+
+
+def test_planning_file_round_trip(tmp_path):
+    instance = planning_instance(4, 9, seed=7)
+    instance.initial_stock = np.arange(4.0)
+    path = tmp_path / "plan.bin"
+    write_planning(path, instance)
+    loaded = read_planning(path)
+    assert np.array_equal(loaded.items, instance.items)
+    assert np.array_equal(loaded.demand, instance.demand)
+    assert np.array_equal(loaded.capacities, instance.capacities)
+    assert np.array_equal(loaded.holding_costs, instance.holding_costs)
+    assert np.array_equal(loaded.initial_stock, instance.initial_stock)
+    assert (loaded.salary, loaded.raw_material_cost) == (instance.salary, instance.raw_material_cost)
+    assert solve_plan(loaded, backend="highs").profit(loaded).sum() == pytest.approx(
+        solve_plan(instance, backend="highs").profit(instance).sum())
+
+
+@pytest.mark.parametrize("backend", ["highs", "gurobi"])
+def test_time_limited_integer_plan_covers_every_period(backend, request):
+    if backend == "gurobi":
+        request.getfixturevalue("gurobi")
+    instance = planning_instance(10, 28, seed=2)
+    result = rolling_horizon(instance, 14, 7, backend=backend, integer=True, time_limit=1.0)
+    assert result.status in (OPTIMAL, LIMIT_REACHED)
+    assert result.periods_planned == instance.number_of_periods()
+    assert result.windows == 3
+    assert np.allclose(result.make, np.round(result.make))
+    assert result.profit(instance).sum() > 0
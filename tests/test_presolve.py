@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from Presolve import ROW_BOUND, ROW_DUPLICATE, ROW_EMPTY, ROW_KEPT, ROW_REDUNDANT, presolve_rows
+from ScipySolver import ScipySolverBuilder
+from SelectionProblem import build_selection_solver
+from SolverBackend import INFEASIBLE, MAXIMIZE
+
+
+def test_infeasible_empty_row_is_kept():
+    # 0 <= -1 next to an ordinary row
+    A = sp.csr_matrix(np.array([[0.0, 0.0], [1.0, 1.0]]))
+    info = presolve_rows(A, [-1.0, 1.0], [0.0, 0.0], [1.0, 1.0])
+    assert info.row_kind[0] == ROW_KEPT
+
+
+def test_selection_without_vips_is_infeasible():
+    # "at least one VIP" with no VIP in the list is an all-zero row with b < 0
+    with build_selection_solver([10, 20], [50, 60], [3, 4], [False, False], 200, 100, 1, [],
+                                backend="highs") as solver:
+        solver.solve()
+        assert solver.get_result().status == INFEASIBLE
+
+
+def test_every_row_kind_is_recognized():
+    A = np.array([[1.0, 1.0, 0.0],    # kept
+                  [0.0, 0.0, 0.0],    # empty, 0 <= 2
+                  [0.0, 2.0, 0.0],    # bound y <= 1.5
+                  [2.0, 2.0, 0.0],    # twice row 0 with a looser right-hand side
+                  [0.0, 1.0, 1.0]])   # at most 3 + 4 = 7 <= 9, redundant
+    b = [3.0, 2.0, 3.0, 8.0, 9.0]
+    info = presolve_rows(A, b, [0.0, 0.0, 0.0], [5.0, 5.0, 4.0])
+    assert info.row_kind.tolist() == [ROW_KEPT, ROW_EMPTY, ROW_BOUND, ROW_DUPLICATE, ROW_REDUNDANT]
+    assert info.kept_rows.tolist() == [0]
+    assert info.ubs[1] == 1.5 and info.ub_rows[1] == 2
+    assert info.row_target[3] == 0 and info.row_scale[3] == 2.0
+    assert info.summary() == {"rows": 5, "kept": 1, "bounds": 1, "duplicates": 1, "redundant": 1, "empty": 1}
+
+
+def test_integer_bounds_are_rounded_inward():
+    # 2x <= 5 and -2y <= -3 on integers become x <= 2 and y >= 2
+    info = presolve_rows(np.array([[2.0, 0.0], [0.0, -2.0]]), [5.0, -3.0], [0.0, 0.0], [10.0, 10.0],
+                         np.array([True, True]))
+    assert info.ubs.tolist() == [2.0, 10.0]
+    assert info.lbs.tolist() == [0.0, 2.0]
+
+
+def test_duals_and_slacks_match_the_unreduced_model():
+    # maximize 3x + 2y with x + y <= 4, 2x + 2y <= 10, x <= 3 (a bound row) and y <= 20 (redundant)
+    A = np.array([[1.0, 1.0], [2.0, 2.0], [1.0, 0.0], [0.0, 1.0]])
+    b = [4.0, 10.0, 3.0, 20.0]
+    reports = []
+    for presolve in (True, False):
+        builder = (ScipySolverBuilder().add_variables(2, ubs=10).set_constraints_matrix(A, b)
+                   .set_presolve(presolve).set_objective([3, 2], MAXIMIZE))
+        with builder.build() as solver:
+            solver.solve()
+            reports.append((solver.get_objective_value(), solver.get_constraint_slacks(),
+                            solver.get_constraint_duals()))
+    (reduced_objective, reduced_slacks, reduced_duals), (objective, slacks, duals) = reports
+    assert reduced_objective == pytest.approx(objective) == pytest.approx(11.0)
+    assert np.allclose(reduced_slacks, slacks)
+    assert np.allclose(reduced_duals, duals)
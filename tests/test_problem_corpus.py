@@ -0,0 +1,97 @@
+import json
+import logging
+
+import numpy as np
+import pytest
+
+import replay_corpus
+from batch_solve import read_specs
+from InstanceGenerators import celebrity_instance
+from ProblemCorpus import ProblemCorpus, corpus_from_environment
+from ProductionProblem import build_production_solver
+from SelectionProblem import build_selection_solver
+from SolverBackend import INTERRUPTED, OPTIMAL, SolveResult
+
+ITEMS = np.array([[1.0, 2.0, 3.0, 20.0, 4.0], [2.0, 1.0, 1.0, 15.0, 6.0]])
+CAPACITIES = [10.0, 10.0, 10.0]
+
+
+def solved(solver):
+    with solver:
+        solver.solve()
+        return solver.get_result()
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    corpus = ProblemCorpus(str(tmp_path / "corpus"))
+    corpus.record_production(ITEMS, 2.0, 1.0, CAPACITIES,
+                             solved(build_production_solver(ITEMS, 2.0, 1.0, CAPACITIES, backend="highs")))
+    columns, ship_weight, budget, min_vip_count = celebrity_instance(25, vip_ratio=0.3, conflict_density=0.1, seed=6)
+    cliques = [list(pair) for pair in columns.conflict_pairs.tolist()]
+    result = solved(build_selection_solver(columns.salaries, columns.masses, columns.popularities, columns.vips,
+                                           ship_weight, budget, min_vip_count, cliques, backend="highs"))
+    corpus.record_selection(columns, ship_weight, budget, min_vip_count, result)
+    return corpus
+
+
+def test_entries_are_batch_specs_with_their_recording(corpus):
+    specs = read_specs([corpus.directory])
+    assert sorted(spec["type"] for spec in specs) == ["production", "selection"]
+    production = next(spec for spec in specs if spec["type"] == "production")
+    assert production["capacities"] == CAPACITIES
+    assert production["recorded"]["backend"] == "highs" and production["recorded"]["status"] == OPTIMAL
+    assert production["data"].endswith(".bin")
+
+
+def test_cache_hits_and_cancelled_solves_are_not_recorded(tmp_path):
+    corpus = ProblemCorpus(str(tmp_path))
+    cached = SolveResult(OPTIMAL, 1.0, np.zeros(2), ["a", "b"], "highs", cached=True)
+    cancelled = SolveResult(INTERRUPTED, None, None, ["a", "b"], "highs")
+    assert corpus.record_production(ITEMS, 2.0, 1.0, CAPACITIES, cached) is None
+    assert corpus.record_production(ITEMS, 2.0, 1.0, CAPACITIES, cancelled) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_recording_is_logged_not_raised(tmp_path, caplog):
+    corpus = ProblemCorpus(str(tmp_path / "corpus"))
+    (tmp_path / "corpus").rmdir()
+    result = SolveResult(OPTIMAL, 1.0, np.zeros(2), ["a", "b"], "highs")
+    with caplog.at_level(logging.WARNING, logger="telemetry"):
+        assert corpus.record_production(ITEMS, 2.0, 1.0, CAPACITIES, result) is None
+    assert "could not record" in caplog.text
+
+
+def test_recording_is_off_without_the_variable(monkeypatch):
+    monkeypatch.delenv("SOLVER_CORPUS", raising=False)
+    assert corpus_from_environment() is None
+
+
+def test_replay_matches_its_recording(corpus, tmp_path):
+    output = tmp_path / "replay.jsonl"
+    assert replay_corpus.main([corpus.directory, "--workers", "1", "--output", str(output),
+                               "--min-delta", "10"]) == 0
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert len(records) == 2
+    for record in records:
+        assert record["regressions"] == []
+        assert record["objective_value"] == pytest.approx(record["recorded"]["objective_value"])
+
+
+def test_changed_objective_is_a_regression(corpus, tmp_path):
+    spec_path = next(path for path in (tmp_path / "corpus").iterdir() if path.name.endswith("production.json"))
+    spec = json.loads(spec_path.read_text())
+    spec["recorded"]["objective_value"] += 1.0
+    spec_path.write_text(json.dumps(spec))
+    assert replay_corpus.main([str(spec_path), "--workers", "1", "--output", str(tmp_path / "replay.jsonl"),
+                               "--min-delta", "10"]) == 1
+
+
+def test_regressions():
+    record = {"status": OPTIMAL, "objective_value": 10.0, "solve_time": 2.0,
+              "recorded": {"status": OPTIMAL, "objective_value": 10.0, "solve_time": 1.0}}
+    assert replay_corpus.regressions(record, tolerance=0.25, min_delta=0.05) == ["solve time 1.000s -> 2.000s"]
+    # within the noise floor
+    assert replay_corpus.regressions(record, tolerance=0.25, min_delta=1.5) == []
+    record.update(status="infeasible", objective_value=None)
+    assert replay_corpus.regressions(record, tolerance=0.25, min_delta=1.5) == ["status optimal -> infeasible"]
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from InstanceGenerators import production_instance
+from ProductionProblem import DEMAND, PRICE, build_production_solver
+from SolverBackend import OPTIMAL
+
+
+def production_items(count, seed=0):
+    A, capacities, benefits, demand = production_instance(count, seed=seed)
+    items = np.zeros((count, 5))
+    items[:, :3] = A.T.toarray()
+    items[:, PRICE] = benefits + items[:, 0] * 2.0 + items[:, 2] * 1.0
+    items[:, DEMAND] = demand
+    return items, capacities
+
+
+def cold_objective(items, salary, raw_material_cost, capacities):
+    with build_production_solver(items, salary, raw_material_cost, capacities, backend="highs") as solver:
+        solver.solve()
+        return solver.get_result().objective_value
+
+
+def test_every_edit_gives_the_cold_optimum(gurobi):
+    from ProductionModel import ProductionModel
+    items, capacities = production_items(30)
+    ids = list(range(30))
+    edits = []
+    edits.append((ids, items, 2.0, 1.0, capacities))
+    edits.append((ids, items, 2.5, 1.0, capacities))
+    edits.append((ids, items, 2.5, 1.0, capacities * 1.2))
+    changed = items.copy()
+    changed[4, PRICE] *= 3
+    changed[7, 1] += 5
+    edits.append((ids, changed, 2.5, 1.0, capacities * 1.2))
+    extra, _ = production_items(3, seed=9)
+    edits.append((ids + [30, 31, 32], np.vstack([changed, extra]), 2.5, 1.0, capacities * 1.2))
+    kept = [i for i in range(33) if i not in (0, 5, 31)]
+    edits.append((kept, np.vstack([changed, extra])[kept], 2.5, 0.5, capacities * 1.2))
+    with ProductionModel() as model:
+        for item_ids, rows, salary, raw_material_cost, caps in edits:
+            model.sync(item_ids, rows, salary, raw_material_cost, caps)
+            result = model.solve()
+            assert result.status == OPTIMAL
+            assert result.objective_value == pytest.approx(cold_objective(rows, salary, raw_material_cost, caps))
+            assert result.names == [f"Item_{i + 1}" for i in range(len(item_ids))]
+
+
+def test_small_edit_restarts_from_the_last_basis(gurobi):
+    from ProductionModel import ProductionModel
+    items, capacities = production_items(200, seed=3)
+    with ProductionModel() as model:
+        model.sync(range(200), items, 2.0, 1.0, capacities)
+        model.solve()
+        cold_iterations = model.model.IterCount
+        model.sync(range(200), items, 2.0, 1.0, capacities * 1.01)
+        model.solve()
+        assert model.model.IterCount < cold_iterations
+
+
+def test_items_must_keep_their_order(gurobi):
+    from ProductionModel import ProductionModel
+    items, capacities = production_items(3)
+    with ProductionModel() as model:
+        model.sync([0, 1, 2], items, 2.0, 1.0, capacities)
+        with pytest.raises(ValueError, match="relative order"):
+            model.sync([1, 0, 2], items, 2.0, 1.0, capacities)
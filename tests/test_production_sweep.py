@@ -0,0 +1,47 @@
+import logging
+import threading
+
+import numpy as np
+import pytest
+
+from ProductionProblem import production_arrays
+from ProductionSweep import SWEEP_METHODS, point_inputs, sweep_production, sweep_values
+from SolverBackend import INTERRUPTED, OPTIMAL
+
+ITEMS = np.array([[1.0, 2.0, 3.0, 20.0, 4.0], [2.0, 1.0, 1.0, 15.0, 6.0], [1.0, 1.0, 2.0, 12.0, 5.0]])
+CAPACITIES = [10.0, 12.0, 14.0]
+
+
+@pytest.mark.parametrize("parameter, values", [("salary", sweep_values(0.0, 8.0, 5)),
+                                               ("machine_hours", sweep_values(0.0, 20.0, 5))])
+def test_every_method_matches_independent_highs_solves(gurobi, parameter, values):
+    expected = sweep_production(ITEMS, 2.0, 1.0, CAPACITIES, parameter, values, backend="highs")
+    assert expected.statuses == [OPTIMAL] * 5
+    for method in SWEEP_METHODS:
+        result = sweep_production(ITEMS, 2.0, 1.0, CAPACITIES, parameter, values, method=method, backend="gurobi")
+        assert result.statuses == [OPTIMAL] * 5
+        assert np.allclose(result.objective_values, expected.objective_values)
+        # ties allow other plans, but each one must be feasible and reach the objective
+        for value, objective_value, plan in zip(values, result.objective_values, result.plans):
+            A, b, benefits, demand = production_arrays(ITEMS, *point_inputs(parameter, value, 2.0, 1.0, CAPACITIES))
+            assert np.all(A @ plan <= b + 1e-6) and np.all(plan <= demand + 1e-6)
+            assert benefits @ plan == pytest.approx(objective_value)
+
+
+def test_scenario_sweep_is_reported_and_cancellable(gurobi, caplog):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with caplog.at_level(logging.INFO, logger="telemetry"):
+        result = sweep_production(ITEMS, 2.0, 1.0, CAPACITIES, "salary", sweep_values(0.0, 8.0, 3),
+                                  method="scenarios", backend="gurobi", cancel_event=cancel_event)
+    assert result.statuses == [INTERRUPTED] * 3
+    assert np.isnan(result.objective_values).all()
+    optimize_events = [record for record in caplog.records if getattr(record, "event", None) == "optimize"]
+    assert [record.fields["status"] for record in optimize_events] == [INTERRUPTED]
+
+
+def test_sweeps_other_than_independent_need_gurobi():
+    with pytest.raises(ValueError, match="the sequential sweep needs the gurobi backend"):
+        sweep_production(ITEMS, 2.0, 1.0, CAPACITIES, "salary", [1.0], method="sequential", backend="highs")
+    with pytest.raises(ValueError, match="unknown sweep parameter"):
+        sweep_production(ITEMS, 2.0, 1.0, CAPACITIES, "price", [1.0], backend="highs")
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from InstanceGenerators import celebrity_instance
+from CelebrityStore import CelebrityStore
+from ScipySolver import ScipySolverBuilder
+from SelectionProblem import build_selection_solver
+from SolverBackend import EQUAL, GREATER_EQUAL, LESS_EQUAL, LIMIT_REACHED, MAXIMIZE, OPTIMAL, limit_time
+
+
+def test_time_limited_mip_keeps_its_incumbent():
+    # HiGHS has an incumbent after about 0.4 s on an idle machine and needs about 9 s to prove the
+    # optimum of every stage, so the limit leaves room for a loaded machine and is still reached
+    columns, ship_weight, budget, min_vip_count = celebrity_instance(3000, seed=3, conflict_density=0.002)
+    store = CelebrityStore()
+    store.extend(columns.names, columns.salaries, columns.masses, columns.popularities, columns.vips,
+                 conflict_pairs=columns.conflict_pairs)
+    with build_selection_solver(store.salary_column(), store.mass_column(), store.popularity_column(),
+                                store.vip_column(), ship_weight, budget, min_vip_count,
+                                store.clique_cover(), backend="highs") as solver:
+        limit_time(solver, 3.0)
+        solver.solve()
+        result = solver.get_result()
+    assert result.status in (LIMIT_REACHED, OPTIMAL)
+    assert result.has_solution()
+    # the limit covers every objective stage together
+    assert result.solve_time < 15.0
+    assert np.all(store.salary_column() @ result.values <= budget + 1e-6)
+
+
+def test_add_constraint_appends_a_row():
+    # maximize x + y with x, y <= 4, then x + y <= 5, x - y >= 1 and x = 3 one row at a time
+    builder = (ScipySolverBuilder()
+               .add_variables(2, names=["x", "y"], ubs=4)
+               .set_constraints_matrix(sp.identity(2), [4, 4])
+               .set_objective([1, 1], MAXIMIZE))
+    builder.add_constraint([1, 1], LESS_EQUAL, 5).add_constraint([1, -1], GREATER_EQUAL, 1)
+    with builder.build() as solver:
+        solver.solve()
+        assert solver.get_status() == OPTIMAL
+        assert solver.get_objective_value() == pytest.approx(5.0)
+    with builder.add_constraint(np.array([1.0, 0.0]), EQUAL, 3).build() as solver:
+        solver.solve()
+        assert solver.get_variables() == pytest.approx({"x": 3.0, "y": 2.0})
+        # one slack per row, the equality adds two
+        assert len(solver.get_constraint_slacks()) == 6
+
+
+def test_add_constraint_rejects_expressions_and_unknown_senses():
+    builder = ScipySolverBuilder().add_variables(2)
+    with pytest.raises(TypeError, match="coefficients"):
+        builder.add_constraint(object(), LESS_EQUAL, 1)
+    with pytest.raises(ValueError, match="sense"):
+        builder.add_constraint([1, 1], "<=", 1)
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from ProductionProblem import build_production_solver
+from ProductionSweep import what_if
+from Sensitivity import sensitivity_from_dict
+from SolutionCache import SolutionCache
+from SolverBackend import OPTIMAL, SolveResult
+
+# two items sharing manual hours, machine hours and raw materials; the optimum has manual and
+# machine hours tight and raw materials slack
+ITEMS = np.array([[1.0, 2.0, 1.0, 10.0, 8.0], [2.0, 1.0, 1.0, 12.0, 8.0]])
+CAPACITIES = [10.0, 11.0, 30.0]
+
+
+def solve(items=ITEMS, salary=2.0, raw_material_cost=1.0, capacities=CAPACITIES, backend="gurobi", cache=None):
+    with build_production_solver(items, salary, raw_material_cost, capacities, backend=backend, cache=cache) as solver:
+        if backend == "gurobi":
+            solver.model.Params.OutputFlag = 0
+        solver.solve()
+        return solver.get_result()
+
+
+@pytest.fixture
+def report(gurobi):
+    result = solve()
+    assert result.status == OPTIMAL
+    return result.sensitivity
+
+
+def test_rhs_within_its_range_gives_the_re_solved_profit(report):
+    assert report.slack[2] == pytest.approx(23.0) and report.pi[2] == pytest.approx(0.0)
+    for row in (0, 1):
+        assert report.rhs_low[row] < report.b[row] < report.rhs_up[row]
+        rhs = (report.b[row] + report.rhs_up[row]) / 2
+        capacities = list(CAPACITIES)
+        capacities[row] = rhs
+        assert report.rhs_what_if(row, rhs) == pytest.approx(solve(capacities=capacities).objective_value)
+        assert report.rhs_what_if(row, report.rhs_up[row] + 1.0) is None
+
+
+def test_objective_changes_follow_the_100_percent_rule(report):
+    # half of the allowed increase of both coefficients is exactly 100% in total
+    up = report.c + (report.obj_up - report.c) / 2
+    up = np.where(np.isinf(up), report.c + 1.0, up)
+    assert report.objective_what_if(up) == pytest.approx(up @ report.x)
+    beyond = report.c.copy()
+    beyond[0] = report.obj_up[0] + 1.0
+    assert report.objective_what_if(beyond) is None
+    assert report.objective_what_if(report.c) == report.objective_value
+
+
+def test_what_if_on_the_page_inputs_matches_a_re_solve(report):
+    answer = what_if(report, ITEMS, 2.0, 1.0, CAPACITIES, "salary", 2.2)
+    assert answer == pytest.approx(solve(salary=2.2).objective_value)
+    # raw materials are slack and presolve drops their row: down to the 7 units used, the plan holds
+    assert what_if(report, ITEMS, 2.0, 1.0, CAPACITIES, "raw_materials", 8.0) == pytest.approx(report.objective_value)
+    assert what_if(report, ITEMS, 2.0, 1.0, CAPACITIES, "raw_materials", 6.0) is None
+    with pytest.raises(ValueError, match="unknown parameter"):
+        what_if(report, ITEMS, 2.0, 1.0, CAPACITIES, "price", 1.0)
+
+
+def test_report_survives_a_round_trip(report):
+    copy = sensitivity_from_dict(report.to_dict())
+    assert copy.rhs_what_if(0, report.b[0]) == pytest.approx(report.objective_value)
+    assert np.array_equal(copy.obj_up, report.obj_up)
+    assert copy.row_names == report.row_names
+
+
+def test_live_model_cache_hit_after_a_builder_solve_keeps_the_report(gurobi):
+    from ProductionModel import ProductionModel
+    cache = SolutionCache()
+    # what-if re-solves go through the builder, and write the key the live model reads
+    assert solve(cache=cache).sensitivity is not None
+    with ProductionModel() as model:
+        model.set_cache(cache)
+        model.sync([0, 1], ITEMS, 2.0, 1.0, CAPACITIES)
+        result = model.solve()
+    assert result.cached
+    assert result.sensitivity is not None
+    assert np.allclose(result.sensitivity.pi, solve().sensitivity.pi)
+
+
+def test_what_if_failure_keeps_the_page_solution(qt_app):
+    from PL_Problem import ToyFactoryGUI
+    page = ToyFactoryGUI()
+    page.show_solution(SolveResult(OPTIMAL, 42.0, np.array([1.0, 2.0]), ["Item_1", "Item_2"], "highs"))
+    page.what_if_runner.failed.emit("out of memory")
+    assert page.solution_display.text() == "Optimal Objective Value: 42.0"
+    assert page.solution_model.rowCount() == 2
+    assert page.what_if_display.text() == "What-if failed: out of memory"
+    page.close()
@@ -0,0 +1,62 @@
+import numpy as np
+import scipy.sparse as sp
+
+from ScipySolver import ScipySolverBuilder
+from SolutionCache import CachedSolution, CachedSolver, SolutionCache, instance_key
+from SolverBackend import INFEASIBLE, MAXIMIZE, MINIMIZE, OPTIMAL
+
+A = np.array([[1.0, 2.0], [3.0, 0.0]])
+b = [4.0, 6.0]
+
+
+def key(A=A, b=b, sense=MAXIMIZE, backend="gurobi", lbs=(0.0, 0.0)):
+    return instance_key(A, b, [(np.array([1.0, 1.0]), sense)], lbs, [10.0, 10.0], ["C", "C"], ["x", "y"], backend)
+
+
+def test_key_ignores_the_matrix_representation():
+    # dense or sparse, with explicit zeros, -0.0 or unsorted column indices, the model is the same
+    unsorted = sp.csr_matrix((np.array([2.0, 1.0, 3.0, 0.0]), np.array([1, 0, 0, 1]), np.array([0, 2, 4])),
+                             shape=(2, 2))
+    assert key() == key(A=sp.csr_matrix(A)) == key(A=unsorted)
+    assert key(lbs=(-0.0, 0.0)) == key()
+
+
+def test_key_tells_models_and_backends_apart():
+    keys = {key(), key(b=[4.0, 7.0]), key(sense=MINIMIZE), key(backend="highs"), key(A=A.T)}
+    assert len(keys) == 5
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SolutionCache(maxsize=2)
+    cache.put("a", "first")
+    cache.put("b", "second")
+    assert cache.get("a") == "first"
+    cache.put("c", "third")
+    # "b" was used least recently once "a" was read back
+    assert cache.get("b") is None
+    assert cache.get("a") == "first" and cache.get("c") == "third"
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_second_build_of_the_same_instance_is_answered_from_the_cache():
+    cache = SolutionCache()
+    results = []
+    for _ in range(2):
+        builder = (ScipySolverBuilder().add_variables(2, names=["x", "y"], ubs=10).set_constraints_matrix(A, b)
+                   .set_objective([1, 1], MAXIMIZE).set_cache(cache))
+        with builder.build() as solver:
+            solver.solve()
+            results.append(solver.get_result())
+    assert [result.cached for result in results] == [False, True]
+    assert results[1].status == OPTIMAL
+    assert results[1].objective_value == results[0].objective_value
+    assert np.array_equal(results[1].values, results[0].values)
+    assert results[1].variables() == results[0].variables()
+
+
+def test_cached_infeasible_answer_has_no_solution():
+    cache = SolutionCache()
+    cache.put("k", CachedSolution(INFEASIBLE, None, None, ["x"]))
+    solver = CachedSolver(cache.get("k"))
+    assert not solver.has_solution()
+    assert solver.get_result().status == INFEASIBLE
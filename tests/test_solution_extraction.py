@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from ConflictKnapsack import ConflictKnapsackSolver
+from InstanceGenerators import celebrity_instance, production_instance
+from ProductionProblem import build_resource_lp
+from SolverBackend import name_index
+
+
+def test_name_index_keeps_the_first_position_of_a_name():
+    assert name_index(["a", "b", "a"]) == {"a": 0, "b": 1}
+
+
+def test_bulk_reads_match_the_per_variable_attributes(gurobi):
+    with build_resource_lp(*production_instance(300, seed=2), backend="gurobi") as solver:
+        solver.model.Params.OutputFlag = 0
+        solver.solve()
+        variables = solver.model.getVars()
+        arrays = solver.get_arrays()
+        assert set(arrays) == {"X", "LB", "UB", "RC"}
+        for attribute, values in arrays.items():
+            assert np.array_equal(values, [getattr(variable, attribute) for variable in variables])
+        assert solver.get_names() == [variable.VarName for variable in variables]
+        assert solver.get_variable("Item_17") == variables[16].X
+        assert solver.get_variables()["Item_300"] == variables[299].X
+        result = solver.get_result()
+        assert np.array_equal(result.values, arrays["X"])
+        assert np.array_equal(result.sensitivity.rc, arrays["RC"])
+
+
+def test_every_backend_answers_by_name():
+    columns, ship_weight, budget, min_vip_count = celebrity_instance(20, vip_ratio=0.3, seed=5)
+    solver = ConflictKnapsackSolver(columns.salaries, columns.masses, columns.popularities, columns.vips, ship_weight,
+                                    budget, min_vip_count, [])
+    solver.solve()
+    values = solver.get_values()
+    assert [solver.get_variable(name) for name in solver.names] == values.tolist()
+    assert solver.get_variables() == dict(zip(solver.names, values.tolist()))
+    with pytest.raises(KeyError):
+        solver.index_of("nobody")
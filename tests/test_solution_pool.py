@@ -0,0 +1,62 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from SelectionProblem import alternative_lists
+from SolverBackend import INFINITY, OPTIMAL, relative_gap
+
+SALARIES = np.array([30.0, 45.0, 20.0, 60.0, 25.0, 50.0, 35.0, 40.0, 15.0, 55.0])
+MASSES = np.array([70.0, 80.0, 60.0, 90.0, 65.0, 75.0, 85.0, 70.0, 55.0, 95.0])
+POPULARITIES = np.array([5.0, 8.0, 3.0, 9.0, 4.0, 7.0, 6.0, 6.0, 2.0, 10.0])
+VIPS = np.array([False, True, False, False, False, False, True, False, False, False])
+CONFLICTS = [[1, 3], [3, 9], [5, 9], [0, 2]]
+SHIP_WEIGHT, BUDGET = 400.0, 220.0
+
+
+def allowed_lists():
+    # every list that fits the ship and the budget, with a VIP and without a conflict
+    for chosen in itertools.product((0, 1), repeat=len(SALARIES)):
+        x = np.array(chosen, dtype=float)
+        if (x @ SALARIES <= BUDGET and x @ MASSES <= SHIP_WEIGHT and x @ VIPS >= 1
+                and all(x[clique].sum() <= 1 for clique in CONFLICTS)):
+            yield x
+
+
+def solve(backend, count=5, gap=1.0, report=None):
+    return alternative_lists(SALARIES, MASSES, POPULARITIES, VIPS, SHIP_WEIGHT, BUDGET, 1, CONFLICTS, count=count,
+                             gap=gap, backend=backend, report=report)
+
+
+def test_pool_holds_the_cheapest_lists_of_the_largest_head_count(gurobi):
+    found = []
+    result, pool = solve("gurobi", report=found.append)
+    assert result.status == OPTIMAL
+    head_count = max(x.sum() for x in allowed_lists())
+    assert np.round(result.values).sum() == head_count
+    cheapest = sorted(x @ SALARIES for x in allowed_lists() if x.sum() == head_count)[:5]
+    assert [solution.objective_value for solution in pool] == pytest.approx([-salary for salary in cheapest])
+    lists = {tuple(np.round(solution.values).astype(int)) for solution in pool}
+    assert len(lists) == len(pool)
+    assert pool[0].gap == 0.0
+    assert [solution.gap for solution in pool] == sorted(solution.gap for solution in pool)
+    assert found and all(solution.values is not None for solution in found)
+
+
+def test_pool_gap_drops_the_expensive_lists(gurobi):
+    _, pool = solve("gurobi", count=10, gap=0.05)
+    assert pool and all(solution.gap <= 0.05 + 1e-9 for solution in pool)
+
+
+def test_backends_without_a_pool_return_their_solution():
+    result, pool = solve("highs")
+    assert len(pool) == 1
+    assert pool[0].gap == 0.0
+    assert -pool[0].objective_value == pytest.approx(min(x @ SALARIES for x in allowed_lists()
+                                                         if x.sum() == np.round(result.values).sum()))
+
+
+def test_relative_gap():
+    assert relative_gap(90.0, 100.0) == pytest.approx(0.1)
+    assert relative_gap(-90.0, -100.0) == pytest.approx(0.1)
+    assert relative_gap(1.0, INFINITY) is None and relative_gap(1.0, None) is None
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from SolveService import SolveService, parse_address, problem_key, production_problem, selection_problem, solve_batch
+from SolverBackend import OPTIMAL
+
+
+def exchange(tmp_path, lines):
+    # one event per line sent, read back from a service that is never asked to solve
+    async def run():
+        service = SolveService(backend="highs", cores=1)
+        path = str(tmp_path / "service.sock")
+        server = await asyncio.start_unix_server(service.handle_connection, path=path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            events = []
+            for line in lines:
+                writer.write((line + "\n").encode())
+                await writer.drain()
+                events.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+            writer.close()
+            return events
+        finally:
+            server.close()
+            service.pool.shutdown()
+
+    return asyncio.run(run())
+
+
+def test_malformed_requests_get_an_error_event(tmp_path):
+    problem = selection_problem([1.0], [1.0], [1.0], [True], 10.0, 10.0, 0, [])
+    events = exchange(tmp_path, ["[1, 2]", "42",
+                                 json.dumps({"id": 1, "problem": problem, "threads": "many"}),
+                                 json.dumps({"op": "status"})])
+    assert [event["event"] for event in events[:3]] == ["error", "error", "error"]
+    assert events[2]["id"] == 1 and "threads" in events[2]["error"]
+    # the connection is still open, and nothing was queued
+    assert events[3]["event"] == "status" and events[3]["queued"] == 0
+
+
+def test_batch_answers_each_problem_or_its_error():
+    items = np.array([[1.0, 2.0, 3.0, 20.0, 4.0], [2.0, 1.0, 1.0, 15.0, 6.0]])
+    problems = [production_problem(items, 2.0, 1.0, [10.0, 10.0, 10.0]),
+                selection_problem([10.0, 20.0], [50.0, 60.0], [3.0, 4.0], [True, False], 200.0, 100.0, 1, [[0, 1]]),
+                {"type": "planning"}]
+    answers, _, memory = solve_batch(problems, "highs", 1)
+    assert memory is None
+    assert answers[0]["result"]["status"] == OPTIMAL
+    assert answers[0]["result"]["objective_value"] == pytest.approx(70.0)
+    # VIP 0 and guest 1 are in conflict, so only the VIP is invited
+    assert answers[1]["result"]["values"] == [1.0, 0.0]
+    assert answers[2]["error"] == "ValueError: unknown problem type 'planning'"
+
+
+def test_identical_problems_share_a_key():
+    first = selection_problem([10, 20], [50, 60], [3, 4], [True, False], 200, 100, 1, [(0, 1)])
+    same = selection_problem(np.array([10.0, 20.0]), [50, 60], [3, 4], np.array([1, 0]), 200, 100, 1, [[0, 1]])
+    assert problem_key(first) == problem_key(same)
+    assert problem_key(first) != problem_key(dict(first, budget=99))
+
+
+@pytest.mark.parametrize("text, address", [("unix:/tmp/solve.sock", ("unix", "/tmp/solve.sock")),
+                                           ("tcp:example.org:7000", ("tcp", ("example.org", 7000))),
+                                           (":7000", ("tcp", ("127.0.0.1", 7000)))])
+def test_parse_address(text, address):
+    assert parse_address(text) == address
@@ -0,0 +1,70 @@
+from SolveWorker import SolveRunner
+
+
+def record(runner):
+    events = []
+    runner.finished.connect(lambda result: events.append(("finished", result)))
+    runner.failed.connect(lambda message: events.append(("failed", message)))
+    runner.cancelled.connect(lambda: events.append(("cancelled", None)))
+    runner.progress.connect(lambda value: events.append(("progress", value)))
+    runner.running_changed.connect(lambda running: events.append(("running", running)))
+    return events
+
+
+def until_cancelled(cancel_event):
+    cancel_event.wait(10)
+    return "stopped"
+
+
+def test_result_is_posted_back(wait_until):
+    runner = SolveRunner()
+    events = record(runner)
+    runner.start(lambda cancel_event: 42)
+    wait_until(lambda: not runner.is_running())
+    assert events == [("running", True), ("finished", 42), ("running", False)]
+
+
+def test_failure_carries_the_message(wait_until):
+    def job(cancel_event):
+        raise ValueError("no feasible plan")
+
+    runner = SolveRunner()
+    events = record(runner)
+    runner.start(job)
+    wait_until(lambda: not runner.is_running())
+    assert ("failed", "no feasible plan") in events
+
+
+def test_cancel_reports_cancelled_not_the_result(wait_until):
+    runner = SolveRunner()
+    events = record(runner)
+    runner.start(until_cancelled)
+    runner.cancel()
+    wait_until(lambda: not runner.is_running())
+    assert events == [("running", True), ("cancelled", None), ("running", False)]
+
+
+def test_new_job_replaces_the_running_one(wait_until):
+    runner = SolveRunner()
+    events = record(runner)
+    runner.start(until_cancelled)
+    runner.start(lambda cancel_event: "first replacement")
+    runner.start(lambda cancel_event: "latest")
+    wait_until(lambda: ("running", False) in events)
+    # only the latest job runs once the first has stopped, and the runner never reports idle in between
+    assert [event for event in events if event[0] != "running"] == [("finished", "latest")]
+    assert events[-1] == ("running", False) and events.count(("running", False)) == 1
+
+
+def test_streaming_job_reports_progress(wait_until):
+    def job(cancel_event, report):
+        for value in range(3):
+            report(value)
+        return "done"
+
+    runner = SolveRunner()
+    events = record(runner)
+    runner.start(job, stream=True)
+    wait_until(lambda: not runner.is_running())
+    assert [value for kind, value in events if kind == "progress"] == [0, 1, 2]
+    assert ("finished", "done") in events
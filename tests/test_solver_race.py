@@ -0,0 +1,69 @@
+import threading
+
+import numpy as np
+import pytest
+
+from InstanceGenerators import celebrity_instance
+from SelectionProblem import build_selection_solver
+from SolverBackend import INTERRUPTED, LIMIT_REACHED, MAXIMIZE, OPTIMAL
+
+
+def guests(people=60, seed=2):
+    return celebrity_instance(people, vip_ratio=0.2, conflict_density=0.05, seed=seed)
+
+
+def selection(people=60, objectives=None, seed=2):
+    columns, ship_weight, budget, min_vip_count = guests(people, seed)
+    cliques = [list(pair) for pair in columns.conflict_pairs.tolist()]
+    return build_selection_solver(columns.salaries, columns.masses, columns.popularities, columns.vips, ship_weight,
+                                  budget, min_vip_count, cliques, backend="gurobi", objectives=objectives)
+
+
+def test_first_proven_optimum_wins_with_the_plain_solve_optimum(gurobi):
+    with selection() as solver:
+        solver.model.Params.OutputFlag = 0
+        race = solver.race([("default", {}), ("feasibility", {"MIPFocus": 1})], threads=2)
+        solver.solve()
+        expected = solver.get_result()
+    assert race.result.status == OPTIMAL
+    assert race.winner in ("default", "feasibility")
+    winner = next(entry for entry in race.entries if entry.name == race.winner)
+    assert winner.status == OPTIMAL
+    assert race.result.objective_value == pytest.approx(expected.objective_value)
+    assert len(race.result.values) == 60 and race.result.names == expected.names
+
+
+def test_best_incumbent_wins_when_nobody_proves_optimality(gurobi):
+    # single objective, so every entry's objective value is comparable; each stops at its first solution
+    popularities = guests(150, seed=4)[0].popularities
+    with selection(150, objectives=[(popularities, MAXIMIZE)], seed=4) as solver:
+        race = solver.race([("one", {"SolutionLimit": 1}), ("other", {"SolutionLimit": 1, "Seed": 7}),
+                            ("broken", {"NoSuchParameter": 1})], threads=3)
+    solved = [entry for entry in race.entries if entry.objective_value is not None]
+    assert all(entry.status in (OPTIMAL, LIMIT_REACHED) for entry in solved)
+    assert race.result.objective_value == max(entry.objective_value for entry in solved)
+    broken = race.entries[2]
+    assert broken.status == "error" and "NoSuchParameter" in broken.error
+    assert race.winner != "broken"
+
+
+def test_cancelled_race_has_no_winner(gurobi):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with selection() as solver:
+        race = solver.race([("default", {})], threads=1, cancel_event=cancel_event)
+    assert race.winner is None
+    assert race.result.status == INTERRUPTED and race.result.values is None
+
+
+def test_objective_key_puts_the_highest_priority_first(gurobi):
+    from SolverRace import objective_key
+    with selection(20) as solver:
+        solver.model.Params.OutputFlag = 0
+        solver.solve()
+        result = solver.get_result()
+        key = objective_key(solver.model)
+    values = np.round(result.values)
+    # head count, then salary, then popularity, each negated so that smaller is better
+    columns = guests(20)[0]
+    assert key == pytest.approx((-values.sum(), values @ columns.salaries, -(values @ columns.popularities)))
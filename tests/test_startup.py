@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+
+REPOSITORY = os.path.join(os.path.dirname(__file__), os.pardir)
+HEAVY_MODULES = ["gurobipy", "scipy.optimize", "PL_Problem", "PLNE_Problem", "SolverBackend"]
+
+
+def run(code, **environment):
+    # a fresh interpreter, so nothing earlier tests imported counts
+    completed = subprocess.run([sys.executable, "-c", code], cwd=REPOSITORY, capture_output=True, text=True,
+                               timeout=120, env={**os.environ, "QT_QPA_PLATFORM": "offscreen", **environment})
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def test_home_page_imports_neither_pages_nor_solvers():
+    loaded = run(f"""
+import json, sys
+import main
+from HomePage import HomePage
+print(json.dumps([module for module in {HEAVY_MODULES!r} if module in sys.modules]))
+""")
+    assert loaded == []
+
+
+def test_pages_and_solver_are_preloaded_after_the_first_show():
+    loaded = run(f"""
+import json, sys
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+import SolveWorker
+from HomePage import HomePage
+page = HomePage()
+page.show()
+before = [module for module in {HEAVY_MODULES!r} if module in sys.modules]
+# the preload is started from the event loop, once the page is on screen
+while SolveWorker._preload_thread is None:
+    app.processEvents()
+SolveWorker.wait_for_preload()
+print(json.dumps([before, [module for module in {HEAVY_MODULES!r} if module in sys.modules]]))
+""", SOLVER_BACKEND="highs")
+    before, after = loaded
+    assert before == []
+    assert after == ["scipy.optimize", "PL_Problem", "PLNE_Problem", "SolverBackend"]
+
+
+def test_failed_preload_is_left_to_the_first_use():
+    started = run("""
+import json
+from SolveWorker import preload_solver, wait_for_preload
+thread = preload_solver(["NoSuchModule"])
+wait_for_preload()
+print(json.dumps([preload_solver() is thread, thread.is_alive()]))
+""")
+    assert started == [True, False]
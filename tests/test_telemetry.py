@@ -0,0 +1,68 @@
+import json
+import logging
+
+import numpy as np
+import pytest
+
+from ProductionProblem import build_production_solver
+from Telemetry import emit, logger, phase, start_trace
+
+ITEMS = np.array([[1.0, 2.0, 3.0, 20.0, 4.0], [2.0, 1.0, 1.0, 15.0, 6.0]])
+
+
+def events(caplog):
+    return [(record.event, record.fields) for record in caplog.records if hasattr(record, "event")]
+
+
+@pytest.fixture
+def trace(tmp_path):
+    level = logger.level
+    handler = start_trace(str(tmp_path / "trace.jsonl"))
+    yield tmp_path / "trace.jsonl"
+    logger.removeHandler(handler)
+    handler.close()
+    logger.setLevel(level)
+
+
+def test_event_carries_its_fields_in_the_message(caplog):
+    with caplog.at_level(logging.INFO, logger="telemetry"):
+        emit("build", backend="highs", variables=3)
+    assert events(caplog) == [("build", {"backend": "highs", "variables": 3})]
+    assert caplog.records[0].getMessage() == "build backend=highs variables=3"
+
+
+def test_nothing_is_emitted_below_info(caplog):
+    with caplog.at_level(logging.WARNING, logger="telemetry"):
+        emit("build", backend="highs")
+    assert events(caplog) == []
+
+
+def test_phase_is_timed_and_reported_when_the_block_fails(caplog):
+    with caplog.at_level(logging.INFO, logger="telemetry"):
+        with pytest.raises(RuntimeError):
+            with phase("optimize", backend="highs") as fields:
+                fields["status"] = "optimal"
+                raise RuntimeError("solver crashed")
+    [(event, fields)] = events(caplog)
+    assert event == "optimize"
+    assert fields["status"] == "optimal" and fields["seconds"] >= 0
+
+
+def test_trace_writes_one_json_line_per_solver_phase(trace):
+    with build_production_solver(ITEMS, 2.0, 1.0, [10.0, 10.0, 10.0], backend="highs") as solver:
+        solver.solve()
+        solver.get_result()
+    records = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert [record["event"] for record in records] == ["build", "optimize", "extract"]
+    assert all(record["backend"] == "highs" and record["thread"] == "MainThread" for record in records)
+    assert records[1]["status"] == "optimal"
+
+
+def test_gurobi_optimize_reports_model_statistics(gurobi, caplog):
+    with caplog.at_level(logging.INFO, logger="telemetry"):
+        with build_production_solver(ITEMS, 2.0, 1.0, [10.0, 10.0, 10.0], backend="gurobi") as solver:
+            solver.solve()
+    fields = dict(events(caplog))["optimize"]
+    assert fields["status"] == "optimal"
+    assert fields["variables"] == 2 and fields["constraints"] == 3
+    assert {"runtime", "iterations", "seconds"} <= fields.keys()